@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Database Concurrency Benchmark
+
+Measures read latency while a writer keeps committing, comparing the legacy
+rollback-journal configuration with the tuned WAL profile from
+infrastructure.db.database. The writer mimics auto_sync: it opens a write
+transaction, updates work items, waits for a (simulated) GitHub call and
+commits.
+
+Usage:
+    python scripts/benchmark_db_concurrency.py
+    python scripts/benchmark_db_concurrency.py --rows=20000 --readers=8 --duration=5
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.db.database import Base, create_db_engine
+from infrastructure.db.models.models import WorkItem
+
+# Pragmas equivalent to the previous plain create_engine() setup
+LEGACY_PRAGMAS = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+def _seed(url: str, rows: int):
+    seed_engine = create_db_engine(url, pragmas=LEGACY_PRAGMAS)
+    Base.metadata.create_all(bind=seed_engine, tables=[WorkItem.__table__])
+    now = datetime.utcnow()
+    with seed_engine.begin() as conn:
+        conn.execute(
+            WorkItem.__table__.insert(),
+            [
+                {
+                    "id": f"BENCH-{i:06d}",
+                    "title": f"Benchmark item {i}",
+                    "description": "Generated for the concurrency benchmark",
+                    "status": ("todo", "in_progress", "review", "done")[i % 4],
+                    "priority": ("low", "medium", "high")[i % 3],
+                    "type": "task",
+                    "created_date": now,
+                    "updated_date": now,
+                }
+                for i in range(rows)
+            ],
+        )
+    seed_engine.dispose()
+
+
+def _run_profile(url: str, pragmas, readers: int, duration: float, hold: float):
+    writer_engine = create_db_engine(url, pragmas=pragmas)
+    reader_engine = create_db_engine(
+        url, read_only=True, pragmas=pragmas, pool_size=readers, max_overflow=0
+    )
+    WriterSession = sessionmaker(bind=writer_engine)
+    ReaderSession = sessionmaker(bind=reader_engine)
+
+    stop = threading.Event()
+    latencies: List[float] = []
+    latencies_lock = threading.Lock()
+    commits = 0
+
+    def writer():
+        nonlocal commits
+        statuses = ("todo", "in_progress", "review", "done")
+        while not stop.is_set():
+            session = WriterSession()
+            try:
+                session.execute(
+                    text("UPDATE work_items SET status = :status, updated_date = :now"),
+                    {"status": statuses[commits % 4], "now": datetime.utcnow()},
+                )
+                time.sleep(hold)  # simulated GitHub round-trip inside the txn
+                session.commit()
+                commits += 1
+            finally:
+                session.close()
+
+    def reader():
+        local: List[float] = []
+        while not stop.is_set():
+            session = ReaderSession()
+            try:
+                start = time.perf_counter()
+                session.execute(
+                    text("SELECT status, COUNT(*) FROM work_items GROUP BY status")
+                ).all()
+                local.append(time.perf_counter() - start)
+            finally:
+                session.close()
+        with latencies_lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    writer_engine.dispose()
+    reader_engine.dispose()
+
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "commits": commits,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": (
+            latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0
+        ),
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def run_benchmark(
+    rows: int = 20000, readers: int = 4, duration: float = 3.0, hold: float = 0.05
+) -> Dict[str, Dict[str, float]]:
+    """Run the benchmark for both pragma profiles and return the results."""
+    results = {}
+    for name, pragmas in (("legacy", LEGACY_PRAGMAS), ("tuned", None)):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            url = f"sqlite:///{Path(temp_dir) / 'bench.db'}"
+            _seed(url, rows)
+            print(f"⏱️  Running '{name}' profile ({readers} readers, {duration}s)...")
+            results[name] = _run_profile(url, pragmas, readers, duration, hold)
+    return results
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent DB access")
+    parser.add_argument("--rows", type=int, default=20000, help="Work items to seed")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads")
+    parser.add_argument(
+        "--duration", type=float, default=3.0, help="Seconds per profile"
+    )
+    parser.add_argument(
+        "--hold", type=float, default=0.05, help="Seconds the writer holds its txn"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.readers, args.duration, args.hold)
+
+    print("\n📊 Reader latency while writer commits:")
+    print(
+        f"  {'profile':<8} {'reads':>8} {'commits':>8} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'max ms':>8}"
+    )
+    for name, stats in results.items():
+        print(
+            f"  {name:<8} {stats['reads']:>8} {stats['commits']:>8} "
+            f"{stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['max_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,11 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 import subprocess
 
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from infrastructure.db.queries import HOT_QUERIES
+
 
 class RealTimeDashboard:
     """Real-time dashboard with database integration."""
@@ -80,25 +85,26 @@ class RealTimeDashboard:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            # Overall statistics
-            cursor.execute("SELECT COUNT(*) FROM work_items")
-            total_items = cursor.fetchone()[0]
+            # Overall statistics (precomputed rollups when available)
+            totals = self._get_rollup(cursor, "work_items", "total")
+            if totals is not None:
+                total_items = totals.get("all", 0)
+                status_counts = self._get_rollup(cursor, "work_items", "status") or {}
+                priority_counts = (
+                    self._get_rollup(cursor, "work_items", "priority") or {}
+                )
+            else:
+                cursor.execute(HOT_QUERIES["work_items_total"].sql)
+                total_items = cursor.fetchone()[0]
 
-            cursor.execute("SELECT status, COUNT(*) FROM work_items GROUP BY status")
-            status_counts = dict(cursor.fetchall())
+                cursor.execute(HOT_QUERIES["work_items_by_status"].sql)
+                status_counts = dict(cursor.fetchall())
 
-            cursor.execute(
-                "SELECT priority, COUNT(*) FROM work_items GROUP BY priority"
-            )
-            priority_counts = dict(cursor.fetchall())
+                cursor.execute(HOT_QUERIES["work_items_by_priority"].sql)
+                priority_counts = dict(cursor.fetchall())
 
             # Recent items
-            cursor.execute("""
-                SELECT id, title, status, priority, created_date, updated_date 
-                FROM work_items 
-                ORDER BY created_date DESC 
-                LIMIT 10
-            """)
+            cursor.execute(HOT_QUERIES["work_items_recent"].sql)
             recent_items = [
                 {
                     "id": row[0],
@@ -114,14 +120,7 @@ class RealTimeDashboard:
             # Completion trends (last 30 days)
             thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
             cursor.execute(
-                """
-                SELECT DATE(updated_date) as date, COUNT(*) as count
-                FROM work_items 
-                WHERE status = 'done' AND updated_date > ?
-                GROUP BY DATE(updated_date)
-                ORDER BY date
-            """,
-                (thirty_days_ago,),
+                HOT_QUERIES["work_items_completion_trend"].sql, (thirty_days_ago,)
             )
             completion_trends = dict(cursor.fetchall())
 
@@ -133,7 +132,9 @@ class RealTimeDashboard:
                 "by_priority": priority_counts,
                 "recent": recent_items,
                 "completion_trends": completion_trends,
-                "completion_rate": self._calculate_completion_rate(),
+                "completion_rate": self._calculate_completion_rate(
+                    total_items, status_counts
+                ),
             }
 
         except Exception as e:
@@ -146,22 +147,23 @@ class RealTimeDashboard:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            cursor.execute("SELECT COUNT(*) FROM ideas")
-            total_ideas = cursor.fetchone()[0]
+            totals = self._get_rollup(cursor, "ideas", "total")
+            if totals is not None:
+                total_ideas = totals.get("all", 0)
+                category_counts = self._get_rollup(cursor, "ideas", "category") or {}
+                status_counts = self._get_rollup(cursor, "ideas", "status") or {}
+            else:
+                cursor.execute(HOT_QUERIES["ideas_total"].sql)
+                total_ideas = cursor.fetchone()[0]
 
-            cursor.execute("SELECT category, COUNT(*) FROM ideas GROUP BY category")
-            category_counts = dict(cursor.fetchall())
+                cursor.execute(HOT_QUERIES["ideas_by_category"].sql)
+                category_counts = dict(cursor.fetchall())
 
-            cursor.execute("SELECT status, COUNT(*) FROM ideas GROUP BY status")
-            status_counts = dict(cursor.fetchall())
+                cursor.execute(HOT_QUERIES["ideas_by_status"].sql)
+                status_counts = dict(cursor.fetchall())
 
             # Recent ideas
-            cursor.execute("""
-                SELECT id, title, category, status, created_date 
-                FROM ideas 
-                ORDER BY created_date DESC 
-                LIMIT 10
-            """)
+            cursor.execute(HOT_QUERIES["ideas_recent"].sql)
             recent_ideas = [
                 {
                     "id": row[0],
@@ -346,19 +348,39 @@ class RealTimeDashboard:
         except Exception as e:
             return {"error": str(e)}
 
-    def _calculate_completion_rate(self) -> float:
+    def _get_rollup(
+        self, cursor: sqlite3.Cursor, entity: str, dimension: str
+    ) -> Optional[Dict[str, int]]:
+        """Read a rollup from aggregate_counters (None if not available)."""
+        try:
+            cursor.execute(HOT_QUERIES["aggregate_rollup"].sql, (entity, dimension))
+        except sqlite3.OperationalError:
+            return None  # Database predates the aggregate_counters migration
+        rows = cursor.fetchall()
+        return dict(rows) if rows else None
+
+    def _calculate_completion_rate(
+        self,
+        total: Optional[int] = None,
+        status_counts: Optional[Dict[str, int]] = None,
+    ) -> float:
         """Calculate work item completion rate."""
+        if total is not None and status_counts is not None:
+            if total == 0:
+                return 0.0
+            return round((status_counts.get("done", 0) / total) * 100, 2)
+
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
-            cursor.execute("SELECT COUNT(*) FROM work_items")
+            cursor.execute(HOT_QUERIES["work_items_total"].sql)
             total = cursor.fetchone()[0]
 
             if total == 0:
                 return 0.0
 
-            cursor.execute("SELECT COUNT(*) FROM work_items WHERE status = 'done'")
+            cursor.execute(HOT_QUERIES["work_items_done_count"].sql)
             completed = cursor.fetchone()[0]
 
             conn.close()
@@ -696,6 +718,21 @@ class RealTimeDashboard:
                 print(f"✅ Work items exported to: {output_file}")
                 return str(output_file)
 
+        elif format.lower() == "parquet":
+            # Full columnar snapshot of every table, not just the recent items
+            from infrastructure.db.database import create_db_engine
+            from infrastructure.db.snapshot_export import export_snapshot
+
+            snapshot_engine = create_db_engine(
+                f"sqlite:///{self.db_path}", read_only=True
+            )
+            output_dir = self.output_dir / "snapshot"
+            stats = export_snapshot(output_dir, bind=snapshot_engine)
+            snapshot_engine.dispose()
+            rows = sum(table["rows"] for table in stats["tables"].values())
+            print(f"✅ Snapshot ({rows} rows) exported to: {output_dir}")
+            return str(output_dir)
+
         else:
             print(f"❌ Unsupported format: {format}")
             return ""
@@ -710,7 +747,9 @@ def main():
     parser.add_argument(
         "--auto-refresh", type=int, default=60, help="Auto-refresh interval in seconds"
     )
-    parser.add_argument("--export", choices=["json", "csv"], help="Export data format")
+    parser.add_argument(
+        "--export", choices=["json", "csv", "parquet"], help="Export data format"
+    )
     parser.add_argument(
         "--base-dir", type=Path, help="Base directory (default: current)"
     )
@@ -16,6 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 # ✅ CORRECT - Use SQLAlchemy ORM
 from infrastructure.db.database import SessionLocal
+from infrastructure.db.json_manifest import JsonManifest
 from infrastructure.db.models.models import Idea
 
 
@@ -29,32 +30,43 @@ class IdeasMigrator:
         # ✅ CORRECT - Use SQLAlchemy session
         self.db = SessionLocal()
 
+        # Content manifest: only files changed since the last run are read
+        self.manifest = JsonManifest()
+
     def migrate_all_ideas(self, force_update: bool = False):
         """Migrate all ideas from JSON to database"""
         print("🔄 Starting ideas migration (SQLAlchemy ORM)...")
 
-        json_files = list(self.ideas_dir.glob("*.json"))
-        print(f"📁 Found {len(json_files)} JSON idea files")
+        diff = self.manifest.scan(self.ideas_dir)
+        print(
+            f"📁 Found {len(diff.states)} JSON idea files "
+            f"({len(diff.changed)} changed since last run)"
+        )
+
+        if force_update:
+            json_files = sorted(self.ideas_dir.glob("*.json"))
+        else:
+            json_files = diff.changed
 
         # Group by ID to handle duplicates
-        ideas_by_id = {}
-        for json_file in json_files:
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    idea = json.load(f)
-                    idea_id = idea.get("id")
-                    if idea_id:
-                        if idea_id not in ideas_by_id:
-                            ideas_by_id[idea_id] = []
-                        ideas_by_id[idea_id].append((json_file, idea))
-            except Exception as e:
-                print(f"⚠️  Error reading {json_file.name}: {e}")
+        ideas_by_id = self._read_files(json_files)
+
+        # Unchanged copies of a changed idea still take part in version selection
+        if not force_update:
+            siblings = [
+                self.ideas_dir / name
+                for name, idea_id in diff.unchanged_ids.items()
+                if idea_id in ideas_by_id
+            ]
+            for idea_id, files_list in self._read_files(siblings).items():
+                ideas_by_id[idea_id].extend(files_list)
 
         print(f"💡 Found {len(ideas_by_id)} unique ideas")
 
         migrated = 0
         updated = 0
         errors = 0
+        failed_ids = set()
 
         for idea_id, files_list in ideas_by_id.items():
             try:
@@ -74,6 +86,18 @@ class IdeasMigrator:
             except Exception as e:
                 print(f"❌ Error migrating {idea_id}: {e}")
                 errors += 1
+                failed_ids.add(idea_id)
+
+        # Files that failed to parse or migrate stay pending for the next run
+        self.manifest.commit(
+            diff,
+            {
+                json_file: idea_id
+                for idea_id, files_list in ideas_by_id.items()
+                if idea_id not in failed_ids
+                for json_file, _ in files_list
+            },
+        )
 
         print(f"\n📊 Migration Summary:")
         print(f"  ✅ Migrated: {migrated}")
@@ -83,6 +107,22 @@ class IdeasMigrator:
 
         return migrated, updated, errors
 
+    def _read_files(self, json_files):
+        """Load JSON files grouped by idea ID"""
+        ideas_by_id = {}
+        for json_file in json_files:
+            try:
+                with open(json_file, "r", encoding="utf-8") as f:
+                    idea = json.load(f)
+                    idea_id = idea.get("id")
+                    if idea_id:
+                        if idea_id not in ideas_by_id:
+                            ideas_by_id[idea_id] = []
+                        ideas_by_id[idea_id].append((json_file, idea))
+            except Exception as e:
+                print(f"⚠️  Error reading {json_file.name}: {e}")
+        return ideas_by_id
+
     def _choose_latest_version(self, files_list):
         """Choose the latest version from multiple files"""
         if len(files_list) == 1:
@@ -199,21 +239,17 @@ class IdeasMigrator:
         print("\n📊 Ideas Sync Status Report:")
 
         # Count JSON files
-        json_files = list(self.ideas_dir.glob("*.json"))
-        json_count = len(json_files)
+        diff = self.manifest.scan(self.ideas_dir)
+        json_count = len(diff.states)
+        in_sync = diff.root_hash == self.manifest.stored_root_hash(self.ideas_dir)
 
         # Count database records
         db_count = self.db.query(Idea).count()
 
-        # Find unique IDs
-        json_ids = set()
-        for json_file in json_files:
-            try:
-                with open(json_file, "r") as f:
-                    idea = json.load(f)
-                    json_ids.add(idea.get("id"))
-            except:
-                continue
+        # Find unique IDs; only files changed since the last run are read
+        json_ids = set(diff.unchanged_ids.values())
+        json_ids.update(self._read_files(diff.changed))
+        json_ids.discard(None)
 
         db_ids = set(idea.id for idea in self.db.query(Idea.id).all())
 
@@ -224,6 +260,8 @@ class IdeasMigrator:
         print(f"  🗄️  Database records: {db_count}")
         print(f"  ➕ Missing in database: {len(missing_in_db)}")
         print(f"  ➖ Missing in JSON: {len(missing_in_json)}")
+        print(f"  🔁 Changed since last migration: {len(diff.changed)}")
+        print(f"  {'✅' if in_sync else '⚠️ '} Manifest in sync: {in_sync}")
 
         if missing_in_db:
             print(f"\n💡 Ideas missing from database:")
@@ -235,6 +273,8 @@ class IdeasMigrator:
             "db_count": db_count,
             "missing_in_db": missing_in_db,
             "missing_in_json": missing_in_json,
+            "changed_files": len(diff.changed),
+            "in_sync": in_sync,
         }
 
     def __del__(self):
@@ -21,6 +21,9 @@ except ImportError:
     print("❌ Could not import AILabDatabase")
     print("Using direct SQLite connection...")
 
+from infrastructure.db.database import create_db_engine
+from infrastructure.db.json_manifest import JsonManifest
+
 
 class WorkItemsMigrator:
     """Migrates work items from JSON files to database"""
@@ -39,32 +42,43 @@ class WorkItemsMigrator:
             self.use_framework = False
             print("⚠️  Using direct SQLite connection")
 
+        # Content manifest: only files changed since the last run are read
+        self.manifest = JsonManifest(create_db_engine(f"sqlite:///{self.db_path}"))
+
     def migrate_all_work_items(self, force_update: bool = False):
         """Migrate all work items from JSON to database"""
         print("🔄 Starting work items migration...")
 
-        json_files = list(self.work_items_dir.glob("*.json"))
-        print(f"📁 Found {len(json_files)} JSON work item files")
+        diff = self.manifest.scan(self.work_items_dir)
+        print(
+            f"📁 Found {len(diff.states)} JSON work item files "
+            f"({len(diff.changed)} changed since last run)"
+        )
+
+        if force_update:
+            json_files = sorted(self.work_items_dir.glob("*.json"))
+        else:
+            json_files = diff.changed
 
         # Group files by work item ID to handle duplicates
-        work_items_by_id = {}
-        for json_file in json_files:
-            try:
-                with open(json_file, "r", encoding="utf-8") as f:
-                    work_item = json.load(f)
-                    work_id = work_item.get("id")
-                    if work_id:
-                        if work_id not in work_items_by_id:
-                            work_items_by_id[work_id] = []
-                        work_items_by_id[work_id].append((json_file, work_item))
-            except Exception as e:
-                print(f"⚠️  Error reading {json_file.name}: {e}")
+        work_items_by_id = self._read_files(json_files)
+
+        # Unchanged copies of a changed item still take part in version selection
+        if not force_update:
+            siblings = [
+                self.work_items_dir / name
+                for name, item_id in diff.unchanged_ids.items()
+                if item_id in work_items_by_id
+            ]
+            for work_id, files_list in self._read_files(siblings).items():
+                work_items_by_id[work_id].extend(files_list)
 
         print(f"📋 Found {len(work_items_by_id)} unique work items")
 
         migrated = 0
         updated = 0
         errors = 0
+        failed_ids = set()
 
         for work_id, files_list in work_items_by_id.items():
             try:
@@ -84,6 +98,18 @@ class WorkItemsMigrator:
             except Exception as e:
                 print(f"❌ Error migrating {work_id}: {e}")
                 errors += 1
+                failed_ids.add(work_id)
+
+        # Files that failed to parse or migrate stay pending for the next run
+        self.manifest.commit(
+            diff,
+            {
+                json_file: work_id
+                for work_id, files_list in work_items_by_id.items()
+                if work_id not in failed_ids
+                for json_file, _ in files_list
+            },
+        )
 
         print(f"\n📊 Migration Summary:")
         print(f"  ✅ Migrated: {migrated}")
@@ -93,6 +119,22 @@ class WorkItemsMigrator:
 
         return migrated, updated, errors
 
+    def _read_files(self, json_files):
+        """Load JSON files grouped by work item ID"""
+        work_items_by_id = {}
+        for json_file in json_files:
+            try:
+                with open(json_file, "r", encoding="utf-8") as f:
+                    work_item = json.load(f)
+                    work_id = work_item.get("id")
+                    if work_id:
+                        if work_id not in work_items_by_id:
+                            work_items_by_id[work_id] = []
+                        work_items_by_id[work_id].append((json_file, work_item))
+            except Exception as e:
+                print(f"⚠️  Error reading {json_file.name}: {e}")
+        return work_items_by_id
+
     def _choose_latest_version(self, files_list):
         """Choose the latest version from multiple files for the same work item"""
         if len(files_list) == 1:
@@ -236,8 +278,9 @@ class WorkItemsMigrator:
         print("\n📊 Sync Status Report:")
 
         # Count JSON files
-        json_files = list(self.work_items_dir.glob("*.json"))
-        json_count = len(json_files)
+        diff = self.manifest.scan(self.work_items_dir)
+        json_count = len(diff.states)
+        in_sync = diff.root_hash == self.manifest.stored_root_hash(self.work_items_dir)
 
         # Count database records
         try:
@@ -250,15 +293,10 @@ class WorkItemsMigrator:
         except:
             db_count = 0
 
-        # Find missing items
-        json_ids = set()
-        for json_file in json_files:
-            try:
-                with open(json_file, "r") as f:
-                    work_item = json.load(f)
-                    json_ids.add(work_item.get("id"))
-            except:
-                continue
+        # Find missing items; only files changed since the last run are read
+        json_ids = set(diff.unchanged_ids.values())
+        json_ids.update(self._read_files(diff.changed))
+        json_ids.discard(None)
 
         try:
             cursor = (
@@ -277,6 +315,8 @@ class WorkItemsMigrator:
         print(f"  🗄️  Database records: {db_count}")
         print(f"  ➕ Missing in database: {len(missing_in_db)}")
         print(f"  ➖ Missing in JSON: {len(missing_in_json)}")
+        print(f"  🔁 Changed since last migration: {len(diff.changed)}")
+        print(f"  {'✅' if in_sync else '⚠️ '} Manifest in sync: {in_sync}")
 
         if missing_in_db:
             print(f"\n📋 Items missing from database:")
@@ -288,6 +328,8 @@ class WorkItemsMigrator:
             "db_count": db_count,
             "missing_in_db": missing_in_db,
             "missing_in_json": missing_in_json,
+            "changed_files": len(diff.changed),
+            "in_sync": in_sync,
         }
 
 
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - GitHub GraphQL Batches
+Packs many issue and label mutations into one aliased GraphQL request,
+split by query cost
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from github import GithubException, RateLimitExceededException
+
+from ai_lab_framework.github_scheduler import SyncScheduler
+
+# Budget of one request: GitHub weighs a mutation 5 points against its
+# secondary limit and large batches run into the server's 10s timeout
+BATCH_COST = int(os.getenv("GITHUB_GRAPHQL_BATCH_COST", "100"))
+MUTATION_COST = 5
+QUERY_COST = 1
+LABEL_COLOR = "ededed"  # Labels created on the fly (REST did that implicitly)
+# Errors meaning the request was rejected as a whole before running
+TOO_EXPENSIVE = ("MAX_NODE_LIMIT_EXCEEDED", "RESOURCE_LIMITS_EXCEEDED")
+
+Result = Tuple[Optional[Dict[str, Any]], Optional[str]]  # (data, error)
+
+
+class Operation(NamedTuple):
+    """One mutation field of a batch."""
+
+    field: str  # createIssue
+    input_type: str  # CreateIssueInput
+    input: Dict[str, Any]
+    selection: str  # Fields of the payload to return
+
+    @property
+    def cost(self) -> int:
+        return MUTATION_COST
+
+
+def batches(
+    operations: Iterable[Operation], budget: int = BATCH_COST
+) -> Iterator[List[Operation]]:
+    """Consecutive groups whose summed cost stays within ``budget``."""
+    batch, cost = [], 0
+    for operation in operations:
+        if batch and cost + operation.cost > budget:
+            yield batch
+            batch, cost = [], 0
+        batch.append(operation)
+        cost += operation.cost
+    if batch:
+        yield batch
+
+
+def mutation_document(batch: List[Operation]) -> Tuple[str, Dict[str, Any]]:
+    """Aliased mutation (``m0``, ``m1``...) and its variables."""
+    arguments = ", ".join(
+        f"$v{n}: {operation.input_type}!" for n, operation in enumerate(batch)
+    )
+    fields = "\n".join(
+        f"  m{n}: {operation.field}(input: $v{n}) {{ {operation.selection} }}"
+        for n, operation in enumerate(batch)
+    )
+    variables = {f"v{n}": operation.input for n, operation in enumerate(batch)}
+    return f"mutation({arguments}) {{\n{fields}\n}}", variables
+
+
+def _errors_by_alias(errors: List[Dict[str, Any]]) -> Dict[str, str]:
+    by_alias = {}
+    for error in errors:
+        path = error.get("path") or []
+        if path:
+            by_alias.setdefault(str(path[0]), error.get("message", "GraphQL error"))
+    return by_alias
+
+
+class GraphQLBatcher:
+    """Aliased GraphQL requests against one repository.
+
+    Every request goes through the scheduler, weighted by its number of
+    mutations. Label names are resolved to node ids once per process; labels
+    that do not exist yet are created.
+    """
+
+    def __init__(
+        self,
+        github,
+        repo,
+        scheduler: Optional[SyncScheduler] = None,
+        batch_cost: int = BATCH_COST,
+    ):
+        self.github = github
+        self.repo = repo
+        self.scheduler = scheduler or SyncScheduler(github)
+        self.batch_cost = batch_cost
+        self._labels: Optional[Dict[str, str]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def mutations_per_batch(self) -> int:
+        return max(self.batch_cost // MUTATION_COST, 1)
+
+    def _post(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        requester = self.github.requester
+        headers, data = requester.requestJsonAndCheck(
+            "POST",
+            requester.graphql_url,
+            input={"query": query, "variables": variables},
+        )
+        errors = data.get("errors") or []
+        if any(error.get("type") == "RATE_LIMITED" for error in errors):
+            raise RateLimitExceededException(403, data, headers)
+        if errors and not data.get("data"):
+            raise GithubException(400, data, headers)
+        return data
+
+    # Labels
+
+    def label_ids(self, names: Iterable[str]) -> List[str]:
+        """Node ids of the labels ``names``, creating missing ones."""
+        with self._lock:
+            if self._labels is None:
+                labels = self.scheduler.call(lambda: list(self.repo.get_labels()))
+                self._labels = {label.name: label.node_id for label in labels}
+            ids = []
+            for name in names:
+                if name not in self._labels:
+                    label = self.scheduler.call(
+                        self.repo.create_label, name, LABEL_COLOR, write=True
+                    )
+                    self._labels[name] = label.node_id
+                ids.append(self._labels[name])
+            return ids
+
+    # Operations
+
+    def create_issue(self, title: str, body: str, labels: List[str]) -> Operation:
+        return Operation(
+            "createIssue",
+            "CreateIssueInput",
+            {
+                "repositoryId": self.repo.node_id,
+                "title": title,
+                "body": body,
+                "labelIds": self.label_ids(labels),
+            },
+            "issue { id number }",
+        )
+
+    def add_labels(self, node_id: str, labels: List[str]) -> Operation:
+        return Operation(
+            "addLabelsToLabelable",
+            "AddLabelsToLabelableInput",
+            {"labelableId": node_id, "labelIds": self.label_ids(labels)},
+            "clientMutationId",
+        )
+
+    def remove_labels(self, node_id: str, labels: List[str]) -> Operation:
+        return Operation(
+            "removeLabelsFromLabelable",
+            "RemoveLabelsFromLabelableInput",
+            {"labelableId": node_id, "labelIds": self.label_ids(labels)},
+            "clientMutationId",
+        )
+
+    def execute(self, operations: Iterable[Operation]) -> List[Result]:
+        """Run ``operations`` in as few requests as their cost allows.
+
+        Returns ``(data, error)`` per operation, in order: one failing
+        mutation does not fail the others of its batch.
+        """
+        results = []
+        for batch in batches(operations, self.batch_cost):
+            results.extend(self._execute_batch(batch))
+        return results
+
+    def _execute_batch(self, batch: List[Operation]) -> List[Result]:
+        query, variables = mutation_document(batch)
+        try:
+            data = self.scheduler.call(
+                self._post, query, variables, write=True, weight=len(batch)
+            )
+        except GithubException as e:
+            if len(batch) > 1 and _rejected_as_too_expensive(e):
+                # Nothing ran: retry in halves
+                half = len(batch) // 2
+                return self._execute_batch(batch[:half]) + self._execute_batch(
+                    batch[half:]
+                )
+            return [(None, str(e))] * len(batch)
+
+        payloads = data.get("data") or {}
+        errors = _errors_by_alias(data.get("errors") or [])
+        results = []
+        for n in range(len(batch)):
+            payload, error = payloads.get(f"m{n}"), errors.get(f"m{n}")
+            if payload is None and error is None:
+                error = "No data returned"
+            results.append((payload, error))
+        return results
+
+    # Lookups
+
+    def issues(self, numbers: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """{number: {"id", "labels"}} of existing issues, QUERY_COST each."""
+        numbers = sorted({int(number) for number in numbers})
+        owner, name = self.repo.full_name.split("/", 1)
+        found = {}
+        per_request = max(self.batch_cost // QUERY_COST, 1)
+        for start in range(0, len(numbers), per_request):
+            chunk = numbers[start : start + per_request]
+            fields = "\n".join(
+                f"    i{number}: issue(number: {number}) "
+                "{ id number labels(first: 100) { nodes { name } } }"
+                for number in chunk
+            )
+            query = (
+                "query($owner: String!, $name: String!) {\n"
+                f"  repository(owner: $owner, name: $name) {{\n{fields}\n  }}\n}}"
+            )
+            data = self.scheduler.call(
+                self._post, query, {"owner": owner, "name": name}
+            )
+            repository = (data.get("data") or {}).get("repository") or {}
+            for issue in repository.values():
+                if issue:  # Deleted or transferred issues come back as null
+                    found[issue["number"]] = {
+                        "id": issue["id"],
+                        "labels": [label["name"] for label in issue["labels"]["nodes"]],
+                    }
+        return found
+
+
+def _rejected_as_too_expensive(error: GithubException) -> bool:
+    # Not timeouts: the mutations of a timed-out request may have run
+    data = error.data if isinstance(error.data, dict) else {}
+    return any(e.get("type") in TOO_EXPENSIVE for e in data.get("errors") or [])
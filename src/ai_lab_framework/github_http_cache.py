@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - GitHub HTTP Cache
+Persistent ETag/Last-Modified cache under the GitHub client: every GET is
+revalidated with If-None-Match, and a 304 is answered from SQLite
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Path of the cache database; "off" disables the cache
+CACHE_SETTING = os.getenv("GITHUB_HTTP_CACHE", "data/github_http_cache.db")
+MAX_BYTES = int(float(os.getenv("GITHUB_HTTP_CACHE_MAX_MB", "100")) * 1024 * 1024)
+PRUNE_EVERY = 200  # Stores between size checks
+
+# Describe the transfer, not the stored (already decoded) body
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+CacheKey = Tuple[str, str]  # (credential/accept scope, url)
+
+
+class HTTPCache:
+    """Validators, headers and bodies of GET responses, one row per URL.
+
+    Entries are keyed by URL and a hash of the Authorization and Accept
+    headers, so tokens never see each other's responses. Nothing is served
+    without asking GitHub: a stored response is only replayed on 304.
+    """
+
+    def __init__(self, path: str = CACHE_SETTING, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "uncacheable": 0}
+        self._stores_since_prune = 0
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "scope TEXT NOT NULL, "
+                "url TEXT NOT NULL, "
+                "etag TEXT, "
+                "last_modified TEXT, "
+                "headers TEXT NOT NULL, "
+                "body BLOB NOT NULL, "
+                "hits INTEGER NOT NULL DEFAULT 0, "
+                "used_at REAL NOT NULL, "
+                "PRIMARY KEY (scope, url))"
+            )
+
+    def lookup(self, key: CacheKey) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """(etag, last_modified) of a stored response."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT etag, last_modified FROM http_cache WHERE scope = ? AND url = ?",
+                key,
+            ).fetchone()
+
+    def hit(
+        self, key: CacheKey, fresh_headers: Dict[str, str]
+    ) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Stored headers (updated from the 304) and body."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT headers, body FROM http_cache WHERE scope = ? AND url = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None  # Pruned in between
+            headers = {**json.loads(row[0]), **_storable(fresh_headers)}
+            self._connection.execute(
+                "UPDATE http_cache SET headers = ?, hits = hits + 1, used_at = ? "
+                "WHERE scope = ? AND url = ?",
+                (json.dumps(headers), time.time(), *key),
+            )
+            self._stats["hits"] += 1
+            return headers, row[1]
+
+    def store(self, key: CacheKey, headers: Dict[str, str], body: bytes) -> bool:
+        """Keep a 200 response that carries an ETag or Last-Modified."""
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        with self._lock:
+            self._stats["misses"] += 1
+            if etag is None and last_modified is None:
+                self._stats["uncacheable"] += 1
+                return False
+            self._connection.execute(
+                "INSERT INTO http_cache "
+                "(scope, url, etag, last_modified, headers, body, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (scope, url) DO UPDATE SET "
+                "etag = excluded.etag, last_modified = excluded.last_modified, "
+                "headers = excluded.headers, body = excluded.body, "
+                "used_at = excluded.used_at",
+                (
+                    *key,
+                    etag,
+                    last_modified,
+                    json.dumps(_storable(headers)),
+                    body,
+                    time.time(),
+                ),
+            )
+            self._stats["stores"] += 1
+            self._stores_since_prune += 1
+            if self._stores_since_prune >= PRUNE_EVERY:
+                self._prune()
+        return True
+
+    def miss(self):
+        """A GET that could not be cached (an error or a redirect)."""
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["uncacheable"] += 1
+
+    def _prune(self):
+        """Drop least recently used entries beyond ``max_bytes``."""
+        self._stores_since_prune = 0
+        total = self._connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(body) + LENGTH(headers)), 0) FROM http_cache"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._connection.execute(
+            "SELECT scope, url, LENGTH(body) + LENGTH(headers) FROM http_cache "
+            "ORDER BY used_at"
+        ).fetchall()
+        for scope, url, size in rows:
+            if total <= self.max_bytes * 0.9:
+                break
+            self._connection.execute(
+                "DELETE FROM http_cache WHERE scope = ? AND url = ?", (scope, url)
+            )
+            total -= size
+
+    def prune(self):
+        with self._lock:
+            self._prune()
+
+    def clear(self, reset_stats: bool = False):
+        with self._lock:
+            self._connection.execute("DELETE FROM http_cache")
+            if reset_stats:
+                self._stats.update(hits=0, misses=0, stores=0, uncacheable=0)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size, lifetime_hits = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0), "
+                "COALESCE(SUM(hits), 0) FROM http_cache"
+            ).fetchone()
+            requests_seen = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": (
+                    round(self._stats["hits"] / requests_seen * 100, 2)
+                    if requests_seen
+                    else 0.0
+                ),
+                "entries": entries,
+                "bytes": size,
+                "lifetime_hits": lifetime_hits,
+            }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def _storable(headers) -> Dict[str, str]:
+    return {
+        name.lower(): value
+        for name, value in headers.items()
+        if name.lower() not in _SKIPPED_HEADERS
+    }
+
+
+def cache_key(request: requests.PreparedRequest) -> CacheKey:
+    scope = "\n".join(
+        (request.headers.get("Authorization", ""), request.headers.get("Accept", ""))
+    )
+    return hashlib.sha256(scope.encode()).hexdigest()[:32], request.url
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that makes GETs conditional and replays 304s."""
+
+    def __init__(self, cache: HTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        key = cache_key(request)
+        validators = self.cache.lookup(key)
+        if validators:
+            etag, last_modified = validators
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and validators:
+            cached = self.cache.hit(key, response.headers)
+            if cached is not None:
+                return _replay(response, *cached)
+        if response.status_code == 200:
+            self.cache.store(key, response.headers, response.content)
+        else:
+            self.cache.miss()
+        return response
+
+
+def _replay(
+    response: requests.Response, headers: Dict[str, str], body: bytes
+) -> requests.Response:
+    """Turn a 304 into the stored 200, with the 304's fresh headers."""
+    response.status_code = 200
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response._content = body
+    response.from_cache = True
+    return response
+
+
+def _cached_connection(connection_class, cache: HTTPCache, *args, **kwargs):
+    connection = connection_class(*args, **kwargs)
+    adapter = CachingAdapter(
+        cache,
+        max_retries=connection.retry,
+        pool_connections=connection.pool_size,
+        pool_maxsize=connection.pool_size,
+    )
+    connection.session.mount(f"{connection.protocol}://", adapter)
+    return connection
+
+
+_caches: Dict[str, HTTPCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_http_cache(path: str = CACHE_SETTING) -> Optional[HTTPCache]:
+    """The process-wide cache stored at ``path`` (None when disabled)."""
+    if path.lower() in ("off", "0", "false", "no", ""):
+        return None
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = HTTPCache(path)
+        return _caches[path]
+
+
+def install_http_cache(github, cache: Optional[HTTPCache] = None):
+    """Make ``github``'s GET requests conditional on ``cache``.
+
+    PyGithub has no public hook for its HTTP session, so the requester's
+    connection factory is wrapped; each connection it creates gets the
+    caching adapter mounted on its ``requests`` session. Returns the cache,
+    or None when it is disabled or the hook is missing.
+    """
+    cache = cache or get_http_cache()
+    requester = getattr(github, "requester", None)
+    attribute = "_Requester__connectionClass"
+    if cache is None or not hasattr(requester, attribute):
+        return None
+    setattr(
+        requester,
+        attribute,
+        partial(_cached_connection, getattr(requester, attribute), cache),
+    )
+    return cache
+
+
+def http_cache_info(path: str = CACHE_SETTING) -> Dict[str, Any]:
+    cache = get_http_cache(path)
+    return cache.info() if cache else {}
+
+
+def main():
+    """Print statistics of the GitHub HTTP cache or clear it"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GitHub HTTP cache")
+    parser.add_argument("--path", default=CACHE_SETTING, help="Cache database")
+    parser.add_argument("--clear", action="store_true", help="Delete all entries")
+    args = parser.parse_args()
+
+    cache = get_http_cache(args.path)
+    if cache is None:
+        print("⚠️  GitHub HTTP cache is disabled")
+        return
+    if args.clear:
+        cache.clear()
+        print("🗑️  Cleared the GitHub HTTP cache")
+    info = cache.info()
+    print(
+        f"📊 {info['entries']} cached responses ({info['bytes'] / 1024:.0f} KiB), "
+        f"{info['lifetime_hits']} served on 304"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,25 +6,54 @@ Bidirectional synchronization between SQLite database and GitHub Issues
 
 import os
 import json
+import re
 import sqlite3
-import time
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from github import Github, GithubException
 from github.Issue import Issue
 from github.Repository import Repository
 
 from infrastructure.db.database import SessionLocal
+from infrastructure.db.identity_cache import cached_get
 from infrastructure.db.models.models import WorkItem, Idea, Project
+from infrastructure.db.pagination import iter_keyset
+from infrastructure.db.sync_cursors import advance_sync_cursor, get_sync_cursor
+
+from ai_lab_framework.github_graphql import GraphQLBatcher
+from ai_lab_framework.github_http_cache import http_cache_info, install_http_cache
+from ai_lab_framework.github_scheduler import SYNC_WORKERS, SyncScheduler
+
+# session.info flag: the session's changes came from GitHub, so auto-sync must
+# not send them back
+FROM_GITHUB = "from_github"
 
 
 class GitHubIntegration:
     """GitHub Issues integration for AI Lab Framework"""
 
-    def __init__(self, github_token: str, repo_name: str):
-        self.github = Github(github_token)
+    def __init__(
+        self, github_token: str, repo_name: str, max_workers: int = SYNC_WORKERS
+    ):
+        # No fixed per-request sleeps: they serialize the sync workers, and
+        # the scheduler paces calls from GitHub's rate-limit headers instead
+        self.github = Github(
+            github_token, seconds_between_requests=None, seconds_between_writes=None
+        )
+        # Reads are revalidated with ETags; a 304 costs no rate limit
+        install_http_cache(self.github)
         self.repo = self.github.get_repo(repo_name)
         self.db_session = SessionLocal()
+        self.scheduler = SyncScheduler(self.github, max_workers)
+        # Bulk issue creation and label changes as batched GraphQL mutations;
+        # GITHUB_SYNC_TRANSPORT=rest keeps one REST call per item
+        self.graphql = (
+            GraphQLBatcher(self.github, self.repo, self.scheduler)
+            if os.getenv("GITHUB_SYNC_TRANSPORT", "graphql") == "graphql"
+            else None
+        )
 
         # Configuration
         self.work_item_labels = ["ai-lab", "work-item", "framework"]
@@ -34,32 +63,10 @@ class GitHubIntegration:
     def create_issue_from_work_item(self, work_item: Dict[str, Any]) -> Optional[Issue]:
         """Create GitHub Issue from work item"""
         try:
-            title = f"[{work_item['id']}] {work_item['title']}"
-
-            # Build issue body
-            body = self._build_work_item_body(work_item)
-
-            # Determine labels
-            labels = self.work_item_labels.copy()
-            labels.append(f"priority:{work_item.get('priority', 'medium')}")
-            labels.append(f"status:{work_item.get('status', 'proposed')}")
-
-            if work_item.get("component"):
-                labels.append(f"component:{work_item['component']}")
-
-            # Create issue
-            issue = self.repo.create_issue(title=title, body=body, labels=labels)
-
-            # Update database with GitHub info
-            work_item_obj = (
-                self.db_session.query(WorkItem)
-                .filter(WorkItem.id == work_item["id"])
-                .first()
+            issue = self.scheduler.call(
+                self.repo.create_issue, write=True, **self._work_item_issue(work_item)
             )
-            if work_item_obj:
-                work_item_obj.github_issue_id = issue.number
-                work_item_obj.github_synced_at = datetime.now()
-                self.db_session.commit()
+            self._record_issue(WorkItem, work_item["id"], issue.number)
 
             print(
                 f"✅ Created GitHub Issue #{issue.number} for work item {work_item['id']}"
@@ -73,28 +80,10 @@ class GitHubIntegration:
     def create_issue_from_idea(self, idea: Dict[str, Any]) -> Optional[Issue]:
         """Create GitHub Issue from idea"""
         try:
-            title = f"[{idea['id']}] 💡 {idea['title']}"
-
-            # Build issue body
-            body = self._build_idea_body(idea)
-
-            # Determine labels
-            labels = self.idea_labels.copy()
-            labels.append(f"priority:{idea.get('priority', 'medium')}")
-            labels.append(f"status:{idea.get('status', 'proposed')}")
-
-            if idea.get("category"):
-                labels.append(f"category:{idea['category']}")
-
-            # Create issue
-            issue = self.repo.create_issue(title=title, body=body, labels=labels)
-
-            # Update database with GitHub info
-            idea_obj = self.db_session.query(Idea).filter(Idea.id == idea["id"]).first()
-            if idea_obj:
-                idea_obj.github_issue_id = issue.number
-                idea_obj.github_synced_at = datetime.now()
-                self.db_session.commit()
+            issue = self.scheduler.call(
+                self.repo.create_issue, write=True, **self._idea_issue(idea)
+            )
+            self._record_issue(Idea, idea["id"], issue.number)
 
             print(f"✅ Created GitHub Issue #{issue.number} for idea {idea['id']}")
             return issue
@@ -103,76 +92,151 @@ class GitHubIntegration:
             print(f"❌ Error creating GitHub Issue for {idea['id']}: {e}")
             return None
 
+    def _work_item_issue(self, work_item: Dict[str, Any]) -> Dict[str, Any]:
+        """Title, body and labels of a work item's issue"""
+        labels = self.work_item_labels.copy()
+        labels.append(f"priority:{work_item.get('priority', 'medium')}")
+        labels.append(f"status:{work_item.get('status', 'proposed')}")
+
+        if work_item.get("component"):
+            labels.append(f"component:{work_item['component']}")
+
+        return {
+            "title": f"[{work_item['id']}] {work_item['title']}",
+            "body": self._build_work_item_body(work_item),
+            "labels": labels,
+        }
+
+    def _idea_issue(self, idea: Dict[str, Any]) -> Dict[str, Any]:
+        """Title, body and labels of an idea's issue"""
+        labels = self.idea_labels.copy()
+        labels.append(f"priority:{idea.get('priority', 'medium')}")
+        labels.append(f"status:{idea.get('status', 'proposed')}")
+
+        if idea.get("category"):
+            labels.append(f"category:{idea['category']}")
+
+        return {
+            "title": f"[{idea['id']}] 💡 {idea['title']}",
+            "body": self._build_idea_body(idea),
+            "labels": labels,
+        }
+
+    def _record_issue(self, model, item_id: str, number: int):
+        """Update database with GitHub info"""
+        item = cached_get(self.db_session, model, item_id)
+        if item:
+            item.github_issue_id = number
+            item.github_synced_at = datetime.now()
+            self.db_session.commit()
+
+    def _issue_jobs(self, rows, build) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+        """(item ids, fn) jobs creating the issue ``build(row)`` of each row
+
+        With GraphQL a job is one aliased request for a batch of rows,
+        otherwise one REST call per row. ``fn`` returns (issue number,
+        error) per item.
+        """
+        if self.graphql is None:
+            for row in rows:
+                yield (row.id,), partial(self._create_issue_rest, build(row))
+            return
+
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.graphql.mutations_per_batch))
+            if not chunk:
+                return
+            operations = [self.graphql.create_issue(**build(row)) for row in chunk]
+            yield tuple(row.id for row in chunk), partial(
+                self._create_issues_graphql, operations
+            )
+
+    def _create_issue_rest(self, issue: Dict[str, Any]):
+        created = self.scheduler.call(self.repo.create_issue, write=True, **issue)
+        return [(created.number, None)]
+
+    def _create_issues_graphql(self, operations):
+        return [
+            (data["issue"]["number"] if data and data.get("issue") else None, error)
+            for data, error in self.graphql.execute(operations)
+        ]
+
+    def _create_issues(
+        self, model, jobs, results: Dict[str, int], kind: str, counter: str
+    ):
+        """Create issues on the scheduler; record each one on this thread"""
+        for item_ids, outcomes, error in self.scheduler.run(jobs):
+            if error is not None:
+                outcomes = [(None, error)] * len(item_ids)
+            for item_id, (number, failure) in zip(item_ids, outcomes):
+                if number is None:
+                    print(f"❌ Error creating GitHub Issue for {item_id}: {failure}")
+                    results["errors"] += 1
+                    continue
+                self._record_issue(model, item_id, number)
+                print(f"✅ Created GitHub Issue #{number} for {kind} {item_id}")
+                results[counter] += 1
+
     def sync_to_github(self, item_type: str = "all") -> Dict[str, int]:
         """Sync unsynced items to GitHub"""
         results = {"work_items": 0, "ideas": 0, "errors": 0}
 
         try:
             if item_type in ["all", "work_items"]:
-                # Sync work items
-                unsynced_work_items = (
-                    self.db_session.query(WorkItem)
-                    .filter(WorkItem.github_issue_id.is_(None))
-                    .all()
+                # Sync work items; pages of plain rows, so each issue's
+                # commit doesn't pin the whole result set in memory
+                unsynced_work_items = iter_keyset(
+                    self.db_session,
+                    WorkItem,
+                    filters=[WorkItem.github_issue_id.is_(None)],
+                    columns=[
+                        WorkItem.id,
+                        WorkItem.title,
+                        WorkItem.description,
+                        WorkItem.status,
+                        WorkItem.priority,
+                        WorkItem.type,
+                        WorkItem.estimated_hours,
+                        WorkItem.actual_hours,
+                        WorkItem.assignee,
+                        WorkItem.created_date,
+                        WorkItem.updated_date,
+                        WorkItem.due_date,
+                        WorkItem.labels,
+                        WorkItem.dependencies,
+                    ],
                 )
-                for work_item in unsynced_work_items:
-                    work_item_dict = {
-                        "id": work_item.id,
-                        "title": work_item.title,
-                        "description": work_item.description,
-                        "status": work_item.status,
-                        "priority": work_item.priority,
-                        "type": work_item.type,
-                        "component": work_item.type,  # Use type as component since component field doesn't exist
-                        "estimated_hours": work_item.estimated_hours,
-                        "actual_hours": work_item.actual_hours,
-                        "assignee": work_item.assignee,
-                        "created_date": work_item.created_date.isoformat()
-                        if work_item.created_date
-                        else None,
-                        "updated_date": work_item.updated_date.isoformat()
-                        if work_item.updated_date
-                        else None,
-                        "due_date": work_item.due_date.isoformat()
-                        if work_item.due_date
-                        else None,
-                        "tags": work_item.labels or [],  # Use labels as tags
-                        "dependencies": work_item.dependencies or [],
-                    }
-                    if self.create_issue_from_work_item(work_item_dict):
-                        results["work_items"] += 1
-                    else:
-                        results["errors"] += 1
-                    time.sleep(1)  # Rate limiting
+                # Issues are created concurrently; the next rows are read
+                # while earlier requests are in flight
+                jobs = self._issue_jobs(
+                    unsynced_work_items,
+                    lambda row: self._work_item_issue(self._work_item_dict(row)),
+                )
+                self._create_issues(WorkItem, jobs, results, "work item", "work_items")
 
             if item_type in ["all", "ideas"]:
                 # Sync ideas
-                unsynced_ideas = (
-                    self.db_session.query(Idea)
-                    .filter(Idea.github_issue_id.is_(None))
-                    .all()
+                unsynced_ideas = iter_keyset(
+                    self.db_session,
+                    Idea,
+                    filters=[Idea.github_issue_id.is_(None)],
+                    columns=[
+                        Idea.id,
+                        Idea.title,
+                        Idea.description,
+                        Idea.status,
+                        Idea.priority,
+                        Idea.category,
+                        Idea.created_date,
+                        Idea.updated_date,
+                        Idea.tags,
+                    ],
+                )
+                jobs = self._issue_jobs(
+                    unsynced_ideas, lambda row: self._idea_issue(self._idea_dict(row))
                 )
-                for idea in unsynced_ideas:
-                    idea_dict = {
-                        "id": idea.id,
-                        "title": idea.title,
-                        "description": idea.description,
-                        "status": idea.status,
-                        "priority": idea.priority,
-                        "category": idea.category,
-                        "created_date": idea.created_date.isoformat()
-                        if idea.created_date
-                        else None,
-                        "updated_date": idea.updated_date.isoformat()
-                        if idea.updated_date
-                        else None,
-                        "tags": idea.tags or [],
-                    }
-                    if self.create_issue_from_idea(idea_dict):
-                        results["ideas"] += 1
-                    else:
-                        results["errors"] += 1
-                    time.sleep(1)  # Rate limiting
+                self._create_issues(Idea, jobs, results, "idea", "ideas")
 
         except Exception as e:
             print(f"❌ Sync to GitHub failed: {e}")
@@ -180,62 +244,130 @@ class GitHubIntegration:
 
         return results
 
-    def sync_from_github(self) -> Dict[str, int]:
-        """Sync changes from GitHub back to local database"""
+    def sync_from_github(self, full: bool = False) -> Dict[str, int]:
+        """Sync changes from GitHub back to local database
+
+        GitHub filters by label and by the repository's stored cursor, so a
+        run only pages through ai-lab issues updated since the last one
+        (``full`` reads them all). Issues come oldest update first, and the
+        cursor moves past each one processed, up to the first that failed.
+        """
         results = {"updated": 0, "errors": 0}
+        repo_name = self.repo.full_name
+        since = None if full else get_sync_cursor(self.db_session, repo_name)
+        cursor = None
+        failed = False
 
         try:
-            print("Getting repository...")
-            print(f"Repository: {self.repo.full_name}")
-
-            print("Getting all issues...")
-            # Get all issues and filter manually
-            all_issues = self.repo.get_issues(state="all")
-            issues = [
-                issue
-                for issue in all_issues
-                if any(label.name == "ai-lab" for label in issue.labels)
-            ]
-            print(f"Found {len(issues)} issues with ai-lab label")
-            print(f"Found {list(issues).__len__()} issues with ai-lab label")
-
-            for issue in issues:
+            print(f"Repository: {repo_name}")
+            query = {
+                "state": "all",
+                "labels": ["ai-lab"],
+                "sort": "updated",
+                "direction": "asc",
+            }
+            if since is not None:
+                query["since"] = since
+                print(f"Getting ai-lab issues updated since {since.isoformat()}Z...")
+            else:
+                print("Getting all ai-lab issues...")
+
+            processed = 0
+            for issue in self.repo.get_issues(**query):
+                processed += 1
                 try:
-                    print(f"Processing issue #{issue.number}: {issue.title}")
-
-                    # Extract item ID from title
-                    item_id = self._extract_item_id(issue.title)
-                    if not item_id:
-                        print(f"  - No item ID found in title, skipping")
-                        continue
-
-                    # Determine item type from labels
-                    item_type = self._determine_item_type(issue.labels)
-                    if not item_type:
-                        print(f"  - No item type found in labels, skipping")
-                        continue
-
-                    print(f"  - Item ID: {item_id}, Type: {item_type}")
-
-                    # Update local database
-                    if self._update_local_from_github(issue, item_id, item_type):
-                        results["updated"] += 1
-                        print(f"  - Updated successfully")
-                    else:
-                        print(f"  - Update failed")
-
-                    time.sleep(0.5)  # Rate limiting
-
+                    synced = self._sync_issue_from_github(issue, results)
                 except Exception as e:
                     print(f"❌ Error processing issue #{issue.number}: {e}")
                     results["errors"] += 1
+                    synced = False
+                if not synced:
+                    failed = True  # Retried next run: the cursor stays before it
+                elif not failed:
+                    cursor = issue.updated_at
+            print(f"Processed {processed} ai-lab issues")
 
         except Exception as e:
             print(f"❌ Sync from GitHub failed: {e}")
             results["errors"] += 1
 
+        if cursor is not None:
+            advance_sync_cursor(self.db_session, repo_name, cursor)
+            self.db_session.commit()
+
         return results
 
+    def _sync_issue_from_github(self, issue: Issue, results: Dict[str, int]) -> bool:
+        """Apply one issue to the local database; False if it has to be retried"""
+        print(f"Processing issue #{issue.number}: {issue.title}")
+
+        # Extract item ID from title
+        item_id = self._extract_item_id(issue.title)
+        if not item_id:
+            print(f"  - No item ID found in title, skipping")
+            return True
+
+        # Determine item type from labels
+        item_type = self._determine_item_type(issue.labels)
+        if not item_type:
+            print(f"  - No item type found in labels, skipping")
+            return True
+
+        print(f"  - Item ID: {item_id}, Type: {item_type}")
+
+        # Update local database
+        if self._update_local_from_github(issue, item_id, item_type):
+            results["updated"] += 1
+            print(f"  - Updated successfully")
+            return True
+
+        print(f"  - Update failed")
+        return False
+
+    def _work_item_dict(self, work_item) -> Dict[str, Any]:
+        """Work item row as the dict the issue builders take"""
+        return {
+            "id": work_item.id,
+            "title": work_item.title,
+            "description": work_item.description,
+            "status": work_item.status,
+            "priority": work_item.priority,
+            "type": work_item.type,
+            "component": work_item.type,  # Use type as component since component field doesn't exist
+            "estimated_hours": work_item.estimated_hours,
+            "actual_hours": work_item.actual_hours,
+            "assignee": work_item.assignee,
+            "created_date": work_item.created_date.isoformat()
+            if work_item.created_date
+            else None,
+            "updated_date": work_item.updated_date.isoformat()
+            if work_item.updated_date
+            else None,
+            "due_date": work_item.due_date.isoformat()
+            if work_item.due_date
+            else None,
+            "tags": work_item.labels or [],  # Use labels as tags
+            "dependencies": work_item.dependencies or [],
+        }
+
+    def _idea_dict(self, idea) -> Dict[str, Any]:
+        """Idea row as the dict the issue builders take"""
+        return {
+            "id": idea.id,
+            "title": idea.title,
+            "description": idea.description,
+            "status": idea.status,
+            "priority": idea.priority,
+            "category": idea.category,
+            "created_date": idea.created_date.isoformat()
+            if idea.created_date
+            else None,
+            "updated_date": idea.updated_date.isoformat()
+            if idea.updated_date
+            else None,
+            "tags": idea.tags or [],
+        }
+
     def _build_work_item_body(self, work_item: Dict[str, Any]) -> str:
         """Build GitHub Issue body from work item"""
         body = f"""## 📋 Work Item Details
@@ -321,59 +453,34 @@ class GitHubIntegration:
 
     def _extract_item_id(self, title: str) -> Optional[str]:
         """Extract item ID from GitHub Issue title"""
-        import re
-
-        match = re.match(r"\[([A-Z0-9-]+)\]", title)
-        return match.group(1) if match else None
+        return extract_item_id(title)
 
     def _determine_item_type(self, labels) -> Optional[str]:
         """Determine item type from GitHub labels"""
-        label_names = [label.name for label in labels]
-
-        if "work-item" in label_names:
-            return "work_item"
-        elif "idea" in label_names:
-            return "idea"
-        elif "session" in label_names:
-            return "session"
-
-        return None
+        return item_type_from_labels([label.name for label in labels])
 
     def _update_local_from_github(
         self, issue: Issue, item_id: str, item_type: str
     ) -> bool:
         """Update local database from GitHub Issue"""
+        # Only this transaction came from GitHub: the session is long-lived,
+        # and later local edits on it must still reach auto-sync
+        self.db_session.info[FROM_GITHUB] = True
         try:
-            # Extract status from labels
-            status = "proposed"
-            for label in issue.labels:
-                if label.name.startswith("status:"):
-                    status = label.name.replace("status:", "")
-                    break
-
-            # Update database
-            if item_type == "work_item":
-                work_item = (
-                    self.db_session.query(WorkItem)
-                    .filter(WorkItem.id == item_id)
-                    .first()
-                )
-                if work_item:
-                    work_item.status = status
-                    work_item.updated_date = issue.updated_at
-                    self.db_session.commit()
-            elif item_type == "idea":
-                idea = self.db_session.query(Idea).filter(Idea.id == item_id).first()
-                if idea:
-                    idea.status = status
-                    idea.updated_date = issue.updated_at
-                    self.db_session.commit()
+            label_names = [label.name for label in issue.labels]
+            if apply_issue_labels(
+                self.db_session, item_type, item_id, label_names, issue.updated_at
+            ):
+                self.db_session.commit()
 
             return True
 
         except Exception as e:
             print(f"❌ Error updating local database for {item_id}: {e}")
+            self.db_session.rollback()
             return False
+        finally:
+            self.db_session.info.pop(FROM_GITHUB, None)
 
     def setup_repository_labels(self) -> bool:
         """Create required labels in GitHub repository"""
@@ -452,7 +559,9 @@ class GitHubIntegration:
 
             for label_data in required_labels:
                 if label_data["name"] not in existing_labels:
-                    self.repo.create_label(**label_data)
+                    self.scheduler.call(
+                        self.repo.create_label, write=True, **label_data
+                    )
                     print(f"✅ Created label: {label_data['name']}")
 
             print("🏷️ Repository labels setup completed!")
@@ -463,6 +572,65 @@ class GitHubIntegration:
             return False
 
 
+def extract_item_id(title: str) -> Optional[str]:
+    """Item ID from an issue title such as ``[WI-001] Title``"""
+    match = re.match(r"\[([A-Z0-9-]+)\]", title)
+    return match.group(1) if match else None
+
+
+def item_type_from_labels(label_names: List[str]) -> Optional[str]:
+    """Item type from the names of an issue's labels"""
+    if "work-item" in label_names:
+        return "work_item"
+    elif "idea" in label_names:
+        return "idea"
+    elif "session" in label_names:
+        return "session"
+
+    return None
+
+
+def apply_issue_labels(
+    session, item_type: str, item_id: str, label_names: List[str], updated_at
+) -> bool:
+    """Set a work item's or idea's status and priority from its issue labels
+
+    Shared by the polling sync and the webhook receiver. The status falls
+    back to "proposed"; the priority only changes when a ``priority:`` label
+    is present. Webhooks arrive in any order and can be redelivered, so a
+    state older than the last one applied (``github_updated_at``) is
+    skipped. Returns False when the item is not in the database or the
+    state is stale. The caller commits, with FROM_GITHUB set on the session
+    for that transaction.
+    """
+    models = {"work_item": WorkItem, "idea": Idea}
+    if item_type not in models:
+        return False
+    item = cached_get(session, models[item_type], item_id)
+    if not item:
+        return False
+
+    if updated_at is not None and updated_at.tzinfo is not None:
+        updated_at = updated_at.astimezone(timezone.utc).replace(tzinfo=None)
+    if updated_at and item.github_updated_at and updated_at < item.github_updated_at:
+        print(f"⚠️  Skipped stale GitHub state of {item_id} from {updated_at}")
+        return False
+
+    labels = {}
+    for name in label_names:
+        key, _, value = name.partition(":")
+        if value:
+            labels.setdefault(key, value)  # The first label of a key wins
+
+    item.status = labels.get("status", "proposed")
+    if "priority" in labels:
+        item.priority = labels["priority"]
+    if updated_at:
+        item.updated_date = updated_at
+        item.github_updated_at = updated_at
+    return True
+
+
 def main():
     """Test GitHub integration"""
     import argparse
@@ -478,6 +646,11 @@ def main():
         default="sync-all",
         help="Action to perform",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Read every ai-lab issue, not only those updated since the last sync",
+    )
 
     args = parser.parse_args()
 
@@ -504,14 +677,21 @@ def main():
         results = integration.sync_to_github()
         print(f"📊 Sync to GitHub results: {results}")
     elif args.action == "sync-from-github":
-        results = integration.sync_from_github()
+        results = integration.sync_from_github(full=args.full)
         print(f"📊 Sync from GitHub results: {results}")
     elif args.action == "sync-all":
         integration.setup_repository_labels()
         results_to = integration.sync_to_github()
-        results_from = integration.sync_from_github()
+        results_from = integration.sync_from_github(full=args.full)
         print(f"📊 Sync results - To GitHub: {results_to}, From GitHub: {results_from}")
 
+    cache = http_cache_info()
+    if cache:
+        print(
+            f"📊 GitHub HTTP cache: {cache['hits']} hits, {cache['misses']} misses "
+            f"({cache['hit_rate']}%), {cache['entries']} cached responses"
+        )
+
 
 if __name__ == "__main__":
     main()
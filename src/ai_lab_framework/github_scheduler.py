@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - GitHub Sync Scheduler
+Runs GitHub API calls on a small thread pool, paced by the rate-limit
+headers GitHub returns instead of fixed sleeps
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+from github import GithubException, RateLimitExceededException
+
+SYNC_WORKERS = int(os.getenv("GITHUB_SYNC_WORKERS", "4"))
+# Secondary limit on content creation: 80 requests per minute
+WRITE_INTERVAL = float(os.getenv("GITHUB_WRITE_INTERVAL", "0.75"))
+RESERVED_CALLS = 50  # Primary budget left for interactive use
+PACE_BELOW = 500  # Spread calls until the reset below this many spare calls
+DEFAULT_BACKOFF = 60.0  # Secondary limit without Retry-After
+MAX_RETRIES = 3
+
+Job = Tuple[Hashable, Callable[[], Any]]
+Outcome = Tuple[Hashable, Any, Optional[BaseException]]
+
+
+def _header(headers: Optional[Dict[str, str]], name: str) -> Optional[str]:
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def retry_after(error: GithubException, now: float) -> Optional[float]:
+    """Seconds to wait before retrying, or None if ``error`` is no rate limit.
+
+    ``Retry-After`` (secondary limits) wins; an exhausted primary limit waits
+    for ``X-RateLimit-Reset``.
+    """
+    if not isinstance(error, RateLimitExceededException) and error.status not in (
+        403,
+        429,
+    ):
+        return None
+    value = _header(error.headers, "retry-after")
+    if value is not None:
+        return max(float(value), 0.0)
+    reset = _header(error.headers, "x-ratelimit-reset")
+    if _header(error.headers, "x-ratelimit-remaining") == "0" and reset is not None:
+        return max(float(reset) - now, 0.0) + 1
+    if isinstance(error, RateLimitExceededException) or (
+        "rate limit" in str(error.data).lower()
+    ):
+        return DEFAULT_BACKOFF
+    return None  # A plain 403, e.g. missing permissions
+
+
+class RateLimiter:
+    """Start times for API calls, shared by all workers.
+
+    Each call reserves the next free slot under the lock and sleeps outside
+    it. Writes are spaced by ``write_interval``; once the primary budget runs
+    low, calls are spread evenly until its reset; after a rate-limit response
+    every call waits out the pause.
+    """
+
+    def __init__(
+        self,
+        write_interval: float = WRITE_INTERVAL,
+        reserve: int = RESERVED_CALLS,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.write_interval = write_interval
+        self.reserve = reserve
+        self.clock = clock
+        self.sleep = sleep
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.paused_until = 0.0
+        self._next_call = 0.0
+        self._next_write = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "writes": 0, "pauses": 0, "waited": 0.0}
+
+    def acquire(self, write: bool = False, weight: int = 1):
+        """Block until this call may start.
+
+        ``weight`` is the number of items a write creates or changes (a
+        batched GraphQL mutation counts once per aliased mutation).
+        """
+        with self._lock:
+            now = self.clock()
+            start = max(now, self.paused_until, self._next_call)
+            if self.remaining is not None:
+                if start >= self.reset_at:
+                    self.remaining = None  # The budget has been refilled
+                elif self.remaining <= self.reserve:
+                    start = self.reset_at
+                    self.remaining = None
+            if write:
+                start = max(start, self._next_write)
+                self._next_write = start + self.write_interval * weight
+            if self.remaining is not None:
+                spare = self.remaining - self.reserve
+                if spare < PACE_BELOW:
+                    self._next_call = start + (self.reset_at - start) / spare
+                self.remaining -= 1  # Until the response says otherwise
+            self._stats["calls"] += 1
+            self._stats["writes"] += weight if write else 0
+            self._stats["waited"] += start - now
+        if start > now:
+            self.sleep(start - now)
+
+    def update(self, remaining: int, reset_at: float):
+        """Record ``X-RateLimit-Remaining``/``Reset`` of a response."""
+        if remaining < 0:
+            return  # Not known yet
+        with self._lock:
+            if reset_at == self.reset_at and self.remaining is not None:
+                # Responses finish out of order: keep the lowest count
+                remaining = min(remaining, self.remaining)
+            self.remaining = remaining
+            self.reset_at = reset_at
+
+    def pause(self, seconds: float):
+        """Hold every call for ``seconds`` (after a rate-limit response)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+            self._stats["pauses"] += 1
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "waited": round(self._stats["waited"], 2),
+                "remaining": self.remaining,
+                "reset_at": self.reset_at,
+            }
+
+
+class SyncScheduler:
+    """Bounded-concurrency runner for GitHub calls.
+
+    Jobs only talk to GitHub, each request through ``call``; ``run`` hands
+    each outcome back to the calling thread, which keeps the database session
+    single-threaded.
+    """
+
+    def __init__(
+        self,
+        github=None,
+        max_workers: int = SYNC_WORKERS,
+        limiter: Optional[RateLimiter] = None,
+        max_retries: int = MAX_RETRIES,
+    ):
+        self.github = github
+        self.max_workers = max(max_workers, 1)
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+
+    def call(self, fn: Callable, *args, write: bool = False, weight: int = 1, **kwargs):
+        """``fn(*args, **kwargs)`` paced by the limiter, retried on rate limits."""
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(write, weight)
+            try:
+                return fn(*args, **kwargs)
+            except GithubException as e:
+                seconds = retry_after(e, self.limiter.clock())
+                if seconds is None or attempt == self.max_retries:
+                    raise
+                print(f"⚠️ GitHub rate limit hit, pausing {seconds:.0f}s")
+                self.limiter.pause(seconds)
+            finally:
+                self._observe()
+
+    def _observe(self):
+        """Feed the rate-limit headers of the last response to the limiter."""
+        if self.github is None:
+            return
+        try:
+            remaining, _ = self.github.rate_limiting
+            reset_at = self.github.rate_limiting_resettime
+        except GithubException:
+            return
+        self.limiter.update(remaining, reset_at)
+
+    def run(self, jobs: Iterable[Job]) -> Iterator[Outcome]:
+        """Run ``(key, fn)`` jobs, yielding ``(key, result, error)`` as each ends.
+
+        ``fn`` makes its requests with ``call``. At most ``2 * max_workers``
+        jobs are taken from ``jobs`` ahead of the outcomes, so it can be a
+        lazy query.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="github-sync"
+        ) as pool:
+            pending = {}
+
+            def finished():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    error = future.exception()
+                    yield key, None if error else future.result(), error
+
+            for key, fn in jobs:
+                pending[pool.submit(fn)] = key
+                if len(pending) >= 2 * self.max_workers:
+                    yield from finished()
+            while pending:
+                yield from finished()
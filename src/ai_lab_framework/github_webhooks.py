@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - GitHub Webhooks
+Push-based inbound sync: a signed webhook endpoint queues issue and label
+events, and a background worker applies them to the local database
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from ai_lab_framework.github_integration import (
+    FROM_GITHUB,
+    apply_issue_labels,
+    extract_item_id,
+    item_type_from_labels,
+)
+from infrastructure.db.database import SessionLocal, writer_session
+from infrastructure.db.models.models import Idea, WorkItem
+
+WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+WEBHOOK_PATH = "/webhooks/github"
+QUEUE_SIZE = int(os.getenv("GITHUB_WEBHOOK_QUEUE_SIZE", "1000"))
+SEEN_DELIVERIES = 1000  # Delivery ids remembered to drop redeliveries
+
+EVENTS = ("issues", "label")
+LABEL_KEYS = ("status", "priority")
+
+_STOP = object()
+
+Delivery = Dict[str, Any]  # {"event", "delivery", "payload"}
+
+
+def sign(body: bytes, secret: str) -> str:
+    """X-Hub-Signature-256 value of ``body``"""
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """True if ``signature`` is GitHub's HMAC-SHA256 of ``body`` with ``secret``"""
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign(body, secret), signature)
+
+
+def _timestamp(value: Optional[str]) -> Optional[datetime]:
+    """GitHub's ISO 8601 timestamps ("2026-03-01T12:00:00Z"), timezone-aware"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class WebhookProcessor:
+    """Queue of webhook deliveries and the thread that applies them.
+
+    The endpoint only verifies and enqueues; database writes happen here,
+    one delivery at a time under the process-wide write lock. Webhooks can
+    be missed, so the polling sync and its cursor stay as they are and
+    catch up on anything that never arrived.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        maxsize: int = QUEUE_SIZE,
+    ):
+        self.session_factory = session_factory
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {
+            "queued": 0,
+            "duplicates": 0,
+            "applied": 0,
+            "ignored": 0,
+            "errors": 0,
+        }
+
+    def submit(self, event: str, payload: Dict[str, Any], delivery: str = "") -> str:
+        """Queue a delivery; "duplicate" if it was seen before.
+
+        Raises queue.Full when the worker is too far behind.
+        """
+        with self._lock:
+            if delivery and delivery in self._seen:
+                self._stats["duplicates"] += 1
+                return "duplicate"
+            self.queue.put_nowait((event, payload, delivery))
+            if delivery:
+                self._seen[delivery] = None
+                if len(self._seen) > SEEN_DELIVERIES:
+                    self._seen.popitem(last=False)
+            self._stats["queued"] += 1
+        return "queued"
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="github-webhooks", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10):
+        """Apply what is queued, then stop the worker"""
+        if self._thread is not None:
+            self.queue.put(_STOP)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def drain(self):
+        """Block until every queued delivery has been applied"""
+        self.queue.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                event, payload, delivery = item
+                try:
+                    changed = self.apply(event, payload)
+                except Exception as e:
+                    print(f"❌ Failed to apply GitHub {event} event {delivery}: {e}")
+                    with self._lock:
+                        self._stats["errors"] += 1
+                        # A redelivery from GitHub gets another chance
+                        self._seen.pop(delivery, None)
+                    continue
+                with self._lock:
+                    self._stats["applied" if changed else "ignored"] += 1
+            finally:
+                self.queue.task_done()
+
+    def apply(self, event: str, payload: Dict[str, Any]) -> int:
+        """Apply one event to the database; returns the number of rows changed"""
+        with writer_session(self.session_factory) as session:
+            # Keep auto-sync from pushing these changes back to GitHub
+            session.info[FROM_GITHUB] = True
+            if event == "issues":
+                return self._apply_issue(session, payload)
+            if event == "label":
+                return self._apply_label(session, payload)
+        return 0
+
+    def _apply_issue(self, session, payload: Dict[str, Any]) -> int:
+        """Status/priority from the labels of the issue in an issues event"""
+        issue = payload.get("issue") or {}
+        if payload.get("action") in ("deleted", "transferred") or not issue:
+            return 0
+        item_id = extract_item_id(issue.get("title", ""))
+        label_names = [label["name"] for label in issue.get("labels", [])]
+        item_type = item_type_from_labels(label_names)
+        if not item_id or not item_type:
+            return 0
+        updated_at = _timestamp(issue.get("updated_at"))
+        if apply_issue_labels(session, item_type, item_id, label_names, updated_at):
+            print(f"🔄 Applied GitHub issue #{issue.get('number')} to {item_id}")
+            return 1
+        return 0
+
+    def _apply_label(self, session, payload: Dict[str, Any]) -> int:
+        """A renamed status/priority label renames the value on synced items
+
+        GitHub sends no issues event for the issues carrying a renamed
+        label. Created and deleted labels change no item.
+        """
+        if payload.get("action") != "edited":
+            return 0
+        old_name = ((payload.get("changes") or {}).get("name") or {}).get("from")
+        new_name = (payload.get("label") or {}).get("name", "")
+        if not old_name:
+            return 0
+        old_key, _, old_value = old_name.partition(":")
+        new_key, _, new_value = new_name.partition(":")
+        if old_key != new_key or old_key not in LABEL_KEYS or not new_value:
+            return 0
+
+        # Through the ORM, not a bulk UPDATE, so flush listeners (aggregate
+        # counters, identity cache) see every change
+        changed = 0
+        for model in (WorkItem, Idea):
+            items = session.scalars(
+                select(model).where(
+                    model.github_issue_id.isnot(None),
+                    getattr(model, old_key) == old_value,
+                )
+            )
+            for item in items:
+                setattr(item, old_key, new_value)
+                changed += 1
+        print(f"🔄 Renamed {old_key} '{old_value}' to '{new_value}' on {changed} items")
+        return changed
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "pending": self.queue.qsize()}
+
+
+def create_app(
+    secret: str = WEBHOOK_SECRET, processor: Optional[WebhookProcessor] = None
+):
+    """FastAPI app receiving GitHub webhooks at WEBHOOK_PATH.
+
+    Configure the GitHub webhook with content type application/json (form
+    encoded payloads are accepted too), the same secret, and the "Issues"
+    and "Labels" events.
+    """
+    from fastapi import FastAPI, HTTPException, Request
+
+    if not secret:
+        raise ValueError("A webhook secret is required (GITHUB_WEBHOOK_SECRET)")
+    processor = processor or WebhookProcessor()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        processor.start()
+        yield
+        processor.stop()
+
+    app = FastAPI(title="AI Lab GitHub Webhooks", lifespan=lifespan)
+    app.state.processor = processor
+
+    @app.post(WEBHOOK_PATH, status_code=202)
+    async def receive(request: Request):
+        body = await request.body()
+        signature = request.headers.get("X-Hub-Signature-256")
+        if not verify_signature(body, signature, secret):
+            raise HTTPException(status_code=401, detail="Invalid signature")
+
+        event = request.headers.get("X-GitHub-Event", "")
+        if event == "ping":
+            return {"status": "pong"}
+        if event not in EVENTS:
+            return {"status": "ignored"}
+
+        try:
+            if request.headers.get("Content-Type", "").startswith(
+                "application/x-www-form-urlencoded"
+            ):
+                body = parse_qs(body.decode())["payload"][0].encode()
+            payload = json.loads(body)
+        except (KeyError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid payload") from None
+
+        delivery = request.headers.get("X-GitHub-Delivery", "")
+        try:
+            return {"status": processor.submit(event, payload, delivery)}
+        except queue.Full:
+            raise HTTPException(
+                status_code=503, detail="Webhook queue is full"
+            ) from None
+
+    @app.get(WEBHOOK_PATH)
+    async def status():
+        return processor.info()
+
+    return app
+
+
+def issue_event(
+    item_id: str,
+    item_type: str = "work_item",
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    number: int = 1,
+) -> Delivery:
+    """A synthetic issues "labeled" delivery for an item"""
+    labels = ["ai-lab", "work-item" if item_type == "work_item" else "idea"]
+    if status:
+        labels.append(f"status:{status}")
+    if priority:
+        labels.append(f"priority:{priority}")
+    return {
+        "event": "issues",
+        "delivery": str(uuid.uuid4()),
+        "payload": {
+            "action": "labeled",
+            "issue": {
+                "number": number,
+                "title": f"[{item_id}] {item_id}",
+                "labels": [{"name": name} for name in labels],
+                "updated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            },
+        },
+    }
+
+
+def load_deliveries(path: str) -> List[Delivery]:
+    """Deliveries from a JSON file (one or a list) or a JSON Lines file"""
+    text = Path(path).read_text()
+    if path.endswith(".jsonl"):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    data = json.loads(text)
+    return data if isinstance(data, list) else [data]
+
+
+def replay(
+    deliveries: Iterable[Delivery],
+    secret: str = WEBHOOK_SECRET,
+    url: Optional[str] = None,
+    session_factory: sessionmaker = SessionLocal,
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """Sign and send deliveries as GitHub would; returns (status code, body).
+
+    With ``url`` they are posted to a running receiver. Without it they go
+    through an in-process app on ``session_factory``, and are applied
+    before this returns.
+    """
+    requests_to_send = []
+    for delivery in deliveries:
+        body = json.dumps(delivery["payload"]).encode()
+        headers = {
+            "Content-Type": "application/json",
+            "X-GitHub-Event": delivery["event"],
+            "X-GitHub-Delivery": delivery.get("delivery") or str(uuid.uuid4()),
+            "X-Hub-Signature-256": sign(body, secret),
+        }
+        requests_to_send.append((body, headers))
+
+    if url:
+        import requests
+
+        responses = [
+            requests.post(url, data=body, headers=headers, timeout=10)
+            for body, headers in requests_to_send
+        ]
+        return [(response.status_code, response.json()) for response in responses]
+
+    from fastapi.testclient import TestClient
+
+    processor = WebhookProcessor(session_factory)
+    with TestClient(create_app(secret, processor)) as client:
+        responses = [
+            client.post(WEBHOOK_PATH, content=body, headers=headers)
+            for body, headers in requests_to_send
+        ]
+        processor.drain()
+    return [(response.status_code, response.json()) for response in responses]
+
+
+def main():
+    """Serve the webhook endpoint or replay deliveries locally"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GitHub webhook receiver")
+    parser.add_argument("action", choices=["serve", "replay"], help="Action to perform")
+    parser.add_argument("files", nargs="*", help="Delivery files to replay")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to serve on")
+    parser.add_argument("--url", help="Replay to a running receiver at URL")
+    parser.add_argument("--item", help="Replay a labeled event for this item ID")
+    parser.add_argument("--idea", action="store_true", help="The item is an idea")
+    parser.add_argument("--status", help="Status label of the replayed event")
+    parser.add_argument("--priority", help="Priority label of the replayed event")
+    args = parser.parse_args()
+
+    if not WEBHOOK_SECRET:
+        print("❌ Set the GITHUB_WEBHOOK_SECRET environment variable")
+        return
+
+    if args.action == "serve":
+        import uvicorn
+
+        uvicorn.run(create_app(), host=args.host, port=args.port)
+        return
+
+    deliveries = [delivery for path in args.files for delivery in load_deliveries(path)]
+    if args.item:
+        item_type = "idea" if args.idea else "work_item"
+        deliveries.append(issue_event(args.item, item_type, args.status, args.priority))
+    if not deliveries:
+        print("⚠️  Nothing to replay: pass delivery files or --item")
+        return
+
+    for (code, body), delivery in zip(
+        replay(deliveries, url=args.url), deliveries, strict=True
+    ):
+        icon = "✅" if code < 300 else "❌"
+        print(f"{icon} {delivery['event']}: {code} {body}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Aggregate Counters
+Incrementally maintained status/priority/category rollups for O(1) dashboard reads
+"""
+
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .database import SessionLocal
+from .models.models import AggregateCounter, Idea, Project, WorkItem
+
+# Columns rolled up per model; every model also gets a total row
+TRACKED_DIMENSIONS = {
+    WorkItem: ("status", "priority", "type"),
+    Idea: ("status", "priority", "category"),
+    Project: ("status", "priority", "category"),
+}
+
+TOTAL_DIMENSION = "total"
+TOTAL_VALUE = "all"
+
+DeltaKey = Tuple[str, str, str]
+
+
+def _force_active_history(target, value, oldvalue, initiator):
+    """No-op 'set' listener; registered with active_history=True so the old
+    value is loaded before it is overwritten, even on expired instances."""
+    return value
+
+
+def _previous_value(obj, dimension: str):
+    history = inspect(obj).attrs[dimension].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return None
+
+
+def _collect_deltas(session: Session) -> Counter:
+    deltas: Counter = Counter()
+
+    for obj in session.new:
+        dimensions = TRACKED_DIMENSIONS.get(type(obj))
+        if dimensions is None:
+            continue
+        table = obj.__tablename__
+        deltas[(table, TOTAL_DIMENSION, TOTAL_VALUE)] += 1
+        for dimension in dimensions:
+            value = getattr(obj, dimension)
+            if value is not None:
+                deltas[(table, dimension, value)] += 1
+
+    for obj in session.deleted:
+        dimensions = TRACKED_DIMENSIONS.get(type(obj))
+        if dimensions is None:
+            continue
+        table = obj.__tablename__
+        deltas[(table, TOTAL_DIMENSION, TOTAL_VALUE)] -= 1
+        for dimension in dimensions:
+            value = _previous_value(obj, dimension)
+            if value is not None:
+                deltas[(table, dimension, value)] -= 1
+
+    for obj in session.dirty:
+        dimensions = TRACKED_DIMENSIONS.get(type(obj))
+        if dimensions is None:
+            continue
+        table = obj.__tablename__
+        state = inspect(obj)
+        for dimension in dimensions:
+            history = state.attrs[dimension].history
+            if not history.has_changes():
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            if old == new:
+                continue
+            if old is not None:
+                deltas[(table, dimension, old)] -= 1
+            if new is not None:
+                deltas[(table, dimension, new)] += 1
+
+    return deltas
+
+
+def apply_deltas(connection, deltas: Counter):
+    """Upsert counter deltas in the caller's transaction."""
+    rows = [
+        {"entity": entity, "dimension": dimension, "value": value, "count": delta}
+        for (entity, dimension, value), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    table = AggregateCounter.__table__
+    statement = sqlite_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.entity, table.c.dimension, table.c.value],
+        set_={"count": table.c.count + statement.excluded.count},
+    )
+    connection.execute(statement, rows)
+
+
+def _after_flush(session: Session, flush_context):
+    deltas = _collect_deltas(session)
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+
+
+def setup_aggregate_counters(session_factory: sessionmaker = SessionLocal):
+    """Register the flush listener that keeps aggregate_counters current.
+
+    Bulk ``Query.update()``/``delete()`` and raw SQL bypass flush events; run
+    ``rebuild_aggregate_counters`` after those.
+    """
+    for model, dimensions in TRACKED_DIMENSIONS.items():
+        for dimension in dimensions:
+            attribute = getattr(model, dimension)
+            if not event.contains(attribute, "set", _force_active_history):
+                event.listen(
+                    attribute, "set", _force_active_history, active_history=True
+                )
+
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+
+
+def _recount_selects() -> List[str]:
+    selects = []
+    for model, dimensions in TRACKED_DIMENSIONS.items():
+        table = model.__tablename__
+        selects.append(
+            f"SELECT '{table}', '{TOTAL_DIMENSION}', '{TOTAL_VALUE}', COUNT(*) "
+            f"FROM {table}"
+        )
+        for dimension in dimensions:
+            selects.append(
+                f"SELECT '{table}', '{dimension}', {dimension}, COUNT(*) "
+                f"FROM {table} WHERE {dimension} IS NOT NULL GROUP BY {dimension}"
+            )
+    return selects
+
+
+def rebuild_statements() -> List[str]:
+    """Plain SQL that rebuilds all counters from scratch (usable from sqlite3)."""
+    return ["DELETE FROM aggregate_counters"] + [
+        f"INSERT INTO aggregate_counters (entity, dimension, value, count) {select}"
+        for select in _recount_selects()
+    ]
+
+
+def rebuild_aggregate_counters(session: Session):
+    """Recompute every counter from the base tables (reconciliation)."""
+    connection = session.connection()
+    for statement in rebuild_statements():
+        connection.exec_driver_sql(statement)
+
+
+def get_counts(session: Session, entity: str, dimension: str) -> Dict[str, int]:
+    """Return {value: count} for one rollup, e.g. ('work_items', 'status')."""
+    rows = session.execute(
+        select(AggregateCounter.value, AggregateCounter.count).where(
+            AggregateCounter.entity == entity,
+            AggregateCounter.dimension == dimension,
+            AggregateCounter.count > 0,
+        )
+    )
+    return {value: count for value, count in rows}
+
+
+def get_total(session: Session, entity: str) -> int:
+    """Return the row count of an entity table."""
+    count = session.get(AggregateCounter, (entity, TOTAL_DIMENSION, TOTAL_VALUE))
+    return count.count if count else 0
+
+
+def get_completion_rate(session: Session) -> float:
+    """Percentage of work items in status 'done'."""
+    total = get_total(session, "work_items")
+    if total == 0:
+        return 0.0
+    done = session.get(AggregateCounter, ("work_items", "status", "done"))
+    return round(((done.count if done else 0) / total) * 100, 2)
+
+
+def verify_aggregate_counters(session: Session) -> Dict[DeltaKey, Tuple[int, int]]:
+    """Compare stored counters with a fresh recount.
+
+    Returns {(entity, dimension, value): (stored, actual)} for mismatches.
+    """
+    connection = session.connection()
+    stored = {
+        (entity, dimension, value): count
+        for entity, dimension, value, count in connection.exec_driver_sql(
+            "SELECT entity, dimension, value, count FROM aggregate_counters"
+        )
+        if count
+    }
+    actual = {}
+    for select_sql in _recount_selects():
+        for entity, dimension, value, count in connection.exec_driver_sql(select_sql):
+            if count:
+                actual[(entity, dimension, value)] = count
+
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in set(stored) | set(actual)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+
+def main():
+    """Rebuild or verify the aggregate counters"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Aggregate counter maintenance")
+    parser.add_argument(
+        "--verify", action="store_true", help="Only report drift, don't rebuild"
+    )
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.verify:
+            drift = verify_aggregate_counters(session)
+            if not drift:
+                print("✅ Aggregate counters are consistent")
+            for (entity, dimension, value), (stored, actual) in sorted(drift.items()):
+                print(
+                    f"⚠️  {entity}.{dimension}={value}: stored {stored}, actual {actual}"
+                )
+        else:
+            rebuild_aggregate_counters(session)
+            session.commit()
+            print("✅ Aggregate counters rebuilt")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
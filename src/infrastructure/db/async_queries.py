@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Async Read Paths
+Non-blocking versions of the hot read paths for FastAPI handlers (AsyncSession)
+"""
+
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models.models import Project, WorkItem
+
+
+async def list_work_items(
+    session: AsyncSession,
+    status: Optional[str] = None,
+    project_id: Optional[str] = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> List[WorkItem]:
+    """Work items, most recently updated first."""
+    query = select(WorkItem)
+    if status:
+        query = query.where(WorkItem.status == status)
+    if project_id:
+        query = query.where(WorkItem.project_id == project_id)
+    query = query.order_by(WorkItem.updated_date.desc()).limit(limit).offset(offset)
+    result = await session.execute(query)
+    return list(result.scalars())
+
+
+async def get_work_item(session: AsyncSession, work_id: str) -> Optional[WorkItem]:
+    """Single work item by id."""
+    return await session.get(WorkItem, work_id)
+
+
+async def count_work_items_by_status(session: AsyncSession) -> Dict[str, int]:
+    """{status: count} over all work items."""
+    result = await session.execute(
+        select(WorkItem.status, func.count()).group_by(WorkItem.status)
+    )
+    return {status: count for status, count in result.all()}
+
+
+async def get_project_status(session: AsyncSession) -> Dict[str, Any]:
+    """Async version of ProjectRepositoryManager.get_project_status.
+
+    Work item counts come from one GROUP BY instead of a lazy load per
+    project (lazy loading is not available on an AsyncSession).
+    """
+    projects = (await session.execute(select(Project))).scalars().all()
+    counts = dict(
+        (
+            await session.execute(
+                select(WorkItem.project_id, func.count())
+                .where(WorkItem.project_id.is_not(None))
+                .group_by(WorkItem.project_id)
+            )
+        ).all()
+    )
+
+    status = {
+        "total_projects": len(projects),
+        "with_repositories": 0,
+        "without_repositories": 0,
+        "projects": [],
+    }
+
+    for project in projects:
+        status["projects"].append(
+            {
+                "id": project.id,
+                "name": project.name,
+                "status": project.status,
+                "has_repository": bool(project.repository_url),
+                "repository_url": project.repository_url,
+                "work_items_count": counts.get(project.id, 0),
+            }
+        )
+
+        if project.repository_url:
+            status["with_repositories"] += 1
+        else:
+            status["without_repositories"] += 1
+
+    return status
@@ -7,18 +7,20 @@ Automatically syncs status changes to GitHub Issues
 import os
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set, Tuple
+from github import GithubException
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import event
+from sqlalchemy import event, inspect
 from sqlalchemy.engine import Engine
 
 from .database import SessionLocal, engine
+from .identity_cache import cached_get
 from .models.models import WorkItem, Idea, Project
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
-from ai_lab_framework.github_integration import GitHubIntegration
+from ai_lab_framework.github_integration import FROM_GITHUB, GitHubIntegration
 
 
 class AutoGitHubSync:
@@ -56,204 +58,177 @@ class AutoGitHubSync:
 
     def sync_work_item_status(self, work_item_id: str, new_status: str) -> bool:
         """Sync work item status change to GitHub"""
-        if not self.integration:
-            return False
-
-        try:
-            session = SessionLocal()
-            work_item = (
-                session.query(WorkItem).filter(WorkItem.id == work_item_id).first()
-            )
-
-            if not work_item or not work_item.github_issue_id:
-                session.close()
-                return False
-
-            # Get the GitHub issue
-            issue = self.integration.repo.get_issue(work_item.github_issue_id)
-
-            # Update status labels
-            current_labels = [label.name for label in issue.labels]
-            new_labels = []
-
-            # Remove old status labels
-            for label in current_labels:
-                if not label.startswith("status:"):
-                    new_labels.append(label)
-
-            # Add new status label
-            new_labels.append(f"status:{new_status}")
-
-            # Update issue labels
-            issue.edit(labels=new_labels)
-
-            # Update sync timestamp
-            work_item.github_synced_at = datetime.now()
-            session.commit()
-
-            print(
-                f"🔄 Auto-synced {work_item_id} status to '{new_status}' in GitHub issue #{work_item.github_issue_id}"
-            )
-            session.close()
-            return True
-
-        except Exception as e:
-            print(f"❌ Failed to auto-sync work item {work_item_id}: {e}")
-            if "session" in locals():
-                session.close()
-            return False
+        changes = [("work_item", work_item_id, "status", new_status)]
+        return self.sync_label_changes(changes) == 1
 
     def sync_idea_status(self, idea_id: str, new_status: str) -> bool:
         """Sync idea status change to GitHub"""
-        if not self.integration:
-            return False
-
-        try:
-            session = SessionLocal()
-            idea = session.query(Idea).filter(Idea.id == idea_id).first()
-
-            if not idea or not idea.github_issue_id:
-                session.close()
-                return False
-
-            # Get the GitHub issue
-            issue = self.integration.repo.get_issue(idea.github_issue_id)
-
-            # Update status labels
-            current_labels = [label.name for label in issue.labels]
-            new_labels = []
-
-            # Remove old status labels
-            for label in current_labels:
-                if not label.startswith("status:"):
-                    new_labels.append(label)
-
-            # Add new status label
-            new_labels.append(f"status:{new_status}")
-
-            # Update issue labels
-            issue.edit(labels=new_labels)
-
-            # Update sync timestamp
-            idea.github_synced_at = datetime.now()
-            session.commit()
-
-            print(
-                f"🔄 Auto-synced {idea_id} status to '{new_status}' in GitHub issue #{idea.github_issue_id}"
-            )
-            session.close()
-            return True
-
-        except Exception as e:
-            print(f"❌ Failed to auto-sync idea {idea_id}: {e}")
-            if "session" in locals():
-                session.close()
-            return False
+        changes = [("idea", idea_id, "status", new_status)]
+        return self.sync_label_changes(changes) == 1
 
     def sync_priority_change(
         self, item_type: str, item_id: str, new_priority: str
     ) -> bool:
         """Sync priority change to GitHub"""
-        if not self.integration:
-            return False
-
+        changes = [(item_type, item_id, "priority", new_priority)]
+        return self.sync_label_changes(changes) == 1
+
+    def sync_label_changes(self, changes: List[Tuple[str, str, str, str]]) -> int:
+        """Sync (item_type, item_id, key, new_value) status/priority changes
+
+        All changes go out together: with GraphQL one query looks up the
+        issues and one batch of label mutations updates them. Returns the
+        number of items synced.
+        """
+        if not changes or not self.integration:
+            return 0
+
+        models = {"work_item": WorkItem, "idea": Idea}
+        wanted: Dict[Tuple[str, str], Dict[str, str]] = {}
+        for item_type, item_id, key, new_value in changes:
+            if item_type in models:
+                # The latest value of each key wins
+                wanted.setdefault((item_type, item_id), {})[key] = new_value
+
+        session = SessionLocal()
         try:
-            session = SessionLocal()
-
-            if item_type == "work_item":
-                item = session.query(WorkItem).filter(WorkItem.id == item_id).first()
-            elif item_type == "idea":
-                item = session.query(Idea).filter(Idea.id == item_id).first()
-            else:
-                session.close()
-                return False
-
-            if not item or not item.github_issue_id:
-                session.close()
-                return False
-
-            # Get the GitHub issue
-            issue = self.integration.repo.get_issue(item.github_issue_id)
-
-            # Update priority labels
-            current_labels = [label.name for label in issue.labels]
-            new_labels = []
-
-            # Remove old priority labels
-            for label in current_labels:
-                if not label.startswith("priority:"):
-                    new_labels.append(label)
-
-            # Add new priority label
-            new_labels.append(f"priority:{new_priority}")
-
-            # Update issue labels
-            issue.edit(labels=new_labels)
-
-            # Update sync timestamp
-            item.github_synced_at = datetime.now()
+            items = {}
+            for item_type, item_id in wanted:
+                item = cached_get(session, models[item_type], item_id)
+                if item and item.github_issue_id:
+                    items[(item_type, item_id)] = item
+
+            synced = self._apply_labels(
+                {item.github_issue_id: wanted[key] for key, item in items.items()}
+            )
+            count = 0
+            for (item_type, item_id), item in items.items():
+                if item.github_issue_id not in synced:
+                    print(f"❌ Failed to auto-sync {item_type} {item_id}")
+                    continue
+                item.github_synced_at = datetime.now()
+                count += 1
+                changed = ", ".join(
+                    f"{key} to '{value}'"
+                    for key, value in wanted[(item_type, item_id)].items()
+                )
+                print(
+                    f"🔄 Auto-synced {item_id} {changed} "
+                    f"in GitHub issue #{item.github_issue_id}"
+                )
             session.commit()
+            return count
 
-            print(
-                f"🔄 Auto-synced {item_id} priority to '{new_priority}' in GitHub issue #{item.github_issue_id}"
-            )
+        except Exception as e:
+            print(f"❌ Failed to auto-sync {len(wanted)} items: {e}")
+            return 0
+        finally:
             session.close()
-            return True
 
-        except Exception as e:
-            print(f"❌ Failed to auto-sync {item_type} {item_id} priority: {e}")
-            if "session" in locals():
-                session.close()
-            return False
+    def _apply_labels(self, updates: Dict[int, Dict[str, str]]) -> Set[int]:
+        """Relabel issues ({number: {key: value}}); returns the numbers done"""
+        integration = self.integration
+        graphql = integration.graphql
+        if not updates:
+            return set()
+
+        if graphql is None:
+            # REST: a get_issue plus an edit per issue
+            synced = set()
+            for number, labels in updates.items():
+                try:
+                    issue = integration.scheduler.call(
+                        integration.repo.get_issue, number
+                    )
+                    current = [label.name for label in issue.labels]
+                    integration.scheduler.call(
+                        issue.edit, write=True, labels=_relabel(current, labels)
+                    )
+                    synced.add(number)
+                except GithubException as e:
+                    print(f"❌ Failed to update labels of GitHub issue #{number}: {e}")
+            return synced
+
+        issues = graphql.issues(updates)
+        operations, owners = [], []
+        for number, labels in updates.items():
+            issue = issues.get(number)
+            if issue is None:
+                continue
+            target = _relabel(issue["labels"], labels)
+            remove = [name for name in issue["labels"] if name not in target]
+            add = [name for name in target if name not in issue["labels"]]
+            if remove:
+                operations.append(graphql.remove_labels(issue["id"], remove))
+                owners.append(number)
+            if add:
+                operations.append(graphql.add_labels(issue["id"], add))
+                owners.append(number)
+
+        failed = set()
+        for number, (_, error) in zip(owners, graphql.execute(operations)):
+            if error:
+                print(f"❌ Failed to update labels of GitHub issue #{number}: {error}")
+                failed.add(number)
+        return set(issues) - failed
+
+
+def _relabel(current: List[str], changes: Dict[str, str]) -> List[str]:
+    """``current`` labels with each ``key:*`` label replaced by ``key:value``"""
+    labels = [
+        name
+        for name in current
+        if not any(name.startswith(f"{key}:") for key in changes)
+    ]
+    return labels + [f"{key}:{value}" for key, value in changes.items()]
 
 
 # Global auto-sync instance
 auto_sync = AutoGitHubSync()
 
+_PENDING_KEY = "auto_sync_pending"
 
-def setup_auto_sync():
+
+def setup_auto_sync(session_factory: sessionmaker = SessionLocal):
     """Setup SQLAlchemy event listeners for automatic sync"""
 
-    @event.listens_for(SessionLocal, "after_commit")
+    @event.listens_for(session_factory, "after_flush")
+    def after_flush(session, flush_context):
+        """Record status/priority changes while attribute history still exists"""
+        if session.info.get(FROM_GITHUB):
+            return  # Applied from GitHub; sending them back would be an echo
+        pending = session.info.setdefault(_PENDING_KEY, [])
+        for instance in session.dirty:
+            if not isinstance(instance, (WorkItem, Idea)):
+                continue
+            if not instance.github_issue_id:
+                continue
+            state = inspect(instance)
+            for key in ("status", "priority"):
+                history = state.attrs[key].history
+                if not history.added:
+                    continue
+                old_value = history.deleted[0] if history.deleted else None
+                new_value = history.added[0]
+                if old_value != new_value:
+                    item_type = (
+                        "work_item" if isinstance(instance, WorkItem) else "idea"
+                    )
+                    pending.append((item_type, instance.id, key, new_value))
+
+    @event.listens_for(session_factory, "after_commit")
     def after_commit(session):
         """Handle sync after successful commit"""
-        # Get all dirty instances from the just-completed session
-        for instance in session.dirty:
-            if hasattr(instance, "_sa_instance_state"):
-                state = instance._sa_instance_state
-                for attr in state.attrs:
-                    if attr.history.has_changes():
-                        old_value = (
-                            attr.history.deleted[0] if attr.history.deleted else None
-                        )
-                        new_value = (
-                            attr.history.added[0] if attr.history.added else None
-                        )
-
-                        if old_value != new_value:
-                            # Handle WorkItem changes
-                            if isinstance(instance, WorkItem):
-                                if attr.key == "status" and instance.github_issue_id:
-                                    auto_sync.sync_work_item_status(
-                                        instance.id, new_value
-                                    )
-                                elif (
-                                    attr.key == "priority" and instance.github_issue_id
-                                ):
-                                    auto_sync.sync_priority_change(
-                                        "work_item", instance.id, new_value
-                                    )
-
-                            # Handle Idea changes
-                            elif isinstance(instance, Idea):
-                                if attr.key == "status" and instance.github_issue_id:
-                                    auto_sync.sync_idea_status(instance.id, new_value)
-                                elif (
-                                    attr.key == "priority" and instance.github_issue_id
-                                ):
-                                    auto_sync.sync_priority_change(
-                                        "idea", instance.id, new_value
-                                    )
+        # History is reset by now; use the changes recorded on flush. They
+        # go to GitHub as one batch
+        changes = session.info.pop(_PENDING_KEY, [])
+        if changes:
+            auto_sync.sync_label_changes(changes)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def after_rollback(session):
+        """Drop changes that never committed"""
+        session.info.pop(_PENDING_KEY, None)
 
     print("✅ Auto-sync event listeners registered")
 
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Automation Rules
+Evaluates enabled AutomationRule rows against work item changes on flush and
+applies their actions in batches after commit
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from .aggregates import _force_active_history, _previous_value
+from .database import SessionLocal
+from .models.models import AutomationRule, WorkItem
+
+TRIGGER_TYPES = ("item_added", "item_changed", "status_changed")
+ANY_FIELD = "*"
+
+# Fields an action may set; labels have their own actions
+SETTABLE_FIELDS = {"status", "priority", "type", "assignee", "milestone_id", "archived"}
+
+ACTION_BATCH_SIZE = 500
+
+_PENDING_KEY = "automation_pending"
+_RULES_CHANGED_KEY = "automation_rules_changed"
+_ACTIONS_KEY = "automation_actions"  # Set on sessions that apply actions
+
+
+class Rule(NamedTuple):
+    id: str
+    trigger_type: str
+    fields: Tuple[str, ...]  # Watched fields (ANY_FIELD for all)
+    when_from: Optional[list]  # Old value of the watched field must be one of
+    when_to: Optional[list]  # New value of the watched field must be one of
+    where: Dict[str, list]  # Current item values that must match
+    actions: List[Dict[str, Any]]
+
+
+def _as_list(value) -> Optional[list]:
+    if value is None:
+        return None
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _check_action(action: Dict[str, Any]):
+    kind = action.get("type")
+    if kind == "set_field":
+        if action.get("field") not in SETTABLE_FIELDS:
+            raise ValueError(f"cannot set field {action.get('field')!r}")
+    elif kind in ("add_label", "remove_label"):
+        if not isinstance(action.get("label"), str):
+            raise ValueError(f"{kind} needs a label")
+    else:
+        raise ValueError(f"unknown action {kind!r}")
+
+
+def compile_rule(row) -> Rule:
+    """Validate an AutomationRule row; raises ValueError for unusable rules.
+
+    ``trigger_conditions`` may hold ``field``/``fields`` (item_changed only),
+    ``from``/``to`` values for the watched field and a ``where`` dict of
+    values the item must currently have, e.g.
+    ``{"to": "done", "where": {"priority": ["high", "critical"]}}``.
+    ``actions`` is a list of ``{"type": "set_field", "field", "value"}``,
+    ``{"type": "add_label", "label"}`` or ``{"type": "remove_label", "label"}``.
+    """
+    if row.trigger_type not in TRIGGER_TYPES:
+        raise ValueError(f"unknown trigger_type {row.trigger_type!r}")
+    conditions = row.trigger_conditions or {}
+    if row.trigger_type == "status_changed":
+        fields = ("status",)
+    elif row.trigger_type == "item_changed":
+        fields = tuple(
+            _as_list(conditions.get("fields") or conditions.get("field"))
+            or (ANY_FIELD,)
+        )
+    else:
+        fields = (ANY_FIELD,)
+    for field in fields:
+        if field != ANY_FIELD and field not in WorkItem.__table__.c:
+            raise ValueError(f"unknown field {field!r}")
+
+    actions = list(row.actions or [])
+    for action in actions:
+        _check_action(action)
+    where = {
+        field: _as_list(value) for field, value in conditions.get("where", {}).items()
+    }
+    return Rule(
+        row.id,
+        row.trigger_type,
+        fields,
+        _as_list(conditions.get("from")),
+        _as_list(conditions.get("to")),
+        where,
+        actions,
+    )
+
+
+class RuleIndex:
+    """Enabled rules keyed by (project_id, trigger_type, watched field).
+
+    Rules without a project_id apply to every project and are stored under
+    project None; a change only looks at its own buckets, so the cost of a
+    write does not grow with the total number of rules.
+    """
+
+    def __init__(self, rules: List[Tuple[Optional[str], Rule]] = ()):
+        self.buckets: Dict[Tuple, List[Rule]] = defaultdict(list)
+        self.watched: Set[str] = set()  # Fields some item_changed rule watches
+        self.watch_all = False
+        self.size = 0
+        for project_id, rule in rules:
+            self.add(project_id, rule)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, project_id: Optional[str], rule: Rule):
+        for field in rule.fields:
+            self.buckets[(project_id, rule.trigger_type, field)].append(rule)
+            if field == ANY_FIELD:
+                self.watch_all = self.watch_all or rule.trigger_type == "item_changed"
+            else:
+                self.watched.add(field)
+        self.size += 1
+
+    def candidates(
+        self, project_id: Optional[str], trigger_type: str, field: str = ANY_FIELD
+    ) -> List[Rule]:
+        rules = list(self.buckets.get((project_id, trigger_type, field), ()))
+        if project_id is not None:
+            rules += self.buckets.get((None, trigger_type, field), ())
+        return rules
+
+    @classmethod
+    def from_session(cls, session: Session) -> "RuleIndex":
+        rules = []
+        # Plain rows: nothing is added to the caller's identity map
+        for row in session.execute(
+            select(
+                AutomationRule.id,
+                AutomationRule.project_id,
+                AutomationRule.trigger_type,
+                AutomationRule.trigger_conditions,
+                AutomationRule.actions,
+            ).where(AutomationRule.enabled.is_(True))
+        ):
+            try:
+                rules.append((row.project_id, compile_rule(row)))
+            except ValueError as e:
+                print(f"⚠️  Skipping automation rule {row.id}: {e}")
+        index = cls(rules)
+
+        # Old values of watched fields must be known even on expired objects
+        for field in index.watched:
+            attribute = getattr(WorkItem, field)
+            if not event.contains(attribute, "set", _force_active_history):
+                event.listen(
+                    attribute, "set", _force_active_history, active_history=True
+                )
+        return index
+
+
+# Process-wide index, built on first use and rebuilt after rules change
+_index: Optional[RuleIndex] = None
+_index_lock = threading.Lock()
+_action_session_factory: sessionmaker = SessionLocal
+
+
+def get_rule_index(session: Optional[Session] = None) -> RuleIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            if session is not None:
+                _index = RuleIndex.from_session(session)
+            else:
+                with _action_session_factory() as own_session:
+                    _index = RuleIndex.from_session(own_session)
+        return _index
+
+
+def reset_rule_index():
+    """Forget the rule index (rebuilt on the next change)."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def _matches(rule: Rule, obj: WorkItem, old: Any, new: Any) -> bool:
+    if rule.when_from is not None and old not in rule.when_from:
+        return False
+    if rule.when_to is not None and new not in rule.when_to:
+        return False
+    return all(
+        getattr(obj, field, None) in values for field, values in rule.where.items()
+    )
+
+
+def _changed_fields(obj: WorkItem, index: RuleIndex) -> Dict[str, Tuple[Any, Any]]:
+    state = inspect(obj)
+    names = state.mapper.column_attrs.keys() if index.watch_all else index.watched
+    changes = {}
+    for name in names:
+        history = state.attrs[name].history
+        if history.added:
+            old = _previous_value(obj, name)
+            if old != history.added[0]:
+                changes[name] = (old, history.added[0])
+    return changes
+
+
+def _evaluate(session: Session, index: RuleIndex) -> List[Tuple[str, str, list]]:
+    """(rule id, item id, actions) for every rule the flushed changes fire."""
+    fired = []
+    for obj in session.new:
+        if isinstance(obj, WorkItem):
+            for rule in index.candidates(obj.project_id, "item_added"):
+                if _matches(rule, obj, None, None):
+                    fired.append((rule.id, obj.id, rule.actions))
+
+    for obj in session.dirty:
+        if not isinstance(obj, WorkItem):
+            continue
+        changes = _changed_fields(obj, index)
+        if not changes:
+            continue
+        seen = set()
+        candidates = [
+            (rule, changes[field])
+            for field in changes
+            for rule in index.candidates(obj.project_id, "item_changed", field)
+        ]
+        candidates += [
+            (rule, (None, None))
+            for rule in index.candidates(obj.project_id, "item_changed")
+        ]
+        if "status" in changes:
+            candidates += [
+                (rule, changes["status"])
+                for rule in index.candidates(obj.project_id, "status_changed", "status")
+            ]
+        for rule, (old, new) in candidates:
+            if rule.id not in seen and _matches(rule, obj, old, new):
+                seen.add(rule.id)
+                fired.append((rule.id, obj.id, rule.actions))
+    return fired
+
+
+def _after_flush(session: Session, flush_context):
+    if any(
+        isinstance(obj, AutomationRule)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_RULES_CHANGED_KEY] = True
+    if session.info.get(_ACTIONS_KEY):
+        return  # Actions never trigger further rules (no loops)
+
+    index = get_rule_index(session)
+    if not len(index):
+        return
+    fired = _evaluate(session, index)
+    if fired:
+        session.info.setdefault(_PENDING_KEY, []).extend(fired)
+
+
+def _apply(item: WorkItem, actions: List[Dict[str, Any]]):
+    for action in actions:
+        if action["type"] == "set_field":
+            setattr(item, action["field"], action.get("value"))
+        elif action["type"] == "add_label":
+            labels = list(item.labels or [])
+            if action["label"] not in labels:
+                item.labels = labels + [action["label"]]
+        elif action["type"] == "remove_label":
+            item.labels = [
+                label for label in item.labels or [] if label != action["label"]
+            ]
+
+
+def execute_actions(
+    fired: List[Tuple[str, str, list]],
+    session_factory: Optional[sessionmaker] = None,
+    batch_size: int = ACTION_BATCH_SIZE,
+) -> Dict[str, int]:
+    """Apply fired actions, loading and committing ``batch_size`` items at a
+    time; actions for one item run in the order their rules fired."""
+    by_item: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for _, item_id, actions in fired:
+        by_item[item_id].extend(actions)
+
+    stats = {"rules": len(fired), "items": 0, "errors": 0}
+    item_ids = list(by_item)
+    session = (session_factory or _action_session_factory)()
+    session.info[_ACTIONS_KEY] = True
+    try:
+        for start in range(0, len(item_ids), batch_size):
+            chunk = item_ids[start : start + batch_size]
+            try:
+                for item in session.scalars(
+                    select(WorkItem).where(WorkItem.id.in_(chunk))
+                ):
+                    _apply(item, by_item[item.id])
+                    stats["items"] += 1
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                stats["errors"] += len(chunk)
+                print(f"❌ Automation actions failed for {len(chunk)} items: {e}")
+    finally:
+        session.close()
+    return stats
+
+
+def _after_commit(session: Session):
+    if session.info.pop(_RULES_CHANGED_KEY, False):
+        reset_rule_index()
+    fired = session.info.pop(_PENDING_KEY, None)
+    if fired:
+        execute_actions(fired)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_RULES_CHANGED_KEY, False):
+        reset_rule_index()  # It may have been built from rolled back rules
+
+
+def setup_automation(session_factory: sessionmaker = SessionLocal):
+    """Register the rule engine on a session factory.
+
+    Actions run after commit in a separate session from the same factory, so
+    the other flush listeners (counters, progress) see their writes too.
+    Rules edited with raw SQL need ``reset_rule_index``.
+    """
+    global _action_session_factory
+    _action_session_factory = session_factory
+    for name, listener in (
+        ("after_flush", _after_flush),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Database Backups
+Online snapshots of ai_lab.db via the SQLite backup API, stored in a
+content-addressed chunk store that deduplicates unchanged pages
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import make_url
+
+from .database import SQLALCHEMY_DATABASE_URL
+
+BACKUP_DIR = Path("data/backups")
+
+# Pages copied per backup step; the source is only read-locked during a step
+PAGES_PER_STEP = 1024
+STEP_SLEEP = 0.005  # Seconds between steps, lets writers in
+
+# A write to the source restarts a stepped copy from the first page; after
+# this many restarts the copy is redone in one step under a single read lock
+MAX_RESTARTS = 5
+
+# Chunks are groups of whole pages, so a page that did not change between
+# snapshots lands in a chunk with the same hash
+CHUNK_PAGES = 16
+
+MANIFEST_VERSION = 1
+
+
+def default_database_path() -> Path:
+    return Path(make_url(SQLALCHEMY_DATABASE_URL).database)
+
+
+class ChunkStore:
+    """zlib-compressed blobs addressed by the sha256 of their content."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root) / "chunks"
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def put(self, data: bytes) -> Tuple[str, bool]:
+        """Store ``data``; returns (digest, True if it was new)."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest)
+        if path.exists():
+            return digest, False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(zlib.compress(data, 1))
+        os.replace(tmp, path)
+        return digest, True
+
+    def get(self, digest: str) -> bytes:
+        data = zlib.decompress(self.path(digest).read_bytes())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupt backup chunk {digest}")
+        return data
+
+    def digests(self) -> Set[str]:
+        if not self.root.exists():
+            return set()
+        return {path.name for path in self.root.glob("*/*") if path.suffix != ".tmp"}
+
+
+def _manifest_dir(store_dir: Path) -> Path:
+    return Path(store_dir) / "snapshots"
+
+
+def _write_json(path: Path, data: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _store_lock(store_dir: Path):
+    """Hold the store's lock file so backups and pruning never interleave.
+
+    A backup writes its chunks before its manifest, and reused chunks are
+    not rewritten, so a prune in between would see them as unreferenced.
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    with open(store_dir / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def _online_copy(
+    source: Path,
+    target: Path,
+    pages: int,
+    sleep: float,
+    max_restarts: int = MAX_RESTARTS,
+) -> Tuple[int, int]:
+    """Copy a live database with sqlite3's backup API.
+
+    Returns (page size, restarts). Once ``max_restarts`` writes have sent
+    the stepped copy back to the first page it is redone with ``pages=-1``.
+    """
+    if not Path(source).exists():
+        raise FileNotFoundError(f"Database not found: {source}")
+    restarts = 0
+    remaining_before = None
+
+    def progress(status, remaining, total):
+        nonlocal restarts, remaining_before
+        if remaining_before is not None and remaining > remaining_before:
+            restarts += 1
+            if restarts > max_restarts:
+                raise _TooManyRestarts
+        remaining_before = remaining
+
+    # A plain connection (not mode=ro) can open WAL databases whose -shm file
+    # does not exist yet; the backup API only reads from it
+    source_connection = sqlite3.connect(source)
+    target_connection = sqlite3.connect(target)
+    try:
+        try:
+            source_connection.backup(
+                target_connection, pages=pages, progress=progress, sleep=sleep
+            )
+        except _TooManyRestarts:
+            source_connection.backup(target_connection, pages=-1)
+        page_size = target_connection.execute("PRAGMA page_size").fetchone()[0]
+        return page_size, restarts
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def create_backup(
+    db_path: Optional[Path] = None,
+    store_dir: Path = BACKUP_DIR,
+    pages_per_step: int = PAGES_PER_STEP,
+    step_sleep: float = STEP_SLEEP,
+    label: Optional[str] = None,
+    max_restarts: int = MAX_RESTARTS,
+) -> Dict[str, Any]:
+    """Snapshot ``db_path`` into the chunk store and return its manifest.
+
+    Writers keep working while the copy runs: each backup step holds the
+    read lock for ``pages_per_step`` pages only (and in WAL mode readers
+    never block writers). A write landing mid-copy makes SQLite restart the
+    copy from the first page, so under continuous writes a stepped copy
+    could restart indefinitely; after ``max_restarts`` restarts the copy is
+    done in a single step instead, which always yields a consistent snapshot.
+    """
+    db_path = Path(db_path or default_database_path())
+    store_dir = Path(store_dir)
+    store = ChunkStore(store_dir)
+    start = time.perf_counter()
+    created = datetime.utcnow()
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    handle, tmp_name = tempfile.mkstemp(suffix=".db", dir=store_dir)
+    os.close(handle)
+    tmp_path = Path(tmp_name)
+    try:
+        page_size, restarts = _online_copy(
+            db_path, tmp_path, pages_per_step, step_sleep, max_restarts
+        )
+        chunk_size = page_size * CHUNK_PAGES
+        file_hash = hashlib.sha256()
+        chunks: List[str] = []
+        new_chunks = new_bytes = size = 0
+        # Chunks are only referenced once the manifest exists: keep prune out
+        # until then
+        with _store_lock(store_dir), open(tmp_path, "rb") as snapshot:
+            while True:
+                data = snapshot.read(chunk_size)
+                if not data:
+                    break
+                file_hash.update(data)
+                digest, is_new = store.put(data)
+                chunks.append(digest)
+                size += len(data)
+                if is_new:
+                    new_chunks += 1
+                    new_bytes += len(data)
+
+            snapshot_id = created.strftime("%Y%m%d-%H%M%S-%f")
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "id": snapshot_id,
+                "label": label,
+                "created": created.isoformat(),
+                "source": str(db_path),
+                "page_size": page_size,
+                "chunk_size": chunk_size,
+                "size": size,
+                "sha256": file_hash.hexdigest(),
+                "chunks": chunks,
+                "stats": {
+                    "chunks": len(chunks),
+                    "new_chunks": new_chunks,
+                    "new_bytes": new_bytes,
+                    "restarts": restarts,
+                    "seconds": round(time.perf_counter() - start, 3),
+                },
+            }
+            _write_json(_manifest_dir(store_dir) / f"{snapshot_id}.json", manifest)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return manifest
+
+
+def list_backups(store_dir: Path = BACKUP_DIR) -> List[Dict[str, Any]]:
+    """Snapshot manifests, oldest first."""
+    directory = _manifest_dir(store_dir)
+    if not directory.exists():
+        return []
+    manifests = [json.loads(path.read_text()) for path in directory.glob("*.json")]
+    return sorted(manifests, key=lambda manifest: manifest["id"])
+
+
+def load_manifest(snapshot_id: str, store_dir: Path = BACKUP_DIR) -> Dict[str, Any]:
+    path = _manifest_dir(store_dir) / f"{snapshot_id}.json"
+    if not path.exists():
+        raise ValueError(f"Unknown backup snapshot: {snapshot_id}")
+    return json.loads(path.read_text())
+
+
+def verify_backup(snapshot_id: str, store_dir: Path = BACKUP_DIR) -> bool:
+    """Check that every chunk exists and the snapshot hash matches."""
+    manifest = load_manifest(snapshot_id, store_dir)
+    store = ChunkStore(store_dir)
+    file_hash = hashlib.sha256()
+    try:
+        for digest in manifest["chunks"]:
+            file_hash.update(store.get(digest))
+    except (OSError, ValueError, zlib.error):
+        return False
+    return file_hash.hexdigest() == manifest["sha256"]
+
+
+def restore_backup(
+    snapshot_id: str,
+    target: Path,
+    store_dir: Path = BACKUP_DIR,
+    overwrite: bool = False,
+) -> Path:
+    """Rebuild a snapshot at ``target`` (verified before it replaces anything).
+
+    Stop the application first when restoring over the live database; stale
+    -wal/-shm files next to ``target`` are removed so SQLite cannot replay
+    them onto the restored file.
+    """
+    manifest = load_manifest(snapshot_id, store_dir)
+    target = Path(target)
+    if target.exists() and not overwrite:
+        raise FileExistsError(f"{target} exists (pass overwrite=True)")
+
+    store = ChunkStore(store_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.restore")
+    file_hash = hashlib.sha256()
+    try:
+        with open(tmp, "wb") as output:
+            for digest in manifest["chunks"]:
+                data = store.get(digest)
+                file_hash.update(data)
+                output.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+        if file_hash.hexdigest() != manifest["sha256"]:
+            raise ValueError(f"Backup {snapshot_id} failed verification")
+        for suffix in ("-wal", "-shm"):
+            Path(f"{target}{suffix}").unlink(missing_ok=True)
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return target
+
+
+def _retained_ids(
+    manifests: List[Dict[str, Any]], keep_last: int, keep_daily: int, keep_weekly: int
+) -> Set[str]:
+    # Newest first: the last N, then the newest snapshot of each of the last
+    # ``keep_daily`` days and ``keep_weekly`` ISO weeks
+    newest_first = manifests[::-1]
+    keep = {manifest["id"] for manifest in newest_first[:keep_last]}
+    if not newest_first:
+        return keep
+    now = datetime.fromisoformat(newest_first[0]["created"])
+    days, weeks = set(), set()
+    for manifest in newest_first:
+        created = datetime.fromisoformat(manifest["created"])
+        day = created.date()
+        week = created.isocalendar()[:2]
+        if day not in days and created > now - timedelta(days=keep_daily):
+            days.add(day)
+            keep.add(manifest["id"])
+        if week not in weeks and created > now - timedelta(weeks=keep_weekly):
+            weeks.add(week)
+            keep.add(manifest["id"])
+    return keep
+
+
+def prune_backups(
+    store_dir: Path = BACKUP_DIR,
+    keep_last: int = 10,
+    keep_daily: int = 7,
+    keep_weekly: int = 4,
+) -> Dict[str, int]:
+    """Apply the retention policy, then delete chunks no snapshot uses.
+
+    Waits for a running ``create_backup`` to write its manifest first.
+    """
+    store_dir = Path(store_dir)
+    with _store_lock(store_dir):
+        return _prune_locked(store_dir, keep_last, keep_daily, keep_weekly)
+
+
+def _prune_locked(
+    store_dir: Path, keep_last: int, keep_daily: int, keep_weekly: int
+) -> Dict[str, int]:
+    manifests = list_backups(store_dir)
+    keep = _retained_ids(manifests, keep_last, keep_daily, keep_weekly)
+
+    removed = 0
+    for manifest in manifests:
+        if manifest["id"] not in keep:
+            (_manifest_dir(store_dir) / f"{manifest['id']}.json").unlink()
+            removed += 1
+
+    referenced = {
+        digest for manifest in list_backups(store_dir) for digest in manifest["chunks"]
+    }
+    store = ChunkStore(store_dir)
+    unreferenced = store.digests() - referenced
+    freed = 0
+    for digest in unreferenced:
+        path = store.path(digest)
+        freed += path.stat().st_size
+        path.unlink()
+    return {
+        "snapshots_removed": removed,
+        "snapshots_kept": len(keep),
+        "chunks_removed": len(unreferenced),
+        "bytes_freed": freed,
+    }
+
+
+def main():
+    """Create, list, verify, restore or prune database backups"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Database backups")
+    parser.add_argument("--db", type=Path, default=None, help="Database file")
+    parser.add_argument("--store", type=Path, default=BACKUP_DIR, help="Backup store")
+    parser.add_argument("--label", help="Label for a new snapshot")
+    parser.add_argument("--list", action="store_true", help="List snapshots")
+    parser.add_argument("--verify", metavar="ID", help="Verify a snapshot")
+    parser.add_argument("--restore", metavar="ID", help="Restore a snapshot")
+    parser.add_argument("--target", type=Path, help="Restore target file")
+    parser.add_argument(
+        "--overwrite", action="store_true", help="Allow replacing the target"
+    )
+    parser.add_argument("--prune", action="store_true", help="Apply retention")
+    parser.add_argument("--keep-last", type=int, default=10)
+    parser.add_argument("--keep-daily", type=int, default=7)
+    parser.add_argument("--keep-weekly", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.list:
+        for manifest in list_backups(args.store):
+            print(
+                f"{manifest['id']}  {manifest['size'] / 1024:>10.1f} KiB  "
+                f"{manifest['stats']['new_chunks']:>5} new chunks  "
+                f"{manifest.get('label') or ''}"
+            )
+    elif args.verify:
+        ok = verify_backup(args.verify, args.store)
+        print(f"{'✅' if ok else '❌'} Snapshot {args.verify}")
+    elif args.restore:
+        target = args.target or args.db or default_database_path()
+        restore_backup(args.restore, target, args.store, args.overwrite)
+        print(f"✅ Restored {args.restore} to {target}")
+    elif args.prune:
+        stats = prune_backups(
+            args.store, args.keep_last, args.keep_daily, args.keep_weekly
+        )
+        print(
+            f"🗑️  Removed {stats['snapshots_removed']} snapshots and "
+            f"{stats['chunks_removed']} chunks ({stats['bytes_freed']} bytes)"
+        )
+    else:
+        manifest = create_backup(args.db, args.store, label=args.label)
+        stats = manifest["stats"]
+        print(
+            f"✅ Snapshot {manifest['id']}: {stats['chunks']} chunks, "
+            f"{stats['new_chunks']} new ({stats['new_bytes']} bytes) "
+            f"in {stats['seconds']}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Change Log
+Append-only change-data-capture table written on flush, with cursor-based
+readers for sync workers, dashboards and caches
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from .aggregates import _force_active_history, _previous_value
+from .database import SessionLocal
+from .models.models import (
+    ChangeLogCursor,
+    ChangeLogEntry,
+    Idea,
+    Milestone,
+    Project,
+    WorkItem,
+)
+
+TRACKED_MODELS = (WorkItem, Idea, Project, Milestone)
+
+CHANGE_BATCH = 500
+
+
+class ChangeRecord(NamedTuple):
+    seq: int
+    entity: str  # Table name
+    entity_id: str
+    operation: str  # insert, update or delete
+    changes: Dict[str, List[Any]]  # {field: [old, new]}
+    changed_at: datetime
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _column_names(obj) -> List[str]:
+    return [attribute.key for attribute in inspect(obj).mapper.column_attrs]
+
+
+def _insert_changes(obj) -> Dict[str, List[Any]]:
+    changes = {}
+    for name in _column_names(obj):
+        value = getattr(obj, name)
+        if value is not None:
+            changes[name] = [None, _json_value(value)]
+    return changes
+
+
+def _delete_changes(obj) -> Dict[str, List[Any]]:
+    changes = {}
+    for name in _column_names(obj):
+        value = _previous_value(obj, name)
+        if value is not None:
+            changes[name] = [_json_value(value), None]
+    return changes
+
+
+def _update_changes(obj) -> Dict[str, List[Any]]:
+    state = inspect(obj)
+    changes = {}
+    for name in _column_names(obj):
+        history = state.attrs[name].history
+        if not history.added:
+            continue
+        old, new = _previous_value(obj, name), history.added[0]
+        if old != new:
+            changes[name] = [_json_value(old), _json_value(new)]
+    return changes
+
+
+def _collect_entries(session: Session) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    entries = []
+    for operation, objects, describe in (
+        ("insert", session.new, _insert_changes),
+        ("update", session.dirty, _update_changes),
+        ("delete", session.deleted, _delete_changes),
+    ):
+        for obj in objects:
+            if not isinstance(obj, TRACKED_MODELS):
+                continue
+            changes = describe(obj)
+            if not changes:
+                continue  # Touched but unchanged (e.g. same value assigned)
+            entries.append(
+                {
+                    "entity": obj.__tablename__,
+                    "entity_id": obj.id,
+                    "operation": operation,
+                    "changes": changes,
+                    "changed_at": now,
+                }
+            )
+    return entries
+
+
+def _after_flush(session: Session, flush_context):
+    # Same transaction as the data: a change is visible iff it committed
+    append_entries(session.connection(), _collect_entries(session))
+
+
+def _stored_value(value):
+    """``value`` as read back: SQLite DateTime drops the timezone"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return _json_value(value)
+
+
+def upsert_entries(
+    connection,
+    model,
+    rows: List[Dict[str, Any]],
+    preserved: Iterable[str] = (),
+    batch_size: int = CHANGE_BATCH,
+) -> List[Dict[str, Any]]:
+    """change_log entries for upserting ``rows`` (dicts with an ``id``).
+
+    For Core writers that bypass the flush listener (bulk_import). Call
+    before the write, in its transaction, so old values are still there;
+    ``preserved`` columns are never overwritten on conflict. Unchanged rows
+    get no entry. Write the result with ``append_entries``.
+    """
+    table = model.__table__
+    columns = sorted({column for row in rows for column in row} - {"id"})
+    existing: Dict[str, Dict[str, Any]] = {}
+    ids = [row["id"] for row in rows]
+    for start in range(0, len(ids), batch_size):
+        query = select(table.c.id, *(table.c[column] for column in columns)).where(
+            table.c.id.in_(ids[start : start + batch_size])
+        )
+        for row in connection.execute(query):
+            existing[row.id] = dict(row._mapping)
+
+    now = datetime.utcnow()
+    entries = []
+    for row in rows:
+        old = existing.get(row["id"])
+        changes = {}
+        for column in columns:
+            new = _stored_value(row.get(column))
+            if old is None:
+                if new is not None:
+                    changes[column] = [None, new]
+            elif column not in preserved:
+                previous = _json_value(old[column])
+                if previous != new:
+                    changes[column] = [previous, new]
+        if changes:
+            entries.append(
+                {
+                    "entity": table.name,
+                    "entity_id": row["id"],
+                    "operation": "insert" if old is None else "update",
+                    "changes": changes,
+                    "changed_at": now,
+                }
+            )
+    return entries
+
+
+def append_entries(connection, entries: List[Dict[str, Any]]):
+    if entries:
+        connection.execute(ChangeLogEntry.__table__.insert(), entries)
+
+
+def setup_change_log(session_factory: sessionmaker = SessionLocal):
+    """Register the flush listener that appends to change_log.
+
+    Bulk ``Query.update()``/``delete()`` and raw SQL bypass flush events and
+    are not captured; BulkImporter logs its upserts with ``upsert_entries``.
+    """
+    for model in TRACKED_MODELS:
+        for attribute in inspect(model).column_attrs:
+            instrumented = getattr(model, attribute.key)
+            if not event.contains(instrumented, "set", _force_active_history):
+                event.listen(
+                    instrumented, "set", _force_active_history, active_history=True
+                )
+
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+
+
+def read_changes(
+    since_seq: int = 0,
+    limit: int = CHANGE_BATCH,
+    entities: Optional[Iterable[str]] = None,
+    session: Optional[Session] = None,
+) -> List[ChangeRecord]:
+    """Changes with seq > ``since_seq`` in commit order.
+
+    SQLite serializes writers, so sequence numbers become visible in order:
+    a consumer that remembers the last seq it processed never skips one.
+    """
+    query = (
+        select(
+            ChangeLogEntry.seq,
+            ChangeLogEntry.entity,
+            ChangeLogEntry.entity_id,
+            ChangeLogEntry.operation,
+            ChangeLogEntry.changes,
+            ChangeLogEntry.changed_at,
+        )
+        .where(ChangeLogEntry.seq > since_seq)
+        .order_by(ChangeLogEntry.seq)
+        .limit(limit)
+    )
+    if entities is not None:
+        query = query.where(ChangeLogEntry.entity.in_(list(entities)))
+
+    own_session = session is None
+    session = session or SessionLocal()
+    try:
+        return [ChangeRecord(*row) for row in session.execute(query)]
+    finally:
+        if own_session:
+            session.close()
+
+
+def latest_seq(session: Session) -> int:
+    """Highest committed sequence number (0 for an empty log)."""
+    return session.scalar(select(func.max(ChangeLogEntry.seq))) or 0
+
+
+class ChangeConsumer:
+    """A named reader whose position is stored in change_log_cursors.
+
+    ``poll`` returns the next batch; ``ack`` stores the last processed seq
+    so a restarted worker resumes where it stopped (at-least-once delivery).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        entities: Optional[Iterable[str]] = None,
+        session_factory: sessionmaker = SessionLocal,
+    ):
+        self.name = name
+        self.entities = list(entities) if entities is not None else None
+        self.session_factory = session_factory
+
+    @property
+    def position(self) -> int:
+        with self.session_factory() as session:
+            cursor = session.get(ChangeLogCursor, self.name)
+            return cursor.seq if cursor else 0
+
+    def poll(self, limit: int = CHANGE_BATCH) -> List[ChangeRecord]:
+        with self.session_factory() as session:
+            cursor = session.get(ChangeLogCursor, self.name)
+            return read_changes(
+                cursor.seq if cursor else 0, limit, self.entities, session
+            )
+
+    def ack(self, seq: int):
+        table = ChangeLogCursor.__table__
+        statement = sqlite_insert(table).values(
+            consumer=self.name, seq=seq, updated_at=datetime.utcnow()
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.consumer],
+            set_={
+                # Never move a cursor backwards
+                "seq": func.max(table.c.seq, statement.excluded.seq),
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        with self.session_factory() as session:
+            session.execute(statement)
+            session.commit()
+
+
+def prune_changes(session: Session, before_seq: Optional[int] = None) -> int:
+    """Delete entries every consumer has processed (or below ``before_seq``).
+
+    Returns the number of deleted rows.
+    """
+    if before_seq is None:
+        before_seq = session.scalar(select(func.min(ChangeLogCursor.seq)))
+        if before_seq is None:
+            return 0  # No consumers yet; keep everything
+        before_seq += 1
+    result = session.execute(
+        ChangeLogEntry.__table__.delete().where(ChangeLogEntry.seq < before_seq)
+    )
+    return result.rowcount
+
+
+def main():
+    """Print recent changes or prune consumed ones"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Change log maintenance")
+    parser.add_argument("--since", type=int, default=None, help="Print after seq")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum changes")
+    parser.add_argument(
+        "--prune", action="store_true", help="Delete changes all consumers acked"
+    )
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.prune:
+            deleted = prune_changes(session)
+            session.commit()
+            print(f"🗑️  Pruned {deleted} change log entries")
+        since = args.since
+        if since is None:
+            since = max(latest_seq(session) - args.limit, 0)
+        for change in read_changes(since, args.limit, session=session):
+            fields = ", ".join(sorted(change.changes))
+            print(
+                f"{change.seq:>8}  {change.operation:<6} {change.entity}/"
+                f"{change.entity_id}: {fields}"
+            )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Custom Field Values
+Typed, indexed copies of CustomFieldValue.value and a pivot query that
+returns work items with custom fields as columns
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, aliased
+
+from .database import SessionLocal
+from .models.models import CustomField, CustomFieldValue, WorkItem
+from .views import column_conditions
+
+# field_type -> typed column holding its value
+TYPED_COLUMNS = {
+    "number": "value_number",
+    "date": "value_date",
+    "text": "value_text",
+    "single_select": "value_option",
+    "iteration": "value_option",
+}
+
+PIVOT_COLUMNS = ("id", "title", "status", "priority", "assignee", "project_id")
+
+_FIELD_TYPE = (
+    "(SELECT field_type FROM custom_fields "
+    "WHERE custom_fields.id = custom_field_values.field_id)"
+)
+_SCALAR = "json_extract(value, '$')"
+_START_DATE = "json_extract(value, '$.start_date')"
+
+
+def _datetime(expression: str) -> str:
+    """SQL storing ``expression`` the way DateTime binds parameters
+    ('YYYY-MM-DD HH:MM:SS.ffffff'), so typed dates compare equal to them.
+    strftime's %f has milliseconds; the microseconds are padded."""
+    return f"strftime('%Y-%m-%d %H:%M:%f', {expression}) || '000'"
+
+
+# Every expression starts with json_valid so malformed values become NULLs
+# instead of failing the write. Numbers may be JSON numbers or numeric
+# strings; options and iterations are stored as an id or an {"id": ...}
+# object; an iteration's date is its start_date.
+TYPED_EXPRESSIONS = {
+    "value_number": (
+        f"CASE WHEN NOT json_valid(value) OR {_FIELD_TYPE} != 'number' THEN NULL "
+        f"WHEN json_type(value) IN ('integer', 'real') THEN {_SCALAR} "
+        f"WHEN json_type(value) = 'text' AND trim({_SCALAR}) != '' "
+        f"AND trim({_SCALAR}) NOT GLOB '*[^0-9.eE+-]*' "
+        f"THEN CAST(trim({_SCALAR}) AS REAL) END"
+    ),
+    "value_date": (
+        f"CASE WHEN NOT json_valid(value) THEN NULL "
+        f"WHEN {_FIELD_TYPE} = 'date' AND json_type(value) = 'text' "
+        f"THEN {_datetime(_SCALAR)} "
+        f"WHEN {_FIELD_TYPE} = 'iteration' AND json_type(value) = 'object' "
+        f"THEN {_datetime(_START_DATE)} END"
+    ),
+    "value_text": (
+        f"CASE WHEN NOT json_valid(value) OR {_FIELD_TYPE} != 'text' THEN NULL "
+        f"WHEN json_type(value) IN ('text', 'integer', 'real') "
+        f"THEN CAST({_SCALAR} AS TEXT) END"
+    ),
+    "value_option": (
+        f"CASE WHEN NOT json_valid(value) "
+        f"OR {_FIELD_TYPE} NOT IN ('single_select', 'iteration') THEN NULL "
+        f"WHEN json_type(value) = 'object' "
+        f"THEN CAST(json_extract(value, '$.id') AS TEXT) "
+        f"WHEN json_type(value) IN ('text', 'integer') "
+        f"THEN CAST({_SCALAR} AS TEXT) END"
+    ),
+}
+
+_ASSIGNMENTS = ", ".join(
+    f"{column} = {expression}" for column, expression in TYPED_EXPRESSIONS.items()
+)
+
+
+TRIGGERS = (
+    "custom_field_values_typed_ai",
+    "custom_field_values_typed_au",
+    "custom_fields_typed_au",
+)
+
+
+def schema_statements() -> List[str]:
+    """Triggers that fill the typed columns whenever a value is written.
+
+    Triggers (rather than ORM events) also cover raw SQL writers; the typed
+    columns are FetchedValue columns, so the ORM reloads them after a flush.
+    """
+    return [
+        "CREATE TRIGGER IF NOT EXISTS custom_field_values_typed_ai "
+        "AFTER INSERT ON custom_field_values "
+        f"BEGIN UPDATE custom_field_values SET {_ASSIGNMENTS} "
+        "WHERE rowid = new.rowid; END",
+        "CREATE TRIGGER IF NOT EXISTS custom_field_values_typed_au "
+        "AFTER UPDATE OF value, field_id ON custom_field_values "
+        f"BEGIN UPDATE custom_field_values SET {_ASSIGNMENTS} "
+        "WHERE rowid = new.rowid; END",
+        # Changing a field's type re-types all of its stored values
+        "CREATE TRIGGER IF NOT EXISTS custom_fields_typed_au "
+        "AFTER UPDATE OF field_type ON custom_fields "
+        f"BEGIN UPDATE custom_field_values SET {_ASSIGNMENTS} "
+        "WHERE field_id = new.id; END",
+    ]
+
+
+def drop_statements() -> List[str]:
+    """Drop the triggers, so changed expressions can be installed again."""
+    return [f"DROP TRIGGER IF EXISTS {trigger}" for trigger in TRIGGERS]
+
+
+def rebuild_statements() -> List[str]:
+    """Plain SQL that recomputes every typed column from the JSON values."""
+    return [f"UPDATE custom_field_values SET {_ASSIGNMENTS}"]
+
+
+def rebuild_typed_values(session: Session):
+    """Recompute the typed columns (backfills, reconciliation)."""
+    connection = session.connection()
+    for statement in rebuild_statements():
+        connection.exec_driver_sql(statement)
+
+
+def typed_column(field: CustomField):
+    """The CustomFieldValue column holding values of ``field``."""
+    try:
+        return getattr(CustomFieldValue, TYPED_COLUMNS[field.field_type])
+    except KeyError as e:
+        raise ValueError(f"Unsupported custom field type: {field.field_type!r}") from e
+
+
+def _load_fields(
+    session: Session, fields: Sequence[Union[CustomField, str]]
+) -> List[CustomField]:
+    ids = [field for field in fields if isinstance(field, str)]
+    loaded = {}
+    if ids:
+        loaded = {
+            field.id: field
+            for field in session.scalars(
+                select(CustomField).where(CustomField.id.in_(ids))
+            )
+        }
+        missing = set(ids) - set(loaded)
+        if missing:
+            raise ValueError(f"Unknown custom fields: {sorted(missing)}")
+    return [loaded[field] if isinstance(field, str) else field for field in fields]
+
+
+def pivot_select(
+    fields: Sequence[CustomField],
+    columns: Sequence[str] = PIVOT_COLUMNS,
+) -> Tuple[object, Dict[str, object]]:
+    """select() of work items with one column per custom field.
+
+    Each field is a LEFT JOIN on (field_id, work_item_id), so the statement
+    stays a single query however many fields are requested. Returns the
+    statement and {field name: typed column expression} for use in further
+    where()/order_by() clauses.
+    """
+    selected = [getattr(WorkItem, name) for name in columns]
+    field_columns: Dict[str, object] = {}
+    joins = []
+    for field in fields:
+        values = aliased(CustomFieldValue, name=f"cf_{len(joins)}")
+        expression = getattr(values, typed_column(field).key)
+        field_columns[field.name] = expression
+        selected.append(expression.label(field.name))
+        joins.append(
+            (
+                values,
+                and_(values.field_id == field.id, values.work_item_id == WorkItem.id),
+            )
+        )
+
+    query = select(*selected)
+    for values, condition in joins:
+        query = query.outerjoin(values, condition)
+    return query, field_columns
+
+
+def pivot(
+    session: Session,
+    fields: Sequence[Union[CustomField, str]],
+    project_id: Optional[str] = None,
+    where: Optional[Dict[str, Any]] = None,
+    order_by: Optional[str] = None,
+    descending: bool = False,
+    limit: Optional[int] = None,
+    columns: Sequence[str] = PIVOT_COLUMNS,
+) -> List[Dict[str, Any]]:
+    """Work items with the given custom fields (objects or ids) as columns.
+
+    ``where`` and ``order_by`` name custom fields or work item columns;
+    conditions use the ProjectView filter syntax, e.g.
+    ``{"Estimate": {"gte": 3}, "Sprint": ["iter-1", "iter-2"]}``.
+    """
+    loaded = _load_fields(session, fields)
+    query, field_columns = pivot_select(loaded, columns)
+
+    def column_for(name: str):
+        if name in field_columns:
+            return field_columns[name]
+        if name not in WorkItem.__table__.c:
+            raise ValueError(f"Unknown pivot column: {name!r}")
+        return getattr(WorkItem, name)
+
+    if project_id is not None:
+        query = query.where(WorkItem.project_id == project_id)
+    for name, spec in (where or {}).items():
+        query = query.where(*column_conditions(column_for(name), spec))
+    if order_by:
+        key = column_for(order_by)
+        # Items without a value sort last in both directions
+        query = query.order_by(
+            key.is_(None), key.desc() if descending else key, WorkItem.id
+        )
+    if limit is not None:
+        query = query.limit(limit)
+    return [dict(row._mapping) for row in session.execute(query)]
+
+
+def main():
+    """Rebuild the typed custom field columns"""
+    session = SessionLocal()
+    try:
+        rebuild_typed_values(session)
+        session.commit()
+        print("✅ Typed custom field values rebuilt")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
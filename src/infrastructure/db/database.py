@@ -1,21 +1,153 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from typing import AsyncIterator, Dict, Iterator, Optional, Union
 import os
+import threading
 from pathlib import Path
 
 # SQLite database URL
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/ai_lab.db")
 
-# Create SQLAlchemy engine
-# connect_args={"check_same_thread": False} is needed for SQLite
-# when using multiple threads, which is common in web applications.
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# Pragma profile applied to every SQLite connection.
+# WAL lets readers keep working while a writer commits; synchronous=NORMAL is
+# durable in WAL mode except for the last transactions on power loss.
+SQLITE_PRAGMAS: Dict[str, Union[str, int]] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("DB_CACHE_SIZE", "-64000")),  # negative = KiB
+    "busy_timeout": int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+# Number of pooled reader connections (plus overflow) for ReadSessionLocal
+READER_POOL_SIZE = int(os.getenv("DB_READER_POOL_SIZE", "8"))
+READER_MAX_OVERFLOW = int(os.getenv("DB_READER_MAX_OVERFLOW", "8"))
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_memory_db(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+def to_async_url(url: str) -> str:
+    """Map a sync SQLite URL to its aiosqlite equivalent."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:") :]
+    return url
+
+
+def _install_pragmas(db_engine: Engine, profile: Dict, read_only: bool):
+    @event.listens_for(db_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in profile.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(
+    url: str = SQLALCHEMY_DATABASE_URL,
+    read_only: bool = False,
+    pragmas: Optional[Dict[str, Union[str, int]]] = None,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    **kwargs,
+) -> Engine:
+    """Create an engine with the tuned SQLite pragma profile applied.
+
+    Reader engines additionally set ``PRAGMA query_only`` so a read session
+    can never take the write lock by accident.
+    """
+    if not _is_sqlite(url):
+        return create_engine(url, **kwargs)
+
+    # connect_args={"check_same_thread": False} is needed for SQLite
+    # when using multiple threads, which is common in web applications.
+    connect_args = kwargs.pop("connect_args", {})
+    connect_args.setdefault("check_same_thread", False)
+
+    if pool_size is not None and not _is_memory_db(url):
+        kwargs["pool_size"] = pool_size
+        kwargs["max_overflow"] = max_overflow or 0
+
+    db_engine = create_engine(url, connect_args=connect_args, **kwargs)
+    profile = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+    if _is_memory_db(url):
+        profile.pop("journal_mode", None)  # WAL is not available in memory
+
+    _install_pragmas(db_engine, profile, read_only)
+    return db_engine
+
+
+def create_async_db_engine(
+    url: str = SQLALCHEMY_DATABASE_URL,
+    read_only: bool = False,
+    pragmas: Optional[Dict[str, Union[str, int]]] = None,
+    **kwargs,
+) -> AsyncEngine:
+    """Async (aiosqlite) counterpart of create_db_engine with the same pragmas."""
+    if not _is_sqlite(url):
+        return create_async_engine(url, **kwargs)
+
+    db_engine = create_async_engine(to_async_url(url), **kwargs)
+    profile = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+    if _is_memory_db(url):
+        profile.pop("journal_mode", None)
+
+    _install_pragmas(db_engine.sync_engine, profile, read_only)
+    return db_engine
+
+
+# Writer engine: used by SessionLocal and everything that modifies data
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
+
+# Reader engine: pooled, read-only connections for dashboards and API reads
+read_engine = create_db_engine(
+    SQLALCHEMY_DATABASE_URL,
+    read_only=True,
+    pool_size=READER_POOL_SIZE,
+    max_overflow=READER_MAX_OVERFLOW,
 )
 
+# Async engines for FastAPI handlers; aiosqlite runs SQLite I/O off the loop
+async_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL)
+async_read_engine = create_async_db_engine(SQLALCHEMY_DATABASE_URL, read_only=True)
+
 # Create a SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only sessions; these never block on (or take) the write lock
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Async sessions; expire_on_commit=False so results stay usable after commit
+# without an implicit (blocking) refresh
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, expire_on_commit=False
+)
+
+# SQLite allows a single writer; serialize writers in-process instead of
+# letting them spin on SQLITE_BUSY against each other.
+_write_lock = threading.RLock()
+
 # Base class for our models
 Base = declarative_base()
 
@@ -29,6 +161,45 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency to get a read-only database session."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Async dependency to get a database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Async dependency to get a read-only database session."""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+@contextmanager
+def writer_session(session_factory: sessionmaker = SessionLocal) -> Iterator[Session]:
+    """Open a write session that holds the process-wide write lock.
+
+    Commits on success, rolls back on error and always closes the session.
+    """
+    with _write_lock:
+        session = session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
 def init_db():
     """Initialize database with all tables"""
     # Import all models to ensure they are registered
@@ -41,15 +212,50 @@ def init_db():
         CustomFieldValue,
         ProjectView,
         AutomationRule,
+        AggregateCounter,
+        ItemTag,
+        ProgressRollup,
+        ChangeLogEntry,
+        ChangeLogCursor,
     )
 
     # Import and setup auto-sync
     from .auto_sync import setup_auto_sync
+    from .aggregates import setup_aggregate_counters
+    from .dependency_graph import setup_dependency_graph
+    from .progress import setup_progress_rollups
+    from .automation import setup_automation
+    from .change_log import setup_change_log
+    from .identity_cache import setup_identity_cache
 
     # Create all tables
     Base.metadata.create_all(bind=engine)
     print("✅ Database initialized with new SQLAlchemy models")
 
+    # Apply versioned schema changes (indexes etc.)
+    from .migrations import run_migrations
+
+    run_migrations()
+
+    # Keep dashboard rollups current on every flush
+    setup_aggregate_counters()
+
+    # Keep project/milestone progress_percentage current on every flush
+    setup_progress_rollups()
+
+    # Append every ORM change to change_log in the writing transaction
+    setup_change_log()
+
+    # Evaluate automation rules on flush, run their actions after commit
+    setup_automation()
+
+    # Keep the in-memory dependency graph (if built) current on commit
+    setup_dependency_graph()
+
+    # Opt-in process-wide cache for primary-key lookups (single process only)
+    if os.getenv("DB_IDENTITY_CACHE", "").lower() in ("1", "true", "yes"):
+        setup_identity_cache()
+
     # Setup automatic GitHub sync
     setup_auto_sync()
     print("✅ Auto-sync configured for GitHub integration")
@@ -57,7 +263,14 @@ def init_db():
 
 def drop_all_tables():
     """Drop all tables (for development/reset)"""
+    from .search import drop_statements as search_drop_statements
+
     Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        # Indexes went with their tables, so migrations must run again
+        connection.exec_driver_sql("DROP TABLE IF EXISTS schema_migrations")
+        for statement in search_drop_statements():
+            connection.exec_driver_sql(statement)
     print("🗑️  All database tables dropped")
 
 
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Dependency Graph
+In-memory index of work item / milestone dependencies with topological
+ordering, cycle detection, transitive blockers and critical path analysis
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from .database import SessionLocal
+from .models.models import Milestone, WorkItem
+
+DONE_STATUSES = {"done", "completed"}
+
+# (blocker, blocked) pairs declared by one row
+Edges = List[Tuple[str, str]]
+
+
+def _as_id_list(value) -> List[str]:
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [item for item in value if isinstance(item, str) and item]
+
+
+def work_item_edges(
+    item_id: str,
+    dependencies,
+    parent_issue_id: Optional[str] = None,
+    milestone_id: Optional[str] = None,
+) -> Edges:
+    """Edges declared by a work item.
+
+    A work item is blocked by its dependencies and blocks its parent issue and
+    its milestone (neither can finish before their sub-items).
+    """
+    edges = [(dependency, item_id) for dependency in _as_id_list(dependencies)]
+    if parent_issue_id:
+        edges.append((item_id, parent_issue_id))
+    if milestone_id:
+        edges.append((item_id, milestone_id))
+    return edges
+
+
+def milestone_edges(milestone_id: str, dependencies) -> Edges:
+    return [(dependency, milestone_id) for dependency in _as_id_list(dependencies)]
+
+
+class DependencyGraph:
+    """Adjacency-list graph over compact integer node ids.
+
+    Every id ever referenced gets a node, so dangling references (a
+    dependency that is not in the database) still show up as blockers.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.blocks: List[List[int]] = []  # node -> nodes waiting on it
+        self.waits_on: List[List[int]] = []  # node -> nodes it waits on
+        self.hours: List[float] = []
+        self.done = bytearray()
+        self.present = bytearray()  # 1 if the node exists in the database
+        self._declared: Dict[str, Edges] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _node(self, item_id: str) -> int:
+        node = self.index.get(item_id)
+        if node is None:
+            node = len(self.ids)
+            self.index[item_id] = node
+            self.ids.append(item_id)
+            self.blocks.append([])
+            self.waits_on.append([])
+            self.hours.append(0.0)
+            self.done.append(0)
+            self.present.append(0)
+        return node
+
+    # Building and incremental updates
+
+    def set_item(
+        self,
+        item_id: str,
+        edges: Edges,
+        hours: Optional[float] = None,
+        status: Optional[str] = None,
+    ):
+        """Insert or replace one row and the edges it declares."""
+        with self._lock:
+            node = self._node(item_id)
+            self.hours[node] = float(hours or 0.0)
+            self.done[node] = status in DONE_STATUSES
+            self.present[node] = 1
+            self._replace_edges(item_id, edges)
+
+    def remove_item(self, item_id: str):
+        """Drop a deleted row's edges; the node stays if others reference it."""
+        with self._lock:
+            if item_id not in self.index:
+                return
+            self._replace_edges(item_id, [])
+            node = self.index[item_id]
+            self.present[node] = 0
+            self.hours[node] = 0.0
+            self.done[node] = 0
+
+    def _replace_edges(self, item_id: str, edges: Edges):
+        for blocker, blocked in self._declared.pop(item_id, []):
+            source, target = self.index[blocker], self.index[blocked]
+            self.blocks[source].remove(target)
+            self.waits_on[target].remove(source)
+        if edges:
+            for blocker, blocked in edges:
+                source, target = self._node(blocker), self._node(blocked)
+                self.blocks[source].append(target)
+                self.waits_on[target].append(source)
+            self._declared[item_id] = list(edges)
+
+    @classmethod
+    def from_session(cls, session: Session) -> "DependencyGraph":
+        """Build the graph from the work_items and milestones tables."""
+        graph = cls()
+        for milestone_id, dependencies, status in session.execute(
+            select(Milestone.id, Milestone.dependencies, Milestone.status)
+        ):
+            graph.set_item(
+                milestone_id, milestone_edges(milestone_id, dependencies), 0, status
+            )
+        for row in session.execute(
+            select(
+                WorkItem.id,
+                WorkItem.dependencies,
+                WorkItem.parent_issue_id,
+                WorkItem.milestone_id,
+                WorkItem.estimated_hours,
+                WorkItem.status,
+            )
+        ):
+            item_id, dependencies, parent_id, milestone_id, hours, status = row
+            graph.set_item(
+                item_id,
+                work_item_edges(item_id, dependencies, parent_id, milestone_id),
+                hours,
+                status,
+            )
+        return graph
+
+    # Queries
+
+    def _walk(
+        self,
+        item_id: str,
+        adjacency: List[List[int]],
+        transitive: bool,
+        open_only: bool,
+    ) -> List[str]:
+        start = self.index.get(item_id)
+        if start is None:
+            return []
+        if not transitive:
+            return [
+                self.ids[node]
+                for node in adjacency[start]
+                if not (open_only and self.done[node])
+            ]
+        seen = {start}
+        queue = deque([start])
+        result = []
+        while queue:
+            for node in adjacency[queue.popleft()]:
+                if node in seen:
+                    continue
+                seen.add(node)
+                if open_only and self.done[node]:
+                    continue  # finished work doesn't propagate blocking
+                result.append(self.ids[node])
+                queue.append(node)
+        return result
+
+    def blocked_by(
+        self, item_id: str, transitive: bool = True, open_only: bool = False
+    ) -> List[str]:
+        """Items that cannot finish before ``item_id`` (what X is blocking)."""
+        return self._walk(item_id, self.blocks, transitive, open_only)
+
+    def blockers(
+        self, item_id: str, transitive: bool = True, open_only: bool = True
+    ) -> List[str]:
+        """Items ``item_id`` waits on; by default only unfinished ones."""
+        return self._walk(item_id, self.waits_on, transitive, open_only)
+
+    def _kahn(self, nodes: Optional[Set[int]] = None) -> List[int]:
+        if nodes is None:
+            indegree = {node: len(self.waits_on[node]) for node in range(len(self))}
+        else:
+            indegree = {
+                node: sum(1 for source in self.waits_on[node] if source in nodes)
+                for node in nodes
+            }
+        queue = deque(node for node, degree in sorted(indegree.items()) if not degree)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for target in self.blocks[node]:
+                if target in indegree:
+                    indegree[target] -= 1
+                    if not indegree[target]:
+                        queue.append(target)
+        return order
+
+    def topological_order(self) -> List[str]:
+        """Ids with every blocker before the items it blocks.
+
+        Raises ValueError if the graph has cycles (see ``find_cycles``).
+        """
+        order = self._kahn()
+        if len(order) != len(self.ids):
+            raise ValueError(f"Dependency cycles: {self.find_cycles()}")
+        return [self.ids[node] for node in order]
+
+    def find_cycles(self) -> List[List[str]]:
+        """Strongly connected components that form cycles (iterative Tarjan)."""
+        index_of: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        cycles: List[List[str]] = []
+        counter = 0
+
+        for root in range(len(self.ids)):
+            if root in index_of:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child = work.pop()
+                if child == 0:
+                    index_of[node] = lowlink[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(node)
+                targets = self.blocks[node]
+                if child < len(targets):
+                    work.append((node, child + 1))
+                    target = targets[child]
+                    if target not in index_of:
+                        work.append((target, 0))
+                    elif target in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[target])
+                    continue
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in self.blocks[node]:
+                        cycles.append(sorted(self.ids[member] for member in component))
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+        return cycles
+
+    def critical_path(
+        self, item_id: Optional[str] = None, open_only: bool = True
+    ) -> Tuple[float, List[str]]:
+        """Longest chain by ``estimated_hours`` as (hours, [ids in order]).
+
+        With ``item_id`` only the chain ending at that item is considered,
+        i.e. the minimum remaining time before it can be finished. Finished
+        items count as zero hours when ``open_only`` is set. Nodes on cycles
+        are ignored.
+        """
+        if item_id is not None:
+            if item_id not in self.index:
+                return 0.0, []
+            target = self.index[item_id]
+            nodes = {target} | {
+                self.index[blocker]
+                for blocker in self._walk(item_id, self.waits_on, True, False)
+            }
+            order = self._kahn(nodes)
+        else:
+            order = self._kahn()
+
+        distance: Dict[int, float] = {}
+        previous: Dict[int, Optional[int]] = {}
+        for node in order:
+            weight = 0.0 if open_only and self.done[node] else self.hours[node]
+            best, best_source = -1.0, None
+            for source in self.waits_on[node]:
+                if source in distance and distance[source] > best:
+                    best, best_source = distance[source], source
+            distance[node] = max(best, 0.0) + weight
+            previous[node] = best_source
+
+        if not distance:
+            return 0.0, []
+        end = target if item_id is not None else max(distance, key=distance.get)
+        if end not in distance:
+            return 0.0, []  # the item sits on a cycle
+        path = []
+        node = end
+        while node is not None:
+            path.append(self.ids[node])
+            node = previous[node]
+        return distance[end], path[::-1]
+
+
+# Process-wide graph, built on first use and kept current on commit
+_graph: Optional[DependencyGraph] = None
+_graph_lock = threading.Lock()
+
+_PENDING_KEY = "dependency_graph_changes"
+
+
+def get_dependency_graph(session: Optional[Session] = None) -> DependencyGraph:
+    """Return the shared graph, building it from the database if needed."""
+    global _graph
+    with _graph_lock:
+        if _graph is None:
+            if session is not None:
+                _graph = DependencyGraph.from_session(session)
+            else:
+                with SessionLocal() as own_session:
+                    _graph = DependencyGraph.from_session(own_session)
+        return _graph
+
+
+def reset_dependency_graph():
+    """Forget the shared graph (rebuilt on the next get_dependency_graph)."""
+    global _graph
+    with _graph_lock:
+        _graph = None
+
+
+def _after_flush(session: Session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, WorkItem):
+            pending[obj.id] = (
+                work_item_edges(
+                    obj.id, obj.dependencies, obj.parent_issue_id, obj.milestone_id
+                ),
+                obj.estimated_hours,
+                obj.status,
+            )
+        elif isinstance(obj, Milestone):
+            pending[obj.id] = (
+                milestone_edges(obj.id, obj.dependencies),
+                0,
+                obj.status,
+            )
+    for obj in session.deleted:
+        if isinstance(obj, (WorkItem, Milestone)):
+            pending[obj.id] = None
+
+
+def _after_commit(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending or _graph is None:
+        return
+    for item_id, change in pending.items():
+        if change is None:
+            _graph.remove_item(item_id)
+        else:
+            _graph.set_item(item_id, *change)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def setup_dependency_graph(session_factory: sessionmaker = SessionLocal):
+    """Register listeners that apply committed changes to the shared graph.
+
+    Bulk ``Query.update()``/raw SQL bypass these; call
+    ``reset_dependency_graph`` after those.
+    """
+    for name, listener in (
+        ("after_flush", _after_flush),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
+
+
+def main():
+    """Report cycles and the critical path"""
+    graph = get_dependency_graph()
+    print(f"📊 {len(graph)} nodes")
+    cycles = graph.find_cycles()
+    if cycles:
+        for cycle in cycles:
+            print(f"⚠️  Cycle: {' -> '.join(cycle)}")
+    else:
+        print("✅ No dependency cycles")
+    hours, path = graph.critical_path()
+    if path:
+        print(f"🛣️  Critical path ({hours:g}h): {' -> '.join(path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Identity Cache
+Opt-in, process-wide LRU of committed row values for primary-key lookups,
+shared by all sessions and invalidated on commit
+"""
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .aggregates import _previous_value
+from .database import SessionLocal
+from .models.models import Idea, Project, WorkItem
+
+CACHED_MODELS = (WorkItem, Idea, Project)
+CACHE_SIZE = int(os.getenv("DB_IDENTITY_CACHE_SIZE", "10000"))
+
+CacheKey = Tuple[str, Any]  # (table name, primary key)
+
+_PENDING_KEY = "identity_cache_pending"  # Keys written in the open transaction
+_CLEAR_KEY = "identity_cache_clear"  # A bulk update/delete ran
+_GENERATION_KEY = "identity_cache_generation"  # Generation at transaction begin
+
+
+def _cache_key(model, item_id) -> CacheKey:
+    return (model.__tablename__, item_id)
+
+
+class IdentityCache:
+    """LRU of {column: committed value} per (table, id).
+
+    Entries are plain values, never instances, so they can be handed to any
+    session. ``generation`` changes on every invalidation: a value loaded
+    while a concurrent commit invalidated entries is not stored, so a slow
+    reader cannot put back a row that was just changed.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self.enabled = False
+        self.generation = 0
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            values = self._entries.get(key)
+            if values is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return values
+
+    def put(self, key: CacheKey, values: Dict[str, Any], generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return  # Invalidated while the row was being loaded
+            self._entries[key] = values
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, keys):
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def clear(self, reset_stats: bool = False):
+        with self._lock:
+            self.generation += 1
+            self._stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+            if reset_stats:
+                self._stats.update(hits=0, misses=0, evictions=0, invalidations=0)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_size": self.size,
+                "hit_rate": (
+                    round(self._stats["hits"] / lookups * 100, 2) if lookups else 0.0
+                ),
+            }
+
+
+identity_cache = IdentityCache()
+
+
+def _column_keys(model):
+    return [attribute.key for attribute in inspect(model).column_attrs]
+
+
+def _snapshot(obj) -> Optional[Dict[str, Any]]:
+    """Committed column values of a freshly loaded, unmodified instance."""
+    state = inspect(obj)
+    if state.modified or state.expired_attributes:
+        return None
+    values = {}
+    for key in _column_keys(type(obj)):
+        if key not in state.dict:
+            return None  # Deferred or unloaded column
+        value = state.dict[key]
+        values[key] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+    return values
+
+
+def _instance(session: Session, model, values: Dict[str, Any]):
+    """Attach a persistent instance built from cached values (no SQL)."""
+    obj = inspect(model).class_manager.new_instance()
+    for key, value in values.items():
+        if isinstance(value, (list, dict)):
+            value = copy.deepcopy(value)  # JSON columns may be mutated in place
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    session.add(obj)
+    return obj
+
+
+def cached_get(session: Session, model, item_id):
+    """``session.get(model, item_id)`` that consults the identity cache.
+
+    Falls back to a plain ``session.get`` when the cache is not set up, the
+    model is not cached, the session already holds the row, or the session
+    has written the row in its open transaction.
+    """
+    if not identity_cache.enabled or model not in CACHED_MODELS or item_id is None:
+        return session.get(model, item_id)
+    identity = inspect(model).identity_key_from_primary_key((item_id,))
+    key = _cache_key(model, item_id)
+    if identity in session.identity_map or key in session.info.get(_PENDING_KEY, ()):
+        return session.get(model, item_id)
+
+    values = identity_cache.get(key)
+    if values is not None:
+        return _instance(session, model, values)
+
+    # A transaction reads from the snapshot it started with: rows it loads
+    # are only as fresh as the generation at its begin
+    if session.in_transaction() and _GENERATION_KEY in session.info:
+        generation = session.info[_GENERATION_KEY]
+    else:
+        generation = identity_cache.generation
+    obj = session.get(model, item_id)
+    if obj is not None:
+        values = _snapshot(obj)
+        if values is not None:
+            identity_cache.put(key, values, generation)
+    return obj
+
+
+def invalidate(model, item_id):
+    """Drop one row (after writing it with raw SQL or another process)."""
+    identity_cache.invalidate([_cache_key(model, item_id)])
+
+
+def clear_identity_cache(reset_stats: bool = False):
+    identity_cache.clear(reset_stats)
+
+
+def identity_cache_info() -> Dict[str, Any]:
+    return identity_cache.info()
+
+
+def _written_keys(session: Session) -> Set[CacheKey]:
+    keys = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, CACHED_MODELS):
+            keys.add(_cache_key(type(obj), obj.id))
+        if isinstance(obj, WorkItem):
+            # progress_percentage of the old and new project changes with
+            # raw SQL on flush (see infrastructure.db.progress)
+            for project_id in (obj.project_id, _previous_value(obj, "project_id")):
+                if project_id is not None:
+                    keys.add(_cache_key(Project, project_id))
+    return keys
+
+
+def _after_begin(session: Session, transaction, connection):
+    session.info[_GENERATION_KEY] = identity_cache.generation
+
+
+def _after_flush(session: Session, flush_context):
+    keys = _written_keys(session)
+    if keys:
+        session.info.setdefault(_PENDING_KEY, set()).update(keys)
+
+
+def _after_bulk(update_context):
+    update_context.session.info[_CLEAR_KEY] = True
+
+
+def _after_commit(session: Session):
+    keys = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_CLEAR_KEY, False):
+        identity_cache.clear()
+    elif keys:
+        identity_cache.invalidate(keys)
+
+
+def _after_rollback(session: Session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_CLEAR_KEY, None)
+
+
+def setup_identity_cache(
+    session_factory: sessionmaker = SessionLocal, size: Optional[int] = None
+):
+    """Enable the cache and invalidate it from ``session_factory``'s commits.
+
+    Writes through other session factories, raw SQL and other processes are
+    not seen; call ``invalidate``/``clear_identity_cache`` after those.
+    """
+    if size is not None:
+        identity_cache.size = size
+    identity_cache.enabled = True
+    for name, listener in (
+        ("after_begin", _after_begin),
+        ("after_flush", _after_flush),
+        ("after_bulk_update", _after_bulk),
+        ("after_bulk_delete", _after_bulk),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(session_factory, name, listener):
+            event.listen(session_factory, name, listener)
+
+
+def main():
+    """Print identity cache statistics for a burst of lookups"""
+    import argparse
+
+    from sqlalchemy import select
+
+    parser = argparse.ArgumentParser(description="Identity cache statistics")
+    parser.add_argument("--rounds", type=int, default=3, help="Lookups per item")
+    args = parser.parse_args()
+
+    setup_identity_cache()
+    session = SessionLocal()
+    try:
+        ids = session.scalars(select(WorkItem.id).limit(CACHE_SIZE)).all()
+    finally:
+        session.close()
+    for _ in range(args.rounds):
+        for item_id in ids:
+            with SessionLocal() as lookup:
+                cached_get(lookup, WorkItem, item_id)
+    info = identity_cache_info()
+    print(
+        f"📊 {info['hits']} hits, {info['misses']} misses "
+        f"({info['hit_rate']}%), {info['size']} cached rows"
+    )
+
+
+if __name__ == "__main__":
+    main()
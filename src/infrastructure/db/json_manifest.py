@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - JSON Content Manifest
+Tracks (path, mtime, size, content hash, item id) of JSON item files so
+migrations and parity checks only touch files that changed since the last run
+"""
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from .database import engine
+from .models.models import JsonManifestEntry, JsonManifestRoot
+
+
+class FileState(NamedTuple):
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+class ManifestDiff(NamedTuple):
+    directory: str
+    changed: List[Path]  # New or modified since the last commit
+    removed: List[str]  # Relative paths recorded but no longer on disk
+    unchanged_ids: Dict[str, Optional[str]]  # Relative path -> item id
+    states: Dict[str, FileState]  # Current state of every file
+    root_hash: str  # Merkle-style hash over all current files
+
+    @property
+    def is_clean(self) -> bool:
+        return not self.changed and not self.removed
+
+
+def hash_file(path: Path) -> str:
+    """sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compute_root_hash(hashes: Dict[str, str]) -> str:
+    """Combine per-file hashes (sorted by relative path) into one summary hash."""
+    digest = hashlib.sha256()
+    for relative_path in sorted(hashes):
+        digest.update(f"{relative_path}\0{hashes[relative_path]}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class JsonManifest:
+    """Persistent content manifest for a directory of JSON item files"""
+
+    def __init__(self, bind: Optional[Engine] = None):
+        self.bind = bind or engine
+        # The manifest tables come from the numbered migrations (0012)
+        from .migrations import run_migrations
+
+        run_migrations(self.bind, verbose=False)
+        self.Session = sessionmaker(bind=self.bind)
+
+    def _key(self, directory: Path) -> str:
+        return str(Path(directory).resolve())
+
+    def scan(self, directory: Path, pattern: str = "*.json") -> ManifestDiff:
+        """Compare the directory with the manifest.
+
+        Files whose mtime and size match their entry are not opened; the rest
+        are hashed, and only those whose content hash differs count as changed.
+        """
+        directory = Path(directory)
+        key = self._key(directory)
+        with self.Session() as session:
+            known = {
+                entry.path: entry
+                for entry in session.query(JsonManifestEntry).filter(
+                    JsonManifestEntry.directory == key
+                )
+            }
+
+        changed: List[Path] = []
+        unchanged_ids: Dict[str, Optional[str]] = {}
+        states: Dict[str, FileState] = {}
+
+        for path in sorted(directory.glob(pattern)):
+            relative_path = path.name
+            stat = path.stat()
+            entry = known.get(relative_path)
+            if (
+                entry is not None
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+            ):
+                content_hash = entry.content_hash
+            else:
+                content_hash = hash_file(path)
+            states[relative_path] = FileState(
+                stat.st_mtime_ns, stat.st_size, content_hash
+            )
+
+            if entry is not None and entry.content_hash == content_hash:
+                unchanged_ids[relative_path] = entry.item_id
+            else:
+                changed.append(path)
+
+        removed = sorted(set(known) - set(states))
+        root_hash = compute_root_hash(
+            {name: state.content_hash for name, state in states.items()}
+        )
+        return ManifestDiff(key, changed, removed, unchanged_ids, states, root_hash)
+
+    def commit(self, diff: ManifestDiff, item_ids: Dict[Path, Optional[str]]):
+        """Record a scan as synced once the caller has processed ``diff.changed``.
+
+        ``item_ids`` maps each successfully processed changed path to its item
+        id. Changed paths missing from it stay pending and show up as changed
+        again on the next scan.
+        """
+        now = datetime.utcnow()
+        ids_by_name = {Path(path).name: item_id for path, item_id in item_ids.items()}
+        recorded = {
+            name: state
+            for name, state in diff.states.items()
+            if name in diff.unchanged_ids or name in ids_by_name
+        }
+
+        with self.Session() as session:
+            if diff.removed:
+                session.query(JsonManifestEntry).filter(
+                    JsonManifestEntry.directory == diff.directory,
+                    JsonManifestEntry.path.in_(diff.removed),
+                ).delete(synchronize_session=False)
+
+            for relative_path, state in recorded.items():
+                item_id = ids_by_name.get(
+                    relative_path, diff.unchanged_ids.get(relative_path)
+                )
+                session.merge(
+                    JsonManifestEntry(
+                        path=relative_path,
+                        directory=diff.directory,
+                        mtime_ns=state.mtime_ns,
+                        size=state.size,
+                        content_hash=state.content_hash,
+                        item_id=item_id,
+                        synced_at=now,
+                    )
+                )
+
+            # Pending files are left out so the root only matches a full sync
+            session.merge(
+                JsonManifestRoot(
+                    directory=diff.directory,
+                    root_hash=compute_root_hash(
+                        {name: state.content_hash for name, state in recorded.items()}
+                    ),
+                    entry_count=len(recorded),
+                    updated_date=now,
+                )
+            )
+            session.commit()
+
+    def stored_root_hash(self, directory: Path) -> Optional[str]:
+        """Summary hash recorded by the last commit (None if never synced)."""
+        with self.Session() as session:
+            root = session.get(JsonManifestRoot, self._key(directory))
+            return root.root_hash if root else None
+
+    def is_in_sync(self, directory: Path, pattern: str = "*.json") -> bool:
+        """True if the directory's content equals the last committed state."""
+        return self.scan(directory, pattern).root_hash == self.stored_root_hash(
+            directory
+        )
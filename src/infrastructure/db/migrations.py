@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Versioned Schema Migrations
+Applies ordered, idempotent schema changes on top of Base.metadata.create_all
+"""
+
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .aggregates import rebuild_statements as aggregate_rebuild_statements
+from .custom_fields import drop_statements as custom_field_drop_statements
+from .custom_fields import rebuild_statements as custom_field_rebuild_statements
+from .custom_fields import schema_statements as custom_field_schema_statements
+from .database import engine
+from .progress import rebuild_statements as progress_rebuild_statements
+from .search import rebuild_statements as search_rebuild_statements
+from .search import schema_statements as search_schema_statements
+from .tags import rebuild_statements as tag_rebuild_statements
+from .tags import schema_statements as tag_schema_statements
+
+
+class AddColumn(NamedTuple):
+    """ALTER TABLE ADD COLUMN, skipped when create_all already made the column
+    (SQLite has no ADD COLUMN IF NOT EXISTS)."""
+
+    table: str
+    column: str
+    definition: str
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    statements: List[Union[str, AddColumn]]
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "hot_query_indexes",
+        [
+            # Dashboard: GROUP BY status, done-since-date trend, completion rate
+            "CREATE INDEX IF NOT EXISTS ix_work_items_status_updated_date "
+            "ON work_items (status, updated_date)",
+            # Dashboard: GROUP BY priority
+            "CREATE INDEX IF NOT EXISTS ix_work_items_priority "
+            "ON work_items (priority)",
+            # Dashboard: ORDER BY created_date DESC LIMIT 10
+            "CREATE INDEX IF NOT EXISTS ix_work_items_created_date "
+            "ON work_items (created_date)",
+            # Project reports: work items per project
+            "CREATE INDEX IF NOT EXISTS ix_work_items_project_id "
+            "ON work_items (project_id)",
+            # GitHubIntegration.sync_to_github: github_issue_id IS NULL
+            "CREATE INDEX IF NOT EXISTS ix_work_items_unsynced "
+            "ON work_items (created_date) WHERE github_issue_id IS NULL",
+            # Active (non-archived) boards
+            "CREATE INDEX IF NOT EXISTS ix_work_items_active_status_priority "
+            "ON work_items (status, priority) WHERE archived = 0",
+            "CREATE INDEX IF NOT EXISTS ix_work_items_active_updated_date "
+            "ON work_items (updated_date) WHERE archived = 0",
+            # Ideas dashboard and sync
+            "CREATE INDEX IF NOT EXISTS ix_ideas_status ON ideas (status)",
+            "CREATE INDEX IF NOT EXISTS ix_ideas_category ON ideas (category)",
+            "CREATE INDEX IF NOT EXISTS ix_ideas_created_date "
+            "ON ideas (created_date)",
+            "CREATE INDEX IF NOT EXISTS ix_ideas_unsynced "
+            "ON ideas (created_date) WHERE github_issue_id IS NULL",
+            "ANALYZE",
+        ],
+    ),
+    Migration(
+        2,
+        "aggregate_counters_backfill",
+        [
+            "CREATE TABLE IF NOT EXISTS aggregate_counters ("
+            "entity VARCHAR NOT NULL, "
+            "dimension VARCHAR NOT NULL, "
+            "value VARCHAR NOT NULL, "
+            "count INTEGER NOT NULL, "
+            "PRIMARY KEY (entity, dimension, value))",
+            *aggregate_rebuild_statements(),
+        ],
+    ),
+    Migration(
+        3,
+        "fts5_search",
+        [*search_schema_statements(), *search_rebuild_statements()],
+    ),
+    Migration(
+        4,
+        "item_tags",
+        [
+            "CREATE TABLE IF NOT EXISTS item_tags ("
+            "entity VARCHAR NOT NULL, "
+            "field VARCHAR NOT NULL, "
+            "tag VARCHAR NOT NULL, "
+            "item_id VARCHAR NOT NULL, "
+            "PRIMARY KEY (entity, field, tag, item_id)) WITHOUT ROWID",
+            "CREATE INDEX IF NOT EXISTS ix_item_tags_entity_item_id "
+            "ON item_tags (entity, item_id)",
+            *tag_schema_statements(),
+            *tag_rebuild_statements(),
+        ],
+    ),
+    Migration(
+        5,
+        "keyset_pagination_indexes",
+        [
+            # pagination.KEYSETS: ORDER BY (date, id) and seek on (date, id) > ?
+            "CREATE INDEX IF NOT EXISTS ix_work_items_created_date_id "
+            "ON work_items (created_date, id)",
+            "CREATE INDEX IF NOT EXISTS ix_work_items_updated_date_id "
+            "ON work_items (updated_date, id)",
+            "CREATE INDEX IF NOT EXISTS ix_ideas_created_date_id "
+            "ON ideas (created_date, id)",
+            "CREATE INDEX IF NOT EXISTS ix_ideas_updated_date_id "
+            "ON ideas (updated_date, id)",
+            # Superseded by the (created_date, id) indexes
+            "DROP INDEX IF EXISTS ix_work_items_created_date",
+            "DROP INDEX IF EXISTS ix_ideas_created_date",
+            "ANALYZE",
+        ],
+    ),
+    Migration(
+        6,
+        "progress_rollups",
+        [
+            "CREATE TABLE IF NOT EXISTS progress_rollups ("
+            "scope VARCHAR NOT NULL, "
+            "scope_id VARCHAR NOT NULL, "
+            "total_weight INTEGER NOT NULL, "
+            "done_weight INTEGER NOT NULL, "
+            "PRIMARY KEY (scope, scope_id))",
+            *progress_rebuild_statements(),
+        ],
+    ),
+    Migration(
+        7,
+        "custom_field_typed_values",
+        [
+            AddColumn("custom_field_values", "value_number", "FLOAT"),
+            AddColumn("custom_field_values", "value_date", "DATETIME"),
+            AddColumn("custom_field_values", "value_text", "VARCHAR"),
+            AddColumn("custom_field_values", "value_option", "VARCHAR"),
+            # Pivot joins look up (field_id, work_item_id); filters and sorts
+            # on one field range-scan its typed index
+            "CREATE INDEX IF NOT EXISTS ix_custom_field_values_field_item "
+            "ON custom_field_values (field_id, work_item_id)",
+            "CREATE INDEX IF NOT EXISTS ix_custom_field_values_number "
+            "ON custom_field_values (field_id, value_number)",
+            "CREATE INDEX IF NOT EXISTS ix_custom_field_values_date "
+            "ON custom_field_values (field_id, value_date)",
+            "CREATE INDEX IF NOT EXISTS ix_custom_field_values_text "
+            "ON custom_field_values (field_id, value_text)",
+            "CREATE INDEX IF NOT EXISTS ix_custom_field_values_option "
+            "ON custom_field_values (field_id, value_option)",
+            *custom_field_schema_statements(),
+            *custom_field_rebuild_statements(),
+            "ANALYZE",
+        ],
+    ),
+    Migration(
+        8,
+        "change_log",
+        [
+            "CREATE TABLE IF NOT EXISTS change_log ("
+            "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "entity VARCHAR NOT NULL, "
+            "entity_id VARCHAR NOT NULL, "
+            "operation VARCHAR NOT NULL, "
+            "changes JSON NOT NULL, "
+            "changed_at DATETIME NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS ix_change_log_entity_seq "
+            "ON change_log (entity, seq)",
+            "CREATE TABLE IF NOT EXISTS change_log_cursors ("
+            "consumer VARCHAR NOT NULL PRIMARY KEY, "
+            "seq INTEGER NOT NULL, "
+            "updated_at DATETIME NOT NULL)",
+        ],
+    ),
+    Migration(
+        9,
+        "github_sync_cursors",
+        [
+            "CREATE TABLE IF NOT EXISTS github_sync_cursors ("
+            "repo VARCHAR NOT NULL PRIMARY KEY, "
+            "since DATETIME NOT NULL, "
+            "updated_at DATETIME NOT NULL)",
+        ],
+    ),
+    Migration(
+        10,
+        "custom_field_date_format",
+        [
+            # Typed dates in DateTime's bind format, so = and >= match
+            *custom_field_drop_statements(),
+            *custom_field_schema_statements(),
+            *custom_field_rebuild_statements(),
+        ],
+    ),
+    Migration(
+        11,
+        "github_updated_at",
+        [
+            # Inbound sync skips GitHub states older than the one applied
+            AddColumn("work_items", "github_updated_at", "DATETIME"),
+            AddColumn("ideas", "github_updated_at", "DATETIME"),
+        ],
+    ),
+    Migration(
+        12,
+        "json_manifest",
+        [
+            "CREATE TABLE IF NOT EXISTS json_manifest ("
+            "path VARCHAR NOT NULL, "
+            "directory VARCHAR NOT NULL, "
+            "mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "content_hash VARCHAR NOT NULL, "
+            "item_id VARCHAR, "
+            "synced_at DATETIME NOT NULL, "
+            "PRIMARY KEY (path, directory))",
+            "CREATE INDEX IF NOT EXISTS ix_json_manifest_item_id "
+            "ON json_manifest (item_id)",
+            "CREATE TABLE IF NOT EXISTS json_manifest_roots ("
+            "directory VARCHAR NOT NULL PRIMARY KEY, "
+            "root_hash VARCHAR NOT NULL, "
+            "entry_count INTEGER NOT NULL, "
+            "updated_date DATETIME NOT NULL)",
+        ],
+    ),
+]
+
+
+def _ensure_migrations_table(connection: Connection):
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "version INTEGER PRIMARY KEY, "
+            "name VARCHAR NOT NULL, "
+            "applied_at DATETIME NOT NULL)"
+        )
+    )
+
+
+def _add_column(connection: Connection, change: AddColumn):
+    existing = {
+        row[1]
+        for row in connection.exec_driver_sql(f"PRAGMA table_info({change.table})")
+    }
+    if change.column not in existing:
+        connection.execute(
+            text(
+                f"ALTER TABLE {change.table} "
+                f"ADD COLUMN {change.column} {change.definition}"
+            )
+        )
+
+
+def get_schema_version(bind: Optional[Engine] = None) -> int:
+    """Return the highest applied migration version (0 if none)."""
+    with (bind or engine).begin() as connection:
+        _ensure_migrations_table(connection)
+        version = connection.execute(
+            text("SELECT MAX(version) FROM schema_migrations")
+        ).scalar()
+    return version or 0
+
+
+def run_migrations(bind: Optional[Engine] = None, verbose: bool = True) -> int:
+    """Apply all pending migrations, each in its own transaction.
+
+    Returns the number of migrations applied.
+    """
+    bind = bind or engine
+    current = get_schema_version(bind)
+    applied = 0
+
+    for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+        if migration.version <= current:
+            continue
+        with bind.begin() as connection:
+            for statement in migration.statements:
+                if isinstance(statement, AddColumn):
+                    _add_column(connection, statement)
+                else:
+                    connection.execute(text(statement))
+            connection.execute(
+                text(
+                    "INSERT INTO schema_migrations (version, name, applied_at) "
+                    "VALUES (:version, :name, :applied_at)"
+                ),
+                {
+                    "version": migration.version,
+                    "name": migration.name,
+                    "applied_at": datetime.utcnow(),
+                },
+            )
+        applied += 1
+        if verbose:
+            print(f"✅ Applied migration {migration.version:04d}_{migration.name}")
+
+    return applied
+
+
+if __name__ == "__main__":
+    count = run_migrations()
+    print(f"📦 Schema at version {get_schema_version()} ({count} applied)")
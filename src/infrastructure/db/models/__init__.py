@@ -7,6 +7,14 @@ from .models import (
     CustomFieldValue,
     ProjectView,
     AutomationRule,
+    AggregateCounter,
+    ProgressRollup,
+    ChangeLogEntry,
+    ChangeLogCursor,
+    GitHubSyncCursor,
+    JsonManifestEntry,
+    JsonManifestRoot,
+    ItemTag,
 )
 
 __all__ = [
@@ -18,4 +26,12 @@ __all__ = [
     "CustomFieldValue",
     "ProjectView",
     "AutomationRule",
+    "AggregateCounter",
+    "ProgressRollup",
+    "ChangeLogEntry",
+    "ChangeLogCursor",
+    "GitHubSyncCursor",
+    "JsonManifestEntry",
+    "JsonManifestRoot",
+    "ItemTag",
 ]
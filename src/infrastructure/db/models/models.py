@@ -8,6 +8,8 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     JSON,
+    Index,
+    FetchedValue,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -48,6 +50,7 @@ class Idea(Base):
     prerequisites = Column(JSON, default=list)  # Stored as JSON
     github_issue_id = Column(Integer)  # GitHub issue number for sync
     github_synced_at = Column(DateTime)  # Last sync timestamp
+    github_updated_at = Column(DateTime)  # Issue updated_at last applied, UTC
 
     def __repr__(self):
         return f"<Idea(id='{self.id}', title='{self.title}', status='{self.status}')>"
@@ -136,6 +139,7 @@ class WorkItem(Base):
     repository_url = Column(String)
     github_issue_id = Column(Integer)  # GitHub issue number for sync
     github_synced_at = Column(DateTime)  # Last sync timestamp
+    github_updated_at = Column(DateTime)  # Issue updated_at last applied, UTC
     github_repo_url = Column(String)  # GitHub repository URL
     is_draft = Column(Boolean, default=False)
     archived = Column(Boolean, default=False)
@@ -212,11 +216,33 @@ class CustomFieldValue(Base):
     field_id = Column(String, ForeignKey("custom_fields.id"))
     work_item_id = Column(String, ForeignKey("work_items.id"))
     value = Column(JSON)  # Flexible storage for different field types
+    # Typed copies of value for filtering/sorting, written by SQLite triggers
+    # (see infrastructure.db.custom_fields)
+    value_number = Column(
+        Float, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    value_date = Column(
+        DateTime, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    value_text = Column(
+        String, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
+    value_option = Column(
+        String, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
     created_date = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_date = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
+    __table_args__ = (
+        Index("ix_custom_field_values_field_item", "field_id", "work_item_id"),
+        Index("ix_custom_field_values_number", "field_id", "value_number"),
+        Index("ix_custom_field_values_date", "field_id", "value_date"),
+        Index("ix_custom_field_values_text", "field_id", "value_text"),
+        Index("ix_custom_field_values_option", "field_id", "value_option"),
+    )
+
     # Relationships
     field = relationship("CustomField", back_populates="values")
     work_item = relationship("WorkItem", back_populates="custom_field_values")
@@ -270,3 +296,116 @@ class AutomationRule(Base):
 
     def __repr__(self):
         return f"<AutomationRule(id='{self.id}', name='{self.name}', enabled='{self.enabled}')>"
+
+
+class AggregateCounter(Base):
+    __tablename__ = "aggregate_counters"
+
+    entity = Column(String, primary_key=True)  # Table name, e.g. work_items
+    dimension = Column(String, primary_key=True)  # status, priority, ... or total
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AggregateCounter({self.entity}.{self.dimension}={self.value!r}: {self.count})>"
+
+
+class ProgressRollup(Base):
+    __tablename__ = "progress_rollups"
+
+    scope = Column(String, primary_key=True)  # projects or milestones
+    scope_id = Column(String, primary_key=True)
+    total_weight = Column(Integer, nullable=False, default=0)  # centi-hours
+    done_weight = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ProgressRollup({self.scope}.{self.scope_id}: {self.done_weight}/{self.total_weight})>"
+
+
+class ChangeLogEntry(Base):
+    __tablename__ = "change_log"
+
+    # AUTOINCREMENT: sequence numbers are never reused, even after pruning
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # Table name, e.g. work_items
+    entity_id = Column(String, nullable=False)
+    operation = Column(String, nullable=False)  # insert, update, delete
+    changes = Column(JSON, nullable=False)  # {field: [old, new]}
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_change_log_entity_seq", "entity", "seq"),
+        {"sqlite_autoincrement": True},
+    )
+
+    def __repr__(self):
+        return f"<ChangeLogEntry({self.seq}: {self.operation} {self.entity}/{self.entity_id})>"
+
+
+class ChangeLogCursor(Base):
+    __tablename__ = "change_log_cursors"
+
+    consumer = Column(String, primary_key=True)
+    seq = Column(Integer, nullable=False, default=0)  # Last processed entry
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<ChangeLogCursor({self.consumer} at {self.seq})>"
+
+
+class GitHubSyncCursor(Base):
+    __tablename__ = "github_sync_cursors"
+
+    repo = Column(String, primary_key=True)  # owner/name
+    since = Column(DateTime, nullable=False)  # Last synced issue.updated_at, UTC
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<GitHubSyncCursor({self.repo} since {self.since})>"
+
+
+class JsonManifestEntry(Base):
+    __tablename__ = "json_manifest"
+
+    path = Column(String, primary_key=True)  # Relative to the scanned directory
+    directory = Column(String, primary_key=True)
+    mtime_ns = Column(Integer, nullable=False)
+    size = Column(Integer, nullable=False)
+    content_hash = Column(String, nullable=False)  # sha256 hex
+    item_id = Column(String, index=True)
+    synced_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<JsonManifestEntry(path='{self.path}', item_id='{self.item_id}')>"
+
+
+class JsonManifestRoot(Base):
+    __tablename__ = "json_manifest_roots"
+
+    directory = Column(String, primary_key=True)
+    root_hash = Column(String, nullable=False)  # Merkle-style hash of all entries
+    entry_count = Column(Integer, nullable=False, default=0)
+    updated_date = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<JsonManifestRoot(directory='{self.directory}', root_hash='{self.root_hash[:12]}')>"
+
+
+class ItemTag(Base):
+    __tablename__ = "item_tags"
+
+    # Rows are written by SQLite triggers from the JSON tag columns
+    entity = Column(String, primary_key=True)  # Table name, e.g. work_items
+    field = Column(String, primary_key=True)  # labels, tags, technologies
+    tag = Column(String, primary_key=True)
+    item_id = Column(String, primary_key=True)
+
+    __table_args__ = (
+        Index("ix_item_tags_entity_item_id", "entity", "item_id"),
+        {"sqlite_with_rowid": False},
+    )
+
+    def __repr__(self):
+        return f"<ItemTag({self.entity}.{self.field}={self.tag!r}: {self.item_id})>"
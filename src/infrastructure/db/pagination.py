@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Keyset Pagination
+Seek-based pages, bounded-memory streaming and column projections for
+work items and ideas
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+# Sort keys usable for keyset pagination; each is backed by a composite
+# (column, id) index (migration 5) so a page is one index range scan
+KEYSETS = {
+    "created": ("created_date", "id"),
+    "updated": ("updated_date", "id"),
+}
+
+PAGE_SIZE = 100
+STREAM_BATCH_SIZE = 500
+
+Cursor = Tuple[Any, ...]
+
+
+class Page(NamedTuple):
+    items: List[Any]  # ORM objects, or Rows in projection mode
+    next_cursor: Optional[Cursor]  # None on the last page
+
+
+def encode_cursor(cursor: Optional[Cursor]) -> Optional[str]:
+    """Opaque, URL-safe string form of a cursor (for API responses)."""
+    if cursor is None:
+        return None
+    values = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in cursor
+    ]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Cursor]:
+    if not token:
+        return None
+    values = json.loads(base64.urlsafe_b64decode(token.encode()))
+    return tuple(
+        datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+        for value in values
+    )
+
+
+def _key_columns(model, order_by: str):
+    return [getattr(model, name) for name in KEYSETS[order_by]]
+
+
+def keyset_select(
+    model,
+    order_by: str = "created",
+    after: Optional[Cursor] = None,
+    descending: bool = False,
+    filters: Sequence = (),
+    columns: Optional[Sequence] = None,
+):
+    """select() for one keyset page (without LIMIT).
+
+    ``columns`` switches to projection mode: rows are plain tuples of those
+    columns (the sort key columns are appended when missing).
+    """
+    keys = _key_columns(model, order_by)
+    if columns:
+        selected = list(columns)
+        selected += [key for key in keys if key.key not in {c.key for c in columns}]
+        query = select(*selected)
+    else:
+        query = select(model)
+
+    for condition in filters:
+        query = query.where(condition)
+    if after is not None:
+        if descending:
+            query = query.where(tuple_(*keys) < tuple_(*after))
+        else:
+            query = query.where(tuple_(*keys) > tuple_(*after))
+    return query.order_by(*(key.desc() if descending else key for key in keys))
+
+
+def _cursor_of(item, model, order_by: str, projected: bool) -> Cursor:
+    names = KEYSETS[order_by]
+    if projected:
+        return tuple(item._mapping[name] for name in names)
+    return tuple(getattr(item, name) for name in names)
+
+
+def paginate(
+    session: Session,
+    model,
+    order_by: str = "created",
+    after: Optional[Cursor] = None,
+    limit: int = PAGE_SIZE,
+    descending: bool = False,
+    filters: Sequence = (),
+    columns: Optional[Sequence] = None,
+) -> Page:
+    """Fetch one page after ``after`` (a cursor from the previous page)."""
+    query = keyset_select(model, order_by, after, descending, filters, columns)
+    result = session.execute(query.limit(limit + 1))
+    items = result.all() if columns else result.scalars().all()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = _cursor_of(items[-1], model, order_by, bool(columns))
+    return Page(items, next_cursor)
+
+
+def iter_keyset(
+    session: Session,
+    model,
+    order_by: str = "created",
+    page_size: int = PAGE_SIZE,
+    descending: bool = False,
+    filters: Sequence = (),
+    columns: Optional[Sequence] = None,
+) -> Iterator[Any]:
+    """Iterate over all matching rows one keyset page at a time.
+
+    Each page is a separate query, so the caller may commit between items
+    (unlike ``stream``, whose cursor must stay open).
+    """
+    after = None
+    while True:
+        page = paginate(
+            session, model, order_by, after, page_size, descending, filters, columns
+        )
+        yield from page.items
+        if page.next_cursor is None:
+            return
+        after = page.next_cursor
+
+
+def stream(
+    session: Session,
+    model,
+    order_by: str = "created",
+    batch_size: int = STREAM_BATCH_SIZE,
+    descending: bool = False,
+    filters: Sequence = (),
+    columns: Optional[Sequence] = None,
+) -> Iterator[Any]:
+    """Stream all matching rows over a single cursor with ``yield_per``.
+
+    Memory stays bounded by ``batch_size``; do not commit the session while
+    iterating (use ``iter_keyset`` for that).
+    """
+    query = keyset_select(model, order_by, None, descending, filters, columns)
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    return iter(result) if columns else iter(result.scalars())
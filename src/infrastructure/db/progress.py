@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Progress Rollups
+Incrementally maintained work item totals behind Project and Milestone
+progress_percentage, updated in the writing transaction
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .aggregates import _force_active_history, _previous_value
+from .database import SessionLocal
+from .models.models import Milestone, ProgressRollup, Project, WorkItem
+
+# Rollup scope -> (model, WorkItem foreign key column)
+SCOPES = {
+    "projects": (Project, "project_id"),
+    "milestones": (Milestone, "milestone_id"),
+}
+
+DONE_STATUS = "done"
+
+# Weights are integer centi-hours so incremental sums never drift; items
+# without an estimate count as one hour
+DEFAULT_WEIGHT = 100
+
+TRACKED_ATTRIBUTES = ("status", "estimated_hours", "project_id", "milestone_id")
+
+WEIGHT_SQL = (
+    "CASE WHEN estimated_hours > 0 "
+    "THEN CAST(ROUND(estimated_hours * 100) AS INTEGER) "
+    f"ELSE {DEFAULT_WEIGHT} END"
+)
+
+PERCENTAGE_SQL = (
+    "CASE WHEN total_weight > 0 "
+    "THEN CAST(ROUND(100.0 * done_weight / total_weight) AS INTEGER) ELSE 0 END"
+)
+
+ScopeKey = Tuple[str, str]
+
+
+def _sqlite_round(value: float) -> int:
+    """SQLite's ROUND(x) for x >= 0: half away from zero, computed as
+    (int)(x + 0.5) in doubles. Python's round() rounds half to even and
+    would drift from the SQL rebuild on .5 values."""
+    return int(value + 0.5)
+
+
+def item_weight(estimated_hours: Optional[float]) -> int:
+    """Weight of one work item in centi-hours (see WEIGHT_SQL)."""
+    if estimated_hours and estimated_hours > 0:
+        return _sqlite_round(estimated_hours * 100)
+    return DEFAULT_WEIGHT
+
+
+def _contribute(deltas: Dict, values: Dict, sign: int):
+    weight = item_weight(values["estimated_hours"]) * sign
+    done = weight if values["status"] == DONE_STATUS else 0
+    for scope, (_, column) in SCOPES.items():
+        scope_id = values[column]
+        if scope_id:
+            delta = deltas[(scope, scope_id)]
+            delta[0] += weight
+            delta[1] += done
+
+
+def _collect_deltas(session: Session) -> Dict[ScopeKey, List[int]]:
+    deltas: Dict[ScopeKey, List[int]] = defaultdict(lambda: [0, 0])
+
+    for obj in session.new:
+        if isinstance(obj, WorkItem):
+            _contribute(
+                deltas, {name: getattr(obj, name) for name in TRACKED_ATTRIBUTES}, 1
+            )
+
+    for obj in session.deleted:
+        if isinstance(obj, WorkItem):
+            _contribute(
+                deltas,
+                {name: _previous_value(obj, name) for name in TRACKED_ATTRIBUTES},
+                -1,
+            )
+
+    for obj in session.dirty:
+        if not isinstance(obj, WorkItem):
+            continue
+        state = inspect(obj)
+        if not any(
+            state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES
+        ):
+            continue
+        _contribute(
+            deltas,
+            {name: _previous_value(obj, name) for name in TRACKED_ATTRIBUTES},
+            -1,
+        )
+        _contribute(
+            deltas, {name: getattr(obj, name) for name in TRACKED_ATTRIBUTES}, 1
+        )
+
+    return {key: delta for key, delta in deltas.items() if delta != [0, 0]}
+
+
+def _refresh_percentages(connection, scope: str, scope_ids: Iterable[str]):
+    # Raw UPDATE so the derived value doesn't bump updated_date
+    scope_ids = sorted(scope_ids)
+    placeholders = ", ".join("?" for _ in scope_ids)
+    connection.exec_driver_sql(
+        f"UPDATE {scope} SET progress_percentage = ("
+        f"SELECT {PERCENTAGE_SQL} FROM progress_rollups "
+        f"WHERE scope = '{scope}' AND scope_id = {scope}.id) "
+        f"WHERE id IN ({placeholders})",
+        tuple(scope_ids),
+    )
+
+
+def apply_progress_deltas(connection, deltas: Dict[ScopeKey, List[int]]):
+    """Upsert rollup deltas and refresh the affected progress_percentage
+    values in the caller's transaction."""
+    if not deltas:
+        return
+    table = ProgressRollup.__table__
+    statement = sqlite_insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.scope, table.c.scope_id],
+        set_={
+            "total_weight": table.c.total_weight + statement.excluded.total_weight,
+            "done_weight": table.c.done_weight + statement.excluded.done_weight,
+        },
+    )
+    connection.execute(
+        statement,
+        [
+            {
+                "scope": scope,
+                "scope_id": scope_id,
+                "total_weight": total,
+                "done_weight": done,
+            }
+            for (scope, scope_id), (total, done) in deltas.items()
+        ],
+    )
+    for scope in SCOPES:
+        scope_ids = {scope_id for name, scope_id in deltas if name == scope}
+        if scope_ids:
+            _refresh_percentages(connection, scope, scope_ids)
+
+
+def _sync_loaded_instances(session: Session, keys: Iterable[ScopeKey]):
+    """Copy refreshed percentages onto Project/Milestone objects already in
+    the session, without marking them dirty."""
+    connection = session.connection()
+    for scope, scope_id in keys:
+        model = SCOPES[scope][0]
+        obj = session.identity_map.get(
+            inspect(model).identity_key_from_primary_key((scope_id,))
+        )
+        if obj is None:
+            continue
+        percentage = connection.exec_driver_sql(
+            f"SELECT progress_percentage FROM {scope} WHERE id = ?", (scope_id,)
+        ).scalar()
+        set_committed_value(obj, "progress_percentage", percentage)
+
+
+def _after_flush(session: Session, flush_context):
+    deltas = _collect_deltas(session)
+    if deltas:
+        apply_progress_deltas(session.connection(), deltas)
+        _sync_loaded_instances(session, deltas)
+
+
+def setup_progress_rollups(session_factory: sessionmaker = SessionLocal):
+    """Register the flush listener that keeps progress_rollups and the
+    progress_percentage columns current.
+
+    Bulk ``Query.update()``/``delete()`` and raw SQL bypass flush events; run
+    ``rebuild_progress`` after those.
+    """
+    for name in TRACKED_ATTRIBUTES:
+        attribute = getattr(WorkItem, name)
+        if not event.contains(attribute, "set", _force_active_history):
+            event.listen(attribute, "set", _force_active_history, active_history=True)
+
+    if not event.contains(session_factory, "after_flush", _after_flush):
+        event.listen(session_factory, "after_flush", _after_flush)
+
+
+def _recount_selects() -> List[str]:
+    return [
+        f"SELECT '{scope}', {column}, SUM({WEIGHT_SQL}), "
+        f"SUM(CASE WHEN status = '{DONE_STATUS}' THEN {WEIGHT_SQL} ELSE 0 END) "
+        f"FROM work_items WHERE {column} IS NOT NULL AND {column} != '' "
+        f"GROUP BY {column}"
+        for scope, (_, column) in SCOPES.items()
+    ]
+
+
+def rebuild_statements() -> List[str]:
+    """Plain SQL that rebuilds the rollups and every derived percentage.
+
+    Projects and milestones without work items keep their stored value.
+    """
+    statements = ["DELETE FROM progress_rollups"] + [
+        f"INSERT INTO progress_rollups (scope, scope_id, total_weight, done_weight) "
+        f"{select_sql}"
+        for select_sql in _recount_selects()
+    ]
+    for scope in SCOPES:
+        statements.append(
+            f"UPDATE {scope} SET progress_percentage = ("
+            f"SELECT {PERCENTAGE_SQL} FROM progress_rollups "
+            f"WHERE scope = '{scope}' AND scope_id = {scope}.id) "
+            f"WHERE id IN (SELECT scope_id FROM progress_rollups "
+            f"WHERE scope = '{scope}')"
+        )
+    return statements
+
+
+def rebuild_progress(session: Session):
+    """Recompute all rollups from work_items (backfills, reconciliation)."""
+    connection = session.connection()
+    for statement in rebuild_statements():
+        connection.exec_driver_sql(statement)
+    # Loaded objects still hold the old percentages
+    session.expire_all()
+
+
+def get_progress(session: Session, scope: str, scope_id: str) -> Dict[str, float]:
+    """Progress of one project/milestone from its rollup row."""
+    rollup = session.get(ProgressRollup, (scope, scope_id))
+    total = rollup.total_weight if rollup else 0
+    done = rollup.done_weight if rollup else 0
+    return {
+        "total_hours": total / 100,
+        "done_hours": done / 100,
+        "percentage": _sqlite_round(100.0 * done / total) if total else 0,
+    }
+
+
+def verify_progress(session: Session) -> Dict[ScopeKey, Tuple[Tuple, Tuple]]:
+    """Compare stored rollups with a fresh recount.
+
+    Returns {(scope, scope_id): ((total, done) stored, (total, done) actual)}
+    for mismatches.
+    """
+    stored = {
+        (scope, scope_id): (total, done)
+        for scope, scope_id, total, done in session.execute(
+            select(
+                ProgressRollup.scope,
+                ProgressRollup.scope_id,
+                ProgressRollup.total_weight,
+                ProgressRollup.done_weight,
+            )
+        )
+        if total or done
+    }
+    actual = {}
+    connection = session.connection()
+    for select_sql in _recount_selects():
+        for scope, scope_id, total, done in connection.exec_driver_sql(select_sql):
+            actual[(scope, scope_id)] = (total, done)
+
+    return {
+        key: (stored.get(key, (0, 0)), actual.get(key, (0, 0)))
+        for key in set(stored) | set(actual)
+        if stored.get(key, (0, 0)) != actual.get(key, (0, 0))
+    }
+
+
+def main():
+    """Rebuild or verify the progress rollups"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Progress rollup maintenance")
+    parser.add_argument(
+        "--verify", action="store_true", help="Only report drift, don't rebuild"
+    )
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.verify:
+            drift = verify_progress(session)
+            if not drift:
+                print("✅ Progress rollups are consistent")
+            for (scope, scope_id), (stored, actual) in sorted(drift.items()):
+                print(f"⚠️  {scope}.{scope_id}: stored {stored}, actual {actual}")
+        else:
+            rebuild_progress(session)
+            session.commit()
+            print("✅ Progress rollups rebuilt")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,14 @@ import json
 import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from sqlalchemy import func
 from github import Github, GithubException
 from github.Repository import Repository
 
+from ai_lab_framework.github_http_cache import install_http_cache
 from infrastructure.db.database import SessionLocal
 from infrastructure.db.models.models import Project, WorkItem, Idea
+from infrastructure.db.reports import load_project_reports
 
 
 class ProjectRepositoryManager:
@@ -21,16 +24,15 @@ class ProjectRepositoryManager:
 
     def __init__(self, github_token: str, github_org: Optional[str] = None):
         self.github = Github(github_token)
+        install_http_cache(self.github)  # Unchanged reads come back as 304s
         self.github_org = github_org  # If None, creates under user account
         self.session = SessionLocal()
 
     def create_repository_from_project(self, project_id: str) -> Optional[Repository]:
         """Create GitHub repository from local project"""
         try:
-            # Get project from database
-            project = (
-                self.session.query(Project).filter(Project.id == project_id).first()
-            )
+            # Get project from database (or the identity map, if already loaded)
+            project = self.session.get(Project, project_id)
             if not project:
                 print(f"❌ Project {project_id} not found")
                 return None
@@ -440,11 +442,8 @@ Thumbs.db
         try:
             print("📋 Syncing work items to repository issues...")
 
-            work_items = (
-                self.session.query(WorkItem)
-                .filter(WorkItem.project_id == project.id)
-                .all()
-            )
+            # Already loaded when called from sync_all_projects_to_repositories
+            work_items = list(project.work_items)
 
             for work_item in work_items:
                 # Create issue for work item
@@ -541,34 +540,51 @@ Thumbs.db
         """Sync all local projects to GitHub repositories"""
         results = {"created": 0, "updated": 0, "errors": 0}
 
-        projects = self.session.query(Project).all()
+        # Projects and all their work items in two queries, instead of one
+        # work item query per project
+        projects = load_project_reports(self.session, include=("work_items",))
         print(f"📦 Found {len(projects)} projects to process")
 
-        for project in projects:
-            try:
-                if not project.repository_url:
-                    # Create new repository
-                    repo = self.create_repository_from_project(project.id)
-                    if repo:
-                        results["created"] += 1
+        # Each repository is committed as soon as it exists; keep the other
+        # projects' loaded work items from expiring (and lazy-reloading) on it
+        expire_on_commit = self.session.expire_on_commit
+        self.session.expire_on_commit = False
+        try:
+            for project in projects:
+                try:
+                    if not project.repository_url:
+                        # Create new repository
+                        repo = self.create_repository_from_project(project.id)
+                        if repo:
+                            results["created"] += 1
+                        else:
+                            results["errors"] += 1
                     else:
-                        results["errors"] += 1
-                else:
-                    # Update existing repository
-                    print(
-                        f"📝 Project {project.name} already has repository: {project.repository_url}"
-                    )
-                    results["updated"] += 1
-
-            except Exception as e:
-                print(f"❌ Error processing project {project.id}: {e}")
-                results["errors"] += 1
+                        # Update existing repository
+                        print(
+                            f"📝 Project {project.name} already has repository: {project.repository_url}"
+                        )
+                        results["updated"] += 1
+
+                except Exception as e:
+                    print(f"❌ Error processing project {project.id}: {e}")
+                    results["errors"] += 1
+        finally:
+            self.session.expire_on_commit = expire_on_commit
 
         return results
 
     def get_project_status(self) -> Dict[str, Any]:
         """Get status of all projects and their repository sync"""
-        projects = self.session.query(Project).all()
+        # Plain rows and one GROUP BY instead of loading every project's items
+        projects = self.session.query(
+            Project.id, Project.name, Project.status, Project.repository_url
+        ).all()
+        work_item_counts = dict(
+            self.session.query(WorkItem.project_id, func.count())
+            .filter(WorkItem.project_id.isnot(None))
+            .group_by(WorkItem.project_id)
+        )
 
         status = {
             "total_projects": len(projects),
@@ -584,9 +600,7 @@ Thumbs.db
                 "status": project.status,
                 "has_repository": bool(project.repository_url),
                 "repository_url": project.repository_url,
-                "work_items_count": len(project.work_items)
-                if project.work_items
-                else 0,
+                "work_items_count": work_item_counts.get(project.id, 0),
             }
 
             status["projects"].append(project_info)
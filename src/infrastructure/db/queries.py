@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Hot Query Registry
+Central list of performance-critical queries and their query-plan checks
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from sqlalchemy import event
+
+
+class HotQuery(NamedTuple):
+    sql: str
+    params: Tuple = ()
+
+
+# Queries issued on every dashboard render or sync run. Each one must be
+# answered from an index (see migrations.MIGRATIONS); tests/db checks this.
+HOT_QUERIES: Dict[str, HotQuery] = {
+    "work_items_total": HotQuery("SELECT COUNT(*) FROM work_items"),
+    "work_items_by_status": HotQuery(
+        "SELECT status, COUNT(*) FROM work_items GROUP BY status"
+    ),
+    "work_items_by_priority": HotQuery(
+        "SELECT priority, COUNT(*) FROM work_items GROUP BY priority"
+    ),
+    "work_items_done_count": HotQuery(
+        "SELECT COUNT(*) FROM work_items WHERE status = 'done'"
+    ),
+    "work_items_recent": HotQuery("""
+        SELECT id, title, status, priority, created_date, updated_date
+        FROM work_items
+        ORDER BY created_date DESC
+        LIMIT 10
+        """),
+    "work_items_completion_trend": HotQuery(
+        """
+        SELECT DATE(updated_date) as date, COUNT(*) as count
+        FROM work_items
+        WHERE status = 'done' AND updated_date > ?
+        GROUP BY DATE(updated_date)
+        ORDER BY date
+        """,
+        ("1970-01-01T00:00:00",),
+    ),
+    "work_items_unsynced": HotQuery(
+        "SELECT * FROM work_items WHERE github_issue_id IS NULL"
+    ),
+    "work_items_active_by_status": HotQuery(
+        "SELECT * FROM work_items WHERE archived = 0 AND status = ?",
+        ("todo",),
+    ),
+    "work_items_active_recently_updated": HotQuery("""
+        SELECT id, title, status, updated_date
+        FROM work_items
+        WHERE archived = 0
+        ORDER BY updated_date DESC
+        LIMIT 20
+        """),
+    "work_items_by_project": HotQuery(
+        "SELECT * FROM work_items WHERE project_id = ?", ("PRJ-001",)
+    ),
+    "ideas_total": HotQuery("SELECT COUNT(*) FROM ideas"),
+    "ideas_by_category": HotQuery(
+        "SELECT category, COUNT(*) FROM ideas GROUP BY category"
+    ),
+    "ideas_by_status": HotQuery("SELECT status, COUNT(*) FROM ideas GROUP BY status"),
+    "ideas_recent": HotQuery("""
+        SELECT id, title, category, status, created_date
+        FROM ideas
+        ORDER BY created_date DESC
+        LIMIT 10
+        """),
+    "ideas_unsynced": HotQuery("SELECT * FROM ideas WHERE github_issue_id IS NULL"),
+    "aggregate_rollup": HotQuery(
+        """
+        SELECT value, count
+        FROM aggregate_counters
+        WHERE entity = ? AND dimension = ? AND count > 0
+        """,
+        ("work_items", "status"),
+    ),
+    # tags.filter_by_tags() / tags.tag_facets()
+    "work_items_tagged_all": HotQuery(
+        """
+        SELECT item_id FROM item_tags
+        WHERE entity = ? AND field = ? AND tag IN (?, ?)
+        GROUP BY item_id HAVING COUNT(tag) = 2
+        """,
+        ("work_items", "labels", "backend", "urgent"),
+    ),
+    "work_items_tag_facets": HotQuery(
+        """
+        SELECT tag, COUNT(*) FROM item_tags
+        WHERE entity = ? AND field = ?
+        GROUP BY tag
+        """,
+        ("work_items", "labels"),
+    ),
+    # pagination.paginate(): next page on (created_date, id) / (updated_date, id)
+    "work_items_keyset_created": HotQuery(
+        """
+        SELECT * FROM work_items
+        WHERE (created_date, id) > (?, ?)
+        ORDER BY created_date, id
+        LIMIT 101
+        """,
+        ("2025-01-01 00:00:00.000000", "FRM-001"),
+    ),
+    "work_items_keyset_updated_desc": HotQuery(
+        """
+        SELECT id, title, status, updated_date FROM work_items
+        WHERE (updated_date, id) < (?, ?)
+        ORDER BY updated_date DESC, id DESC
+        LIMIT 101
+        """,
+        ("2025-01-01 00:00:00.000000", "FRM-001"),
+    ),
+    "work_items_unsynced_keyset": HotQuery(
+        """
+        SELECT * FROM work_items
+        WHERE github_issue_id IS NULL AND (created_date, id) > (?, ?)
+        ORDER BY created_date, id
+        LIMIT 101
+        """,
+        ("2025-01-01 00:00:00.000000", "FRM-001"),
+    ),
+    "ideas_keyset_created": HotQuery(
+        """
+        SELECT * FROM ideas
+        WHERE (created_date, id) > (?, ?)
+        ORDER BY created_date, id
+        LIMIT 101
+        """,
+        ("2025-01-01 00:00:00.000000", "IDEA-001"),
+    ),
+    # custom_fields.pivot(): range filter on one field's typed column
+    "custom_field_number_range": HotQuery(
+        """
+        SELECT w.id, w.title, cf.value_number
+        FROM custom_field_values cf JOIN work_items w ON w.id = cf.work_item_id
+        WHERE cf.field_id = ? AND cf.value_number >= ?
+        ORDER BY cf.value_number
+        LIMIT 50
+        """,
+        ("FIELD-estimate", 3),
+    ),
+    # change_log.read_changes(): consumers fetch only the delta
+    "change_log_since": HotQuery(
+        "SELECT * FROM change_log WHERE seq > ? ORDER BY seq LIMIT 500", (0,)
+    ),
+    "change_log_entity_since": HotQuery(
+        """
+        SELECT * FROM change_log
+        WHERE entity = ? AND seq > ?
+        ORDER BY seq
+        LIMIT 500
+        """,
+        ("work_items", 0),
+    ),
+    # search.search(): rank must come from FTS5 itself, not a temp sort
+    "search_work_items": HotQuery(
+        """
+        SELECT b.id, b.title, work_items_fts.rank
+        FROM work_items_fts JOIN work_items b ON b.rowid = work_items_fts.rowid
+        WHERE work_items_fts MATCH ?
+        ORDER BY work_items_fts.rank
+        LIMIT 20
+        """,
+        ('"sync"*',),
+    ),
+}
+
+# A bare "SCAN <table>" (no index) or a temp b-tree for (part of) an ORDER BY
+# means the query degraded to a full table scan / sort.
+_FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+_TEMP_SORT = re.compile(
+    r"^USE TEMP B-TREE FOR (?:RIGHT PART OF |LAST TERM OF )?ORDER BY"
+)
+
+
+def explain_query_plan(connection, sql: str, params: Tuple = ()) -> List[str]:
+    """Return the detail column of EXPLAIN QUERY PLAN for a DB-API connection."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def find_plan_regressions(plan: List[str]) -> List[str]:
+    """Return the plan steps that indicate a full scan or an unindexed sort."""
+    return [
+        step
+        for step in plan
+        if _FULL_SCAN.match(step.strip()) or _TEMP_SORT.match(step.strip())
+    ]
+
+
+def check_hot_queries(connection) -> Dict[str, List[str]]:
+    """Check every registered query; returns {name: regressions} for failures."""
+    failures = {}
+    for name, query in HOT_QUERIES.items():
+        regressions = find_plan_regressions(
+            explain_query_plan(connection, query.sql, query.params)
+        )
+        if regressions:
+            failures[name] = regressions
+    return failures
+
+
+class QueryCount:
+    """Statements executed inside a ``count_queries`` block."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(bind) -> Iterator[QueryCount]:
+    """Record every statement sent through ``bind`` (an Engine, Connection
+    or Session) while the block runs."""
+    if hasattr(bind, "get_bind"):
+        bind = bind.get_bind()
+    engine = getattr(bind, "engine", bind)
+    counter = QueryCount()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def assert_max_queries(bind, limit: int) -> Iterator[QueryCount]:
+    """Fail if the block issues more than ``limit`` statements, e.g. an N+1
+    lazy load in a loop::
+
+        with assert_max_queries(session, 4):
+            reports = project_reports(session)
+    """
+    with count_queries(bind) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(
+            f"  {n}. {' '.join(sql.split())[:200]}"
+            for n, sql in enumerate(counter.statements, 1)
+        )
+        raise AssertionError(
+            f"Expected at most {limit} queries, got {counter.count}:\n{listing}"
+        )
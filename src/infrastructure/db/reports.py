@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Project Reports
+Loads projects together with their work items, milestones and custom fields
+in a fixed number of queries, and summarizes them
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, selectinload
+
+from .database import SessionLocal
+from .models.models import Project
+
+REPORT_RELATIONSHIPS = ("work_items", "milestones", "custom_fields")
+
+
+def report_options(include: Sequence[str] = REPORT_RELATIONSHIPS) -> List:
+    """selectinload() options for the given Project relationships."""
+    relationships = inspect(Project).relationships
+    options = []
+    for name in include:
+        if name not in relationships:
+            raise ValueError(f"Unknown Project relationship: {name!r}")
+        options.append(selectinload(getattr(Project, name)))
+    return options
+
+
+def load_project_reports(
+    session: Session,
+    project_ids: Optional[Iterable[str]] = None,
+    include: Sequence[str] = REPORT_RELATIONSHIPS,
+) -> List[Project]:
+    """Projects (all, or ``project_ids``) with ``include`` already loaded.
+
+    One query for the projects plus one per relationship, however many
+    projects there are (selectinload batches its IN lists of 500 ids), so
+    touching ``project.work_items`` etc. afterwards never hits the database.
+    """
+    query = select(Project).options(*report_options(include)).order_by(Project.id)
+    if project_ids is not None:
+        query = query.where(Project.id.in_(list(project_ids)))
+    return list(session.scalars(query))
+
+
+def project_report(project: Project) -> Dict[str, Any]:
+    """Summary of one project loaded with ``load_project_reports``."""
+    work_items = project.work_items
+    per_milestone = Counter(item.milestone_id for item in work_items)
+    return {
+        "id": project.id,
+        "name": project.name,
+        "status": project.status,
+        "progress_percentage": project.progress_percentage or 0,
+        "repository_url": project.repository_url,
+        "work_items_count": len(work_items),
+        "work_items_by_status": dict(Counter(item.status for item in work_items)),
+        "estimated_hours": round(
+            sum(item.estimated_hours or 0 for item in work_items), 2
+        ),
+        "actual_hours": round(sum(item.actual_hours or 0 for item in work_items), 2),
+        "milestones": [
+            {
+                "id": milestone.id,
+                "title": milestone.title,
+                "status": milestone.status,
+                "due_date": milestone.due_date,
+                "work_items_count": per_milestone.get(milestone.id, 0),
+            }
+            for milestone in sorted(
+                project.milestones, key=lambda m: (m.due_date is None, m.due_date)
+            )
+        ],
+        "custom_fields": sorted(field.name for field in project.custom_fields),
+    }
+
+
+def project_reports(
+    session: Session, project_ids: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    """``project_report`` for every (or each of ``project_ids``) project."""
+    return [
+        project_report(project)
+        for project in load_project_reports(session, project_ids)
+    ]
+
+
+def main():
+    """Print a report of all projects"""
+    session = SessionLocal()
+    try:
+        reports = project_reports(session)
+    finally:
+        session.close()
+
+    print(f"📊 {len(reports)} projects")
+    for report in reports:
+        done = report["work_items_by_status"].get("done", 0)
+        print(
+            f"  {report['id']:<12} {report['progress_percentage']:>3}%  "
+            f"{done}/{report['work_items_count']} done, "
+            f"{len(report['milestones'])} milestones  {report['name']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Full-Text Search
+FTS5 indexes over ideas, work items and projects with bm25-ranked search
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+
+
+class SearchSpec(NamedTuple):
+    table: str
+    title_column: str
+    columns: Tuple[str, ...]  # Indexed columns; the title column comes first
+    weights: Tuple[float, ...]  # bm25 weight per column
+
+
+# External-content FTS5 tables: the text lives only in the base table, the
+# index is keyed on the base table's rowid and kept current by triggers.
+SEARCH_SPECS: Dict[str, SearchSpec] = {
+    "ideas": SearchSpec(
+        "ideas", "title", ("title", "description", "notes", "tags"), (10, 1, 1, 4)
+    ),
+    "work_items": SearchSpec(
+        "work_items",
+        "title",
+        ("title", "description", "notes", "labels"),
+        (10, 1, 1, 4),
+    ),
+    "projects": SearchSpec(
+        "projects",
+        "name",
+        ("name", "description", "vision", "notes", "tags"),
+        (10, 1, 1, 1, 4),
+    ),
+}
+
+HIGHLIGHT = ("<mark>", "</mark>")
+SNIPPET_TOKENS = 12
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchHit(NamedTuple):
+    entity: str
+    id: str
+    title: str
+    snippet: str
+    rank: float  # bm25; lower is better
+
+
+def fts_table(entity: str) -> str:
+    return f"{entity}_fts"
+
+
+def schema_statements() -> List[str]:
+    """CREATE statements for every FTS table and its sync triggers."""
+    statements = []
+    for entity, spec in SEARCH_SPECS.items():
+        fts = fts_table(entity)
+        columns = ", ".join(spec.columns)
+        weights = ", ".join(str(float(weight)) for weight in spec.weights)
+        new_values = ", ".join(f"new.{column}" for column in spec.columns)
+        old_values = ", ".join(f"old.{column}" for column in spec.columns)
+        statements += [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{columns}, content='{spec.table}', content_rowid='rowid', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+            # Persist the column weights as the table's rank function so that
+            # ORDER BY rank is handled inside FTS5 (no temp sort, and snippets
+            # are only built for the rows that survive the LIMIT)
+            f"INSERT INTO {fts}({fts}, rank) VALUES ('rank', 'bm25({weights})')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {spec.table} "
+            f"BEGIN INSERT INTO {fts}(rowid, {columns}) "
+            f"VALUES (new.rowid, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {spec.table} "
+            f"BEGIN INSERT INTO {fts}({fts}, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old_values}); END",
+            # Only fires when an indexed column changes, not on status updates
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} "
+            f"ON {spec.table} "
+            f"BEGIN INSERT INTO {fts}({fts}, rowid, {columns}) "
+            f"VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {columns}) "
+            f"VALUES (new.rowid, {new_values}); END",
+        ]
+    return statements
+
+
+def rebuild_statements() -> List[str]:
+    """Re-index every FTS table from its base table."""
+    return [
+        f"INSERT INTO {fts_table(entity)}({fts_table(entity)}) VALUES ('rebuild')"
+        for entity in SEARCH_SPECS
+    ]
+
+
+def drop_statements() -> List[str]:
+    return [f"DROP TABLE IF EXISTS {fts_table(entity)}" for entity in SEARCH_SPECS]
+
+
+def build_match_query(query: str, prefix: bool = True) -> str:
+    """Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 operators in user input are inert) and all
+    words must match; with ``prefix`` the last word also matches as a prefix,
+    which gives search-as-you-type behaviour.
+    """
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return ""
+    terms = [f'"{token}"' for token in tokens]
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search(
+    session: Session,
+    query: str,
+    entities: Optional[Iterable[str]] = None,
+    limit: int = 20,
+    prefix: bool = True,
+    highlight: Tuple[str, str] = HIGHLIGHT,
+) -> List[SearchHit]:
+    """Ranked search over ideas, work items and projects.
+
+    Results from all requested entities are merged by bm25 rank.
+    """
+    match = build_match_query(query, prefix)
+    if not match:
+        return []
+
+    hits: List[SearchHit] = []
+    for entity in entities or SEARCH_SPECS:
+        spec = SEARCH_SPECS[entity]
+        fts = fts_table(entity)
+        rows = session.execute(
+            text(
+                f"SELECT b.id, b.{spec.title_column}, "
+                f"snippet({fts}, -1, :open, :close, '…', {SNIPPET_TOKENS}), "
+                f"{fts}.rank "
+                f"FROM {fts} JOIN {spec.table} b ON b.rowid = {fts}.rowid "
+                f"WHERE {fts} MATCH :match "
+                f"ORDER BY {fts}.rank LIMIT :limit"
+            ),
+            {
+                "match": match,
+                "open": highlight[0],
+                "close": highlight[1],
+                "limit": limit,
+            },
+        )
+        hits.extend(
+            SearchHit(entity, item_id, title, snippet, rank)
+            for item_id, title, snippet, rank in rows
+        )
+
+    hits.sort(key=lambda hit: hit.rank)
+    return hits[:limit]
+
+
+def rebuild_search_index(session: Session):
+    """Re-index all FTS tables (after bulk loads that bypassed the triggers,
+    or after a VACUUM, which may renumber the rowids the index is keyed on)."""
+    connection = session.connection()
+    for statement in rebuild_statements():
+        connection.exec_driver_sql(statement)
+
+
+def check_search_index(session: Session) -> Dict[str, str]:
+    """Run FTS5 integrity checks; returns {entity: error} for broken indexes."""
+    connection = session.connection()
+    failures = {}
+    for entity in SEARCH_SPECS:
+        fts = fts_table(entity)
+        try:
+            connection.exec_driver_sql(
+                f"INSERT INTO {fts}({fts}, rank) VALUES ('integrity-check', 1)"
+            )
+        except Exception as e:
+            failures[entity] = str(e)
+    return failures
+
+
+def main():
+    """Search, rebuild or check the full-text index"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Full-text search maintenance")
+    parser.add_argument("query", nargs="?", help="Search for this text")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index")
+    parser.add_argument(
+        "--check", action="store_true", help="Verify the index against its tables"
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.rebuild:
+            rebuild_search_index(session)
+            session.commit()
+            print("✅ Search index rebuilt")
+        if args.check:
+            failures = check_search_index(session)
+            if not failures:
+                print("✅ Search index is consistent")
+            for entity, error in sorted(failures.items()):
+                print(f"⚠️  {entity}: {error}")
+        if args.query:
+            for hit in search(session, args.query, limit=args.limit):
+                print(f"{hit.rank:8.2f}  {hit.entity:<10} {hit.id:<16} {hit.title}")
+                print(f"          {hit.snippet}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
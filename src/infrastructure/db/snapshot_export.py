@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Snapshot Export
+Streams ai_lab.db tables into Arrow record batches and writes Parquet files
+for offline analytics (requires pyarrow: pip install "ai-lab-framework[analytics]")
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    select,
+    type_coerce,
+)
+from sqlalchemy.engine import Engine
+
+from .database import SQLALCHEMY_DATABASE_URL, create_db_engine
+from .models.models import CustomFieldValue, Idea, Milestone, Project, WorkItem
+
+SNAPSHOT_TABLES = (
+    "ideas",
+    "work_items",
+    "projects",
+    "milestones",
+    "custom_field_values",
+)
+
+# Low-cardinality columns stored as Arrow dictionaries (categoricals)
+DICTIONARY_COLUMNS = {
+    "status",
+    "priority",
+    "type",
+    "category",
+    "issue_type",
+    "health_status",
+    "visibility",
+}
+
+CHUNK_SIZE = 10000
+
+_TABLES = {
+    model.__table__.name: model.__table__
+    for model in (Idea, WorkItem, Project, Milestone, CustomFieldValue)
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Snapshot export needs pyarrow: "
+            'pip install "ai-lab-framework[analytics]" (or pip install pyarrow)'
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+def arrow_schema(table):
+    """Arrow schema for a SQLAlchemy Table (JSON columns become JSON text)."""
+    pa, _ = _require_pyarrow()
+    fields = []
+    for column in table.columns:
+        if column.name in DICTIONARY_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        elif isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:
+            arrow_type = pa.string()
+        # Always nullable: rows written outside the ORM may violate NOT NULL
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+@lru_cache(maxsize=65536)
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Lenient DATETIME parsing: rows written outside the ORM may hold ISO
+    strings with 'T'/'Z' or empty strings."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _select_columns(table):
+    # DATETIME columns are read as text and parsed by _parse_timestamp; JSON
+    # columns are exported as their stored JSON text without a decode round trip
+    return [
+        (
+            type_coerce(column, String).label(column.name)
+            if isinstance(column.type, (DateTime, JSON))
+            else column
+        )
+        for column in table.columns
+    ]
+
+
+def _record_batch(table, schema, rows: Sequence):
+    pa, _ = _require_pyarrow()
+    arrays = []
+    for position, column in enumerate(table.columns):
+        values = [row[position] for row in rows]
+        if isinstance(column.type, DateTime):
+            values = [_parse_timestamp(value) for value in values]
+        field = schema.field(column.name)
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def export_snapshot(
+    output_dir: Path,
+    bind: Optional[Engine] = None,
+    tables: Sequence[str] = SNAPSHOT_TABLES,
+    chunk_size: int = CHUNK_SIZE,
+    compression: str = "zstd",
+) -> Dict[str, Any]:
+    """Write one Parquet file per table into ``output_dir``.
+
+    All tables are read inside a single read transaction on a read-only
+    connection: the files form one consistent snapshot and, in WAL mode,
+    writers are never blocked while the export runs.
+    """
+    _, pq = _require_pyarrow()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    own_engine = bind is None
+    bind = bind or create_db_engine(SQLALCHEMY_DATABASE_URL, read_only=True)
+    start = time.perf_counter()
+    stats: Dict[str, Any] = {"tables": {}, "output_dir": str(output_dir)}
+
+    try:
+        with bind.connect() as connection:
+            with connection.begin():
+                # pysqlite only emits BEGIN before writes, so each SELECT
+                # would otherwise be its own transaction and see commits
+                # made between tables; this pins one snapshot for the export
+                connection.exec_driver_sql("BEGIN")
+                for name in tables:
+                    table = _TABLES[name]
+                    schema = arrow_schema(table)
+                    path = output_dir / f"{name}.parquet"
+                    rows = 0
+                    result = connection.execution_options(yield_per=chunk_size).execute(
+                        select(*_select_columns(table))
+                    )
+                    with pq.ParquetWriter(
+                        path, schema, compression=compression
+                    ) as writer:
+                        for chunk in result.partitions(chunk_size):
+                            writer.write_batch(_record_batch(table, schema, chunk))
+                            rows += len(chunk)
+                    stats["tables"][name] = {"rows": rows, "file": path.name}
+    finally:
+        if own_engine:
+            bind.dispose()
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["created"] = datetime.utcnow().isoformat()
+    (output_dir / "snapshot.json").write_text(json.dumps(stats, indent=2))
+    return stats
+
+
+def main():
+    """Export a Parquet snapshot of the database"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a Parquet snapshot")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/snapshots") / datetime.now().strftime("%Y%m%d-%H%M%S"),
+        help="Output directory",
+    )
+    parser.add_argument(
+        "--tables", nargs="+", default=list(SNAPSHOT_TABLES), help="Tables to export"
+    )
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    stats = export_snapshot(args.output, tables=args.tables, chunk_size=args.chunk_size)
+    for name, table_stats in stats["tables"].items():
+        print(f"✅ {name}: {table_stats['rows']} rows -> {table_stats['file']}")
+    print(f"📊 Snapshot written to {stats['output_dir']} in {stats['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
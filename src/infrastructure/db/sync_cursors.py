@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - GitHub Sync Cursors
+Per-repository high-water marks for incremental syncs from GitHub
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models.models import GitHubSyncCursor
+
+
+def _utc(moment: datetime) -> datetime:
+    """Naive UTC, as stored (GitHub timestamps are timezone-aware)."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+def get_sync_cursor(session: Session, repo: str) -> Optional[datetime]:
+    """``since`` for the next sync of ``repo`` (naive UTC), None before the first."""
+    return session.scalar(
+        select(GitHubSyncCursor.since).where(GitHubSyncCursor.repo == repo)
+    )
+
+
+def advance_sync_cursor(session: Session, repo: str, since: datetime):
+    """Move ``repo``'s cursor to ``since``; never backwards. The caller commits."""
+    table = GitHubSyncCursor.__table__
+    statement = sqlite_insert(table).values(
+        repo=repo, since=_utc(since), updated_at=datetime.utcnow()
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.repo],
+        set_={
+            "since": func.max(table.c.since, statement.excluded.since),
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+    session.execute(statement)
+
+
+def reset_sync_cursor(session: Session, repo: str) -> bool:
+    """Forget ``repo``'s cursor so the next sync reads every issue."""
+    result = session.execute(
+        delete(GitHubSyncCursor).where(GitHubSyncCursor.repo == repo)
+    )
+    return result.rowcount > 0
+
+
+def sync_cursors(session: Session) -> Dict[str, datetime]:
+    return dict(session.execute(select(GitHubSyncCursor.repo, GitHubSyncCursor.since)))
+
+
+def main():
+    """List or reset sync cursors"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="GitHub sync cursors")
+    parser.add_argument("--reset", metavar="REPO", help="Forget the cursor of REPO")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.reset:
+            if reset_sync_cursor(session, args.reset):
+                session.commit()
+                print(f"🗑️  Reset sync cursor of {args.reset}")
+            else:
+                print(f"⚠️  No sync cursor for {args.reset}")
+        for repo, since in sorted(sync_cursors(session).items()):
+            print(f"  {repo:<40} since {since.isoformat()}Z")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
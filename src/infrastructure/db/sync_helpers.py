@@ -103,11 +103,12 @@ def sync_work_item(
 ):
     """Convenience function to sync work item changes"""
     from infrastructure.db.database import SessionLocal
+    from infrastructure.db.identity_cache import cached_get
     from infrastructure.db.models.models import WorkItem
 
     session = SessionLocal()
     try:
-        work_item = session.query(WorkItem).filter(WorkItem.id == work_item_id).first()
+        work_item = cached_get(session, WorkItem, work_item_id)
         if not work_item:
             return False
 
@@ -138,11 +139,12 @@ def sync_idea(
 ):
     """Convenience function to sync idea changes"""
     from infrastructure.db.database import SessionLocal
+    from infrastructure.db.identity_cache import cached_get
     from infrastructure.db.models.models import Idea
 
     session = SessionLocal()
     try:
-        idea = session.query(Idea).filter(Idea.id == idea_id).first()
+        idea = cached_get(session, Idea, idea_id)
         if not idea:
             return False
 
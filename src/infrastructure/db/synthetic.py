@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Synthetic Data
+Deterministic generator that fills a database with realistic ideas, projects,
+milestones, work items and custom field values for scaling benchmarks
+"""
+
+import bisect
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from typing import Any, Dict, Iterator, List, NamedTuple, Sequence, Union
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from .models.models import (
+    CustomField,
+    CustomFieldValue,
+    Idea,
+    Milestone,
+    Project,
+    WorkItem,
+)
+
+# Named scales: number of work items; everything else is derived from it
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+DEFAULT_SEED = 42
+BATCH_SIZE = 5000
+
+# Newest timestamp in a dataset; fixed so runs are reproducible
+EPOCH = datetime(2025, 11, 1)
+HISTORY_DAYS = 730
+
+WORK_ITEMS_PER_PROJECT = 200  # On average; sizes follow a Zipf distribution
+IDEAS_PER_WORK_ITEM = 0.25
+SYNCED_SHARE = 0.7  # Items that already have a GitHub issue
+
+PRIORITIES = (("low", 25), ("medium", 45), ("high", 22), ("critical", 8))
+WORK_ITEM_TYPES = (
+    ("task", 40),
+    ("feature", 25),
+    ("bug", 20),
+    ("research", 5),
+    ("documentation", 6),
+    ("infrastructure", 4),
+)
+CATEGORIES = (
+    ("development", 35),
+    ("infrastructure", 20),
+    ("automation", 20),
+    ("research", 15),
+    ("optimization", 10),
+)
+IDEA_STATUSES = (
+    ("backlog", 45),
+    ("refining", 20),
+    ("ready", 15),
+    ("implemented", 12),
+    ("archived", 8),
+)
+PROJECT_STATUSES = (
+    ("planning", 15),
+    ("active", 50),
+    ("on_hold", 10),
+    ("completed", 20),
+    ("archived", 5),
+)
+OPEN_STATUSES = (("todo", 50), ("in_progress", 25), ("review", 12), ("blocked", 13))
+
+LABELS = (
+    "backend frontend api database sync github dashboard cli performance "
+    "security testing docs refactor ux mobile auth search import export "
+    "automation monitoring ci release migration cache config logging "
+    "accessibility i18n analytics onboarding billing notifications storage "
+    "networking deployment scheduler webhooks reporting infra"
+).split()
+PEOPLE = [f"user{n:03d}" for n in range(1, 121)]
+
+WORDS = (
+    "add fix improve refactor support migrate optimize document remove handle "
+    "sync import export cache index query report dashboard view filter label "
+    "milestone project item issue token webhook schema backup search rule "
+    "field pipeline worker queue retry limit page cursor stream batch graph"
+).split()
+
+# (name suffix, field_type, share of work items with a value)
+CUSTOM_FIELDS = (
+    ("Estimate", "number", 0.6),
+    ("Sprint", "iteration", 0.5),
+    ("Area", "single_select", 0.4),
+    ("Target", "date", 0.2),
+)
+AREA_OPTIONS = ("core", "platform", "integrations", "ui", "data")
+SPRINT_DAYS = 14
+
+
+class DatasetSpec(NamedTuple):
+    work_items: int
+    projects: int
+    ideas: int
+    seed: int
+
+
+def dataset_spec(scale: Union[str, int], seed: int = DEFAULT_SEED) -> DatasetSpec:
+    """Row counts for a named scale ('10k', '100k', '1m') or a work item count."""
+    if isinstance(scale, str):
+        try:
+            work_items = SCALES[scale.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown scale {scale!r}; use one of {list(SCALES)}")
+    else:
+        work_items = int(scale)
+    return DatasetSpec(
+        work_items,
+        max(work_items // WORK_ITEMS_PER_PROJECT, 1),
+        int(work_items * IDEAS_PER_WORK_ITEM),
+        seed,
+    )
+
+
+def _weighted(rng: random.Random, choices: Sequence[tuple]) -> str:
+    return rng.choices([value for value, _ in choices], [w for _, w in choices])[0]
+
+
+def _zipf_weights(count: int, exponent: float = 1.1) -> List[float]:
+    return list(accumulate(1 / (rank**exponent) for rank in range(1, count + 1)))
+
+
+class SyntheticData:
+    """Row generators for one dataset.
+
+    Each table has its own random stream derived from the seed, so the rows
+    of one table do not depend on how many rows another table has; the same
+    spec always yields the same rows.
+    """
+
+    def __init__(self, spec: DatasetSpec):
+        self.spec = spec
+        self.start = EPOCH - timedelta(days=HISTORY_DAYS)
+        # Zipf label popularity: a few labels dominate, most are rare
+        self.label_weights = _zipf_weights(len(LABELS))
+        self.people_weights = _zipf_weights(len(PEOPLE), 0.8)
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.spec.seed}:{table}")
+
+    def _title(self, rng: random.Random) -> str:
+        return " ".join(rng.choices(WORDS, k=rng.randint(3, 7))).capitalize()
+
+    def _text(self, rng: random.Random) -> str:
+        return " ".join(rng.choices(WORDS, k=rng.randint(12, 60))) + "."
+
+    def _labels(self, rng: random.Random) -> List[str]:
+        count = rng.choices((0, 1, 2, 3), (20, 40, 28, 12))[0]
+        return sorted(set(rng.choices(LABELS, cum_weights=self.label_weights, k=count)))
+
+    def _person(self, rng: random.Random) -> str:
+        return rng.choices(PEOPLE, cum_weights=self.people_weights)[0]
+
+    def _created(self, rng: random.Random, position: float) -> datetime:
+        # Creation accelerates over time: position**0.7 skews towards recent
+        offset = HISTORY_DAYS * 86400 * (position**0.7)
+        return self.start + timedelta(seconds=int(offset + rng.random() * 3600))
+
+    def _updated(self, rng: random.Random, created: datetime) -> datetime:
+        updated = created + timedelta(hours=rng.expovariate(1 / 72))
+        return min(updated, EPOCH)
+
+    def project_id(self, n: int) -> str:
+        return f"PRJ-{n:06d}"
+
+    def milestone_ids(self, project: int) -> List[str]:
+        count = random.Random(f"{self.spec.seed}:milestones:{project}").randint(2, 6)
+        return [f"MS-{project:06d}-{n}" for n in range(1, count + 1)]
+
+    def projects(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("projects")
+        for n in range(1, self.spec.projects + 1):
+            created = self._created(rng, n / self.spec.projects)
+            yield {
+                "id": self.project_id(n),
+                "name": f"{self._title(rng)} {n}",
+                "description": self._text(rng),
+                "status": _weighted(rng, PROJECT_STATUSES),
+                "priority": _weighted(rng, PRIORITIES),
+                "category": _weighted(rng, CATEGORIES),
+                "visibility": "private" if rng.random() < 0.8 else "public",
+                "owner": self._person(rng),
+                "team": sorted({self._person(rng) for _ in range(rng.randint(1, 6))}),
+                "tags": self._labels(rng),
+                "technologies": rng.sample(("python", "sqlite", "fastapi", "rust"), 2),
+                "created_date": created,
+                "updated_date": self._updated(rng, created),
+                "start_date": created,
+                "target_date": created + timedelta(days=rng.randint(30, 365)),
+            }
+
+    def milestones(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("milestones")
+        for n in range(1, self.spec.projects + 1):
+            created = self._created(rng, n / self.spec.projects)
+            for number, milestone_id in enumerate(self.milestone_ids(n), 1):
+                due = created + timedelta(days=30 * number)
+                yield {
+                    "id": milestone_id,
+                    "title": f"Milestone {number}",
+                    "description": self._text(rng),
+                    "project_id": self.project_id(n),
+                    "status": "completed" if due < EPOCH else "in_progress",
+                    "due_date": due,
+                    "completed_date": due if due < EPOCH else None,
+                    "created_date": created,
+                    "updated_date": min(due, EPOCH),
+                }
+
+    def ideas(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("ideas")
+        for n in range(1, self.spec.ideas + 1):
+            created = self._created(rng, n / self.spec.ideas)
+            synced = rng.random() < SYNCED_SHARE
+            yield {
+                "id": f"IDEA-{n:07d}",
+                "title": self._title(rng),
+                "description": self._text(rng),
+                "status": _weighted(rng, IDEA_STATUSES),
+                "priority": _weighted(rng, PRIORITIES),
+                "category": _weighted(rng, CATEGORIES),
+                "tags": self._labels(rng),
+                "created_date": created,
+                "updated_date": self._updated(rng, created),
+                "estimated_effort": rng.choice(("S", "M", "L", "XL")),
+                "author": self._person(rng),
+                "github_issue_id": n if synced else None,
+                "github_synced_at": created if synced else None,
+            }
+
+    def work_items(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng("work_items")
+        project_weights = _zipf_weights(self.spec.projects, 0.8)
+        total = self.spec.work_items
+        for n in range(1, total + 1):
+            position = n / total
+            project = (
+                bisect.bisect_left(project_weights, rng.random() * project_weights[-1])
+                + 1
+            )
+            created = self._created(rng, position)
+            # Older items are more likely to be finished
+            if rng.random() < 0.15 + 0.7 * (1 - position):
+                status = "done"
+            else:
+                status = _weighted(rng, OPEN_STATUSES)
+            estimated = round(rng.lognormvariate(1.3, 0.8), 1)
+            milestones = self.milestone_ids(project)
+            synced = rng.random() < SYNCED_SHARE
+            yield {
+                "id": f"WI-{n:07d}",
+                "title": self._title(rng),
+                "description": self._text(rng),
+                "status": status,
+                "priority": _weighted(rng, PRIORITIES),
+                "type": _weighted(rng, WORK_ITEM_TYPES),
+                "project_id": self.project_id(project),
+                "assignee": self._person(rng) if rng.random() < 0.75 else None,
+                "author": self._person(rng),
+                "labels": self._labels(rng),
+                "created_date": created,
+                "updated_date": self._updated(rng, created),
+                "due_date": (
+                    created + timedelta(days=rng.randint(7, 90))
+                    if rng.random() < 0.4
+                    else None
+                ),
+                "estimated_hours": estimated if rng.random() < 0.8 else None,
+                "actual_hours": (
+                    round(estimated * rng.uniform(0.5, 1.8), 1)
+                    if status == "done"
+                    else None
+                ),
+                "milestone_id": (
+                    rng.choice(milestones) if rng.random() < 0.6 else None
+                ),
+                # Only earlier items, so the dependency graph stays acyclic
+                "dependencies": (
+                    [f"WI-{rng.randint(1, n - 1):07d}"]
+                    if n > 1 and rng.random() < 0.1
+                    else []
+                ),
+                "github_issue_id": n if synced else None,
+                "github_synced_at": created if synced else None,
+                "archived": status == "done" and rng.random() < 0.3,
+            }
+
+    def custom_fields(self) -> Iterator[Dict[str, Any]]:
+        for n in range(1, self.spec.projects + 1):
+            for name, field_type, _ in CUSTOM_FIELDS:
+                yield {
+                    "id": f"CF-{n:06d}-{name.lower()}",
+                    "name": name,
+                    "field_type": field_type,
+                    "project_id": self.project_id(n),
+                    "options": (
+                        [{"id": option, "name": option} for option in AREA_OPTIONS]
+                        if field_type == "single_select"
+                        else None
+                    ),
+                    "created_date": self.start,
+                    "updated_date": self.start,
+                }
+
+    def custom_field_values(self) -> Iterator[Dict[str, Any]]:
+        # Follows work_items() to know each item's project and dates
+        rng = self._rng("custom_field_values")
+        for item in self.work_items():
+            project = item["project_id"][len("PRJ-") :]
+            for name, field_type, share in CUSTOM_FIELDS:
+                if rng.random() >= share:
+                    continue
+                if field_type == "number":
+                    value = rng.choice((1, 2, 3, 5, 8, 13))
+                elif field_type == "iteration":
+                    sprint = (item["created_date"] - self.start).days // SPRINT_DAYS
+                    value = {
+                        "id": f"sprint-{sprint}",
+                        "start_date": (
+                            self.start + timedelta(days=sprint * SPRINT_DAYS)
+                        ).isoformat(),
+                    }
+                elif field_type == "single_select":
+                    value = rng.choice(AREA_OPTIONS)
+                else:
+                    value = (
+                        (item["created_date"] + timedelta(days=rng.randint(7, 120)))
+                        .date()
+                        .isoformat()
+                    )
+                yield {
+                    "id": f"CFV-{item['id'][3:]}-{name.lower()}",
+                    "field_id": f"CF-{project}-{name.lower()}",
+                    "work_item_id": item["id"],
+                    "value": value,
+                    "created_date": item["created_date"],
+                    "updated_date": item["updated_date"],
+                }
+
+    def tables(self):
+        """(model, row iterator) in foreign key order."""
+        return [
+            (Project, self.projects()),
+            (Milestone, self.milestones()),
+            (Idea, self.ideas()),
+            (WorkItem, self.work_items()),
+            (CustomField, self.custom_fields()),
+            (CustomFieldValue, self.custom_field_values()),
+        ]
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def generate_dataset(
+    bind: Engine,
+    scale: Union[str, int] = "10k",
+    seed: int = DEFAULT_SEED,
+    batch_size: int = BATCH_SIZE,
+) -> Dict[str, Any]:
+    """Fill an empty, migrated database with a synthetic dataset.
+
+    Rows go in with Core executemany (the SQLite triggers keep tags, search
+    and typed custom field values current); counters and progress rollups
+    are rebuilt at the end, as after a bulk import. Returns rows per table
+    and the elapsed seconds.
+    """
+    from .aggregates import rebuild_statements as aggregate_statements
+    from .progress import rebuild_statements as progress_statements
+
+    spec = dataset_spec(scale, seed)
+    data = SyntheticData(spec)
+    start = time.perf_counter()
+    stats: Dict[str, Any] = {}
+    with bind.begin() as connection:
+        if connection.scalar(select(func.count()).select_from(WorkItem.__table__)):
+            raise ValueError("Synthetic data needs an empty database")
+        for model, rows in data.tables():
+            table = model.__table__
+            count = 0
+            for batch in _batches(rows, batch_size):
+                connection.execute(table.insert(), batch)
+                count += len(batch)
+            stats[table.name] = count
+        for statement in aggregate_statements() + progress_statements():
+            connection.exec_driver_sql(statement)
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def main():
+    """Generate a synthetic database"""
+    import argparse
+    from pathlib import Path
+
+    from .database import Base, create_db_engine
+    from .migrations import run_migrations
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic database")
+    parser.add_argument("db", help="Path of the database file to create")
+    parser.add_argument(
+        "--scale", default="10k", help=f"{', '.join(SCALES)} or a work item count"
+    )
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    args = parser.parse_args()
+
+    path = Path(args.db)
+    if path.exists():
+        print(f"❌ {path} already exists; synthetic data needs a new file")
+        raise SystemExit(1)
+    scale = int(args.scale) if args.scale.isdigit() else args.scale
+
+    bind = create_db_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=bind)
+        run_migrations(bind, verbose=False)
+        stats = generate_dataset(bind, scale, args.seed)
+    finally:
+        bind.dispose()
+
+    seconds = stats.pop("seconds")
+    print(f"✅ Generated {path} in {seconds}s")
+    for table, count in stats.items():
+        print(f"📊 {table}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
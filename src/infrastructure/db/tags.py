@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Tag Index
+Normalized item_tags rows for the JSON label/tag columns, with any/all
+filters and tag facets that are answered from the index
+"""
+
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models.models import Idea, ItemTag, Project, WorkItem
+
+# JSON list columns mirrored into item_tags, per model
+TAG_FIELDS = {
+    WorkItem: ("labels",),
+    Idea: ("tags",),
+    Project: ("tags", "technologies"),
+}
+
+
+def _json_list(expression: str) -> str:
+    # Invalid JSON counts as an empty list so a bad value never blocks a write
+    return (
+        f"json_each(CASE WHEN json_valid({expression}) "
+        f"THEN {expression} ELSE '[]' END)"
+    )
+
+
+def _insert_tags(table: str, field: str) -> str:
+    return (
+        f"INSERT OR IGNORE INTO item_tags (entity, field, tag, item_id) "
+        f"SELECT '{table}', '{field}', value, new.id "
+        f"FROM {_json_list(f'new.{field}')} "
+        f"WHERE type = 'text' AND value != '';"
+    )
+
+
+def schema_statements() -> List[str]:
+    """Triggers that keep item_tags in step with the JSON columns.
+
+    Triggers (rather than ORM events) also cover the bulk importer and the
+    raw sqlite3 migration scripts.
+    """
+    statements = []
+    for model, fields in TAG_FIELDS.items():
+        table = model.__tablename__
+        inserts = " ".join(_insert_tags(table, field) for field in fields)
+        delete_old = (
+            f"DELETE FROM item_tags WHERE entity = '{table}' AND item_id = old.id;"
+        )
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_tags_ai AFTER INSERT ON {table} "
+            f"BEGIN {inserts} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_tags_ad AFTER DELETE ON {table} "
+            f"BEGIN {delete_old} END",
+            f"CREATE TRIGGER IF NOT EXISTS {table}_tags_au "
+            f"AFTER UPDATE OF id, {', '.join(fields)} ON {table} "
+            f"BEGIN {delete_old} {inserts} END",
+        ]
+    return statements
+
+
+def rebuild_statements() -> List[str]:
+    """Plain SQL that rebuilds item_tags from the base tables."""
+    statements = ["DELETE FROM item_tags"]
+    for model, fields in TAG_FIELDS.items():
+        table = model.__tablename__
+        for field in fields:
+            statements.append(
+                f"INSERT OR IGNORE INTO item_tags (entity, field, tag, item_id) "
+                f"SELECT '{table}', '{field}', j.value, t.id "
+                f"FROM {table} t, {_json_list(f't.{field}')} j "
+                f"WHERE j.type = 'text' AND j.value != ''"
+            )
+    return statements
+
+
+def rebuild_item_tags(session: Session):
+    """Recompute item_tags from the JSON columns (reconciliation)."""
+    connection = session.connection()
+    for statement in rebuild_statements():
+        connection.exec_driver_sql(statement)
+
+
+def _field_for(model, field: Optional[str]) -> str:
+    return field or TAG_FIELDS[model][0]
+
+
+def tagged_ids(
+    model, tags: Iterable[str], match: str = "any", field: Optional[str] = None
+):
+    """Subquery of ids of ``model`` rows carrying any/all of ``tags``."""
+    tags = list(dict.fromkeys(tags))
+    query = select(ItemTag.item_id).where(
+        ItemTag.entity == model.__tablename__,
+        ItemTag.field == _field_for(model, field),
+        ItemTag.tag.in_(tags),
+    )
+    if match == "all":
+        query = query.group_by(ItemTag.item_id).having(
+            func.count(ItemTag.tag) == len(tags)
+        )
+    elif match != "any":
+        raise ValueError(f"match must be 'any' or 'all', not {match!r}")
+    return query
+
+
+def filter_by_tags(
+    query, model, tags: Iterable[str], match: str = "any", field: Optional[str] = None
+):
+    """Restrict a select()/Query over ``model`` to rows with any/all of ``tags``.
+
+    Example::
+
+        filter_by_tags(select(WorkItem), WorkItem, ["backend", "urgent"], "all")
+    """
+    return query.where(model.id.in_(tagged_ids(model, tags, match, field)))
+
+
+def tag_facets(
+    session: Session,
+    model,
+    field: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[Tuple[str, int]]:
+    """[(tag, item count)] for one tag column, most frequent first."""
+    # GROUP BY walks the primary key; the few distinct tags are sorted here
+    rows = session.execute(
+        select(ItemTag.tag, func.count())
+        .where(
+            ItemTag.entity == model.__tablename__,
+            ItemTag.field == _field_for(model, field),
+        )
+        .group_by(ItemTag.tag)
+    )
+    facets = sorted(rows, key=lambda row: (-row[1], row[0]))
+    return [(tag, count) for tag, count in facets[:limit]]
+
+
+def main():
+    """Rebuild the tag index or print tag facets"""
+    import argparse
+
+    models = {model.__tablename__: model for model in TAG_FIELDS}
+    parser = argparse.ArgumentParser(description="Tag index maintenance")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild item_tags")
+    parser.add_argument(
+        "--facets", choices=sorted(models), help="Print tag counts for a table"
+    )
+    parser.add_argument("--field", help="Tag column (defaults to the first one)")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.rebuild:
+            rebuild_item_tags(session)
+            session.commit()
+            print("✅ Tag index rebuilt")
+        if args.facets:
+            for tag, count in tag_facets(session, models[args.facets], args.field):
+                print(f"  {count:>6}  {tag}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+AI Lab Framework - Project Views
+Compiles ProjectView filters/sort/group definitions into a single Core
+statement over work items, with per-group pagination done in SQL
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from sqlalchemy import DateTime, Integer, and_, bindparam, case, func, literal, select
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+from .models.models import ItemTag, ProjectView, WorkItem
+from .tags import tagged_ids
+
+# Columns returned for every card/row; views are rendered from these alone
+VIEW_COLUMNS = (
+    "id",
+    "title",
+    "status",
+    "priority",
+    "type",
+    "assignee",
+    "labels",
+    "milestone_id",
+    "parent_issue_id",
+    "due_date",
+    "estimated_hours",
+    "created_date",
+    "updated_date",
+)
+
+FILTER_FIELDS = VIEW_COLUMNS + ("issue_type", "author", "is_draft", "archived")
+GROUP_FIELDS = (
+    "status",
+    "priority",
+    "type",
+    "issue_type",
+    "assignee",
+    "milestone_id",
+    "labels",
+)
+SORT_FIELDS = tuple(name for name in VIEW_COLUMNS if name != "labels")
+
+OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "contains": lambda column, value: column.contains(value, autoescape=True),
+    "is_null": lambda column, value: column.is_(None) if value else column.isnot(None),
+}
+
+# Priorities sort by urgency, not alphabetically
+PRIORITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+# Layout defaults when a view leaves sort_config/group_config empty
+LAYOUT_DEFAULTS = {
+    "table": ({"field": "updated_date", "direction": "desc"}, None),
+    "board": ({"field": "priority"}, "status"),
+    "roadmap": ({"field": "due_date"}, "milestone_id"),
+}
+
+PAGE_SIZE = 50
+CACHE_SIZE = 256
+
+
+class CompiledView(NamedTuple):
+    version: str
+    statement: Any  # Select with :offset and :limit bind parameters
+
+
+class ViewGroup(NamedTuple):
+    key: Optional[str]  # None for ungrouped views and items without a value
+    total: int  # Items in the group, across all pages
+    items: List[Dict[str, Any]]
+
+
+def view_version(view: ProjectView) -> str:
+    """Content hash of everything that affects a view's statement."""
+    definition = {
+        "project_id": view.project_id,
+        "layout": view.layout,
+        "filters": view.filters or {},
+        "sort": view.sort_config or {},
+        "group": view.group_config or {},
+    }
+    payload = json.dumps(definition, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _column(name: str, allowed):
+    if name not in allowed:
+        raise ValueError(f"Unsupported view field: {name!r}")
+    return getattr(WorkItem, name)
+
+
+def _coerce(column, value):
+    # JSON has no dates; ISO strings are compared as datetimes
+    if isinstance(column.type, DateTime) and isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, list):
+        return [_coerce(column, item) for item in value]
+    return value
+
+
+def column_conditions(column, spec) -> List:
+    """Conditions for one column: a value, a list (IN), None (IS NULL) or an
+    {operator: value} dict."""
+    if spec is None:
+        return [column.is_(None)]
+    if isinstance(spec, list):
+        return [column.in_(_coerce(column, spec))]
+    if isinstance(spec, dict):
+        conditions = []
+        for operator, value in spec.items():
+            if operator not in OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator!r}")
+            conditions.append(OPERATORS[operator](column, _coerce(column, value)))
+        return conditions
+    return [column == _coerce(column, spec)]
+
+
+def _filter_conditions(filters: Dict[str, Any]) -> List:
+    """Translate a filters dict into WHERE conditions.
+
+    ``{"status": "todo"}`` tests equality, a list means IN, ``None`` means
+    IS NULL and a dict maps operators to values, e.g.
+    ``{"estimated_hours": {"gte": 2}}``. ``labels`` takes a list (any) or
+    ``{"any": [...]}`` / ``{"all": [...]}`` and is answered from item_tags.
+    """
+    conditions = []
+    for name, spec in (filters or {}).items():
+        if name == "labels":
+            if isinstance(spec, dict):
+                ((match, tags),) = spec.items()
+            else:
+                match, tags = "any", spec
+            conditions.append(WorkItem.id.in_(tagged_ids(WorkItem, tags, match)))
+            continue
+
+        conditions += column_conditions(_column(name, FILTER_FIELDS), spec)
+    return conditions
+
+
+def _sort_keys(sort_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if not sort_config:
+        return []
+    if "fields" in sort_config:
+        return list(sort_config["fields"])
+    return [sort_config]
+
+
+def _sort_expressions(sort_config: Dict[str, Any]) -> List:
+    expressions = []
+    for key in _sort_keys(sort_config):
+        column = _column(key["field"], SORT_FIELDS)
+        if key["field"] == "priority":
+            column = case(
+                PRIORITY_RANK, value=WorkItem.priority, else_=len(PRIORITY_RANK)
+            )
+        descending = key.get("direction", "asc") == "desc"
+        # NULLs (no due date, no estimate) always go last
+        expressions += [column.is_(None), column.desc() if descending else column]
+    return expressions + [WorkItem.id]  # Stable order for pagination
+
+
+def _layout_config(view: ProjectView):
+    default_sort, default_group = LAYOUT_DEFAULTS.get(
+        view.layout or "table", LAYOUT_DEFAULTS["table"]
+    )
+    group_config = view.group_config or (
+        {"field": default_group} if default_group else {}
+    )
+    return view.sort_config or default_sort, group_config
+
+
+def compile_view(view: ProjectView) -> CompiledView:
+    """Build the statement for a view.
+
+    Every item gets its position inside its group and the group size from
+    window functions, so one query returns the requested page of every
+    group (board columns, roadmap lanes) together with the group totals.
+    """
+    sort_config, group_config = _layout_config(view)
+    columns = [getattr(WorkItem, name) for name in VIEW_COLUMNS]
+
+    query = select(*columns)
+    group_field = group_config.get("field")
+    if group_field == "labels":
+        # An item appears once per label (unlabelled items under None)
+        group_key = ItemTag.tag
+        query = query.outerjoin(
+            ItemTag,
+            and_(
+                ItemTag.entity == WorkItem.__tablename__,
+                ItemTag.field == "labels",
+                ItemTag.item_id == WorkItem.id,
+            ),
+        )
+    elif group_field:
+        group_key = _column(group_field, GROUP_FIELDS)
+    else:
+        group_key = literal(None)
+
+    conditions = _filter_conditions(view.filters)
+    if view.project_id:
+        conditions.insert(0, WorkItem.project_id == view.project_id)
+
+    partition = [group_key] if group_field else None
+    inner = (
+        query.add_columns(
+            group_key.label("group_key"),
+            func.row_number()
+            .over(partition_by=partition, order_by=_sort_expressions(sort_config))
+            .label("position"),
+            func.count().over(partition_by=partition).label("group_total"),
+        )
+        .where(*conditions)
+        .subquery("view_items")
+    )
+
+    group_order = [inner.c.group_key.is_(None)]
+    if group_config.get("order"):
+        ranks = {value: rank for rank, value in enumerate(group_config["order"])}
+        group_order.append(case(ranks, value=inner.c.group_key, else_=len(ranks)))
+    group_order.append(inner.c.group_key)
+
+    offset = bindparam("offset", type_=Integer)
+    statement = (
+        select(inner)
+        .where(inner.c.position > offset)
+        .where(inner.c.position <= offset + bindparam("limit", type_=Integer))
+        .order_by(*group_order, inner.c.position)
+    )
+    return CompiledView(view_version(view), statement)
+
+
+# (view id, version) -> CompiledView; a changed definition gets a new version,
+# so stale entries simply age out of the LRU
+_cache: "OrderedDict[tuple, CompiledView]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_compiled_view(view: ProjectView) -> CompiledView:
+    """Compiled statement for a view, reused until its definition changes."""
+    key = (view.id, view_version(view))
+    with _cache_lock:
+        compiled = _cache.get(key)
+        if compiled is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return compiled
+        _cache_stats["misses"] += 1
+
+    compiled = compile_view(view)
+    with _cache_lock:
+        _cache[key] = compiled
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return compiled
+
+
+def view_cache_info() -> Dict[str, int]:
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache)}
+
+
+def clear_view_cache():
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats.update(hits=0, misses=0)
+
+
+def execute_view(
+    session: Session,
+    view: Union[ProjectView, str],
+    limit: int = PAGE_SIZE,
+    offset: int = 0,
+) -> List[ViewGroup]:
+    """Render one page of a view (``limit`` items per group from ``offset``).
+
+    Groups without items on the requested page are omitted.
+    """
+    if isinstance(view, str):
+        view_id = view
+        view = session.get(ProjectView, view_id)
+        if view is None:
+            raise ValueError(f"Unknown project view: {view_id!r}")
+
+    compiled = get_compiled_view(view)
+    rows = session.execute(compiled.statement, {"offset": offset, "limit": limit})
+
+    groups: List[ViewGroup] = []
+    for row in rows:
+        values = row._mapping
+        if not groups or groups[-1].key != values["group_key"]:
+            groups.append(ViewGroup(values["group_key"], values["group_total"], []))
+        groups[-1].items.append({name: values[name] for name in VIEW_COLUMNS})
+    return groups
+
+
+def main():
+    """Render a project view"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render a project view")
+    parser.add_argument("view_id", help="ProjectView id")
+    parser.add_argument("--limit", type=int, default=PAGE_SIZE, help="Items per group")
+    parser.add_argument("--offset", type=int, default=0, help="Items to skip per group")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        for group in execute_view(session, args.view_id, args.limit, args.offset):
+            print(f"📋 {'-' if group.key is None else group.key} ({group.total})")
+            for item in group.items:
+                print(f"  {item['id']:<16} {item['priority']:<9} {item['title']}")
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
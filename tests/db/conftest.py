@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Database Tests Configuration
+
+Shared fixtures for tests against the SQLAlchemy layer in infrastructure.db.
+Every test gets its own temporary SQLite file; data/ai_lab.db is never touched.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Point the module-level engines at a scratch file before anything imports them
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'ai_lab_test.db'}"
+)
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.db.database import Base, create_db_engine
+from infrastructure.db.migrations import run_migrations
+import infrastructure.db.models  # noqa: F401  (registers all tables)
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """Migrated engine on a fresh temporary database."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine, verbose=False)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    """Session factory bound to the temporary database."""
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
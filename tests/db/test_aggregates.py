@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the incrementally maintained aggregate_counters table.
+"""
+
+import pytest
+
+from infrastructure.db.aggregates import (
+    get_completion_rate,
+    get_counts,
+    get_total,
+    rebuild_aggregate_counters,
+    setup_aggregate_counters,
+    verify_aggregate_counters,
+)
+from infrastructure.db.models import Idea, WorkItem
+
+
+@pytest.fixture
+def session(session_factory):
+    setup_aggregate_counters(session_factory)
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def _work_item(item_id, status="todo", priority="medium"):
+    return WorkItem(
+        id=item_id,
+        title=f"Item {item_id}",
+        description="Aggregate counter test",
+        status=status,
+        priority=priority,
+        type="task",
+    )
+
+
+def test_insert_update_delete_keep_counters_in_sync(session):
+    session.add_all(
+        [
+            _work_item("WI-1"),
+            _work_item("WI-2", status="done", priority="high"),
+            _work_item("WI-3"),
+            Idea(
+                id="IDEA-1",
+                title="Idea",
+                description="d",
+                status="backlog",
+                priority="low",
+                category="research",
+            ),
+        ]
+    )
+    session.commit()
+
+    assert get_total(session, "work_items") == 3
+    assert get_counts(session, "work_items", "status") == {"todo": 2, "done": 1}
+    assert get_counts(session, "ideas", "category") == {"research": 1}
+
+    # Update on an expired instance (after commit) must still see the old value
+    item = session.get(WorkItem, "WI-1")
+    session.commit()
+    item.status = "done"
+    session.delete(session.get(WorkItem, "WI-3"))
+    session.commit()
+
+    assert get_total(session, "work_items") == 2
+    assert get_counts(session, "work_items", "status") == {"done": 2}
+    assert get_counts(session, "work_items", "priority") == {"medium": 1, "high": 1}
+    assert get_completion_rate(session) == 100.0
+    assert verify_aggregate_counters(session) == {}
+
+
+def test_rebuild_repairs_drift_from_bulk_updates(session):
+    session.add_all([_work_item("WI-1"), _work_item("WI-2")])
+    session.commit()
+
+    # Query-level updates bypass flush events
+    session.query(WorkItem).update({WorkItem.status: "review"})
+    session.commit()
+    assert verify_aggregate_counters(session)
+
+    rebuild_aggregate_counters(session)
+    session.commit()
+
+    assert verify_aggregate_counters(session) == {}
+    assert get_counts(session, "work_items", "status") == {"review": 2}
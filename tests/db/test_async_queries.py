@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the async (aiosqlite) session layer and read paths.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from infrastructure.db.async_queries import (
+    count_work_items_by_status,
+    get_project_status,
+    list_work_items,
+)
+from infrastructure.db.database import create_async_db_engine
+from infrastructure.db.models import Project, WorkItem
+
+
+@pytest.fixture
+async def async_session_factory(db_engine):
+    """Async session factory on the same temporary database as db_engine."""
+    engine = create_async_db_engine(str(db_engine.url), read_only=True)
+    yield async_sessionmaker(bind=engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _seed(session_factory):
+    now = datetime.utcnow()
+    with session_factory() as session:
+        session.add_all(
+            [
+                Project(
+                    id=f"PRJ-{i}",
+                    name=f"Project {i}",
+                    description="",
+                    status="active",
+                    priority="medium",
+                    category="development",
+                    owner="me",
+                    repository_url="https://example.com/repo" if i == 1 else None,
+                )
+                for i in (1, 2)
+            ]
+        )
+        session.add_all(
+            [
+                WorkItem(
+                    id=f"WI-{i}",
+                    title=f"Item {i}",
+                    description="",
+                    status="done" if i % 2 else "todo",
+                    priority="high",
+                    type="task",
+                    project_id="PRJ-1",
+                    updated_date=now + timedelta(minutes=i),
+                )
+                for i in range(5)
+            ]
+        )
+        session.commit()
+
+
+async def test_async_reads(session_factory, async_session_factory):
+    _seed(session_factory)
+
+    async with async_session_factory() as session:
+        items = await list_work_items(session, status="todo")
+        assert [item.id for item in items] == ["WI-4", "WI-2", "WI-0"]
+
+        assert await count_work_items_by_status(session) == {"done": 2, "todo": 3}
+
+        status = await get_project_status(session)
+        assert status["total_projects"] == 2
+        assert status["with_repositories"] == 1
+        counts = {p["id"]: p["work_items_count"] for p in status["projects"]}
+        assert counts == {"PRJ-1": 5, "PRJ-2": 0}
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests for the automation rule engine.
+"""
+
+import pytest
+
+from infrastructure.db.automation import (
+    RuleIndex,
+    compile_rule,
+    get_rule_index,
+    reset_rule_index,
+    setup_automation,
+)
+from infrastructure.db.models import AutomationRule, Project, WorkItem
+
+
+@pytest.fixture
+def session(session_factory):
+    reset_rule_index()
+    setup_automation(session_factory)
+    session = session_factory()
+    session.add(
+        Project(
+            id="PROJ-1",
+            name="Project",
+            description="Automation test",
+            status="active",
+            priority="high",
+            category="development",
+            owner="tester",
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+    reset_rule_index()
+
+
+def _rule(rule_id, trigger_type, conditions, actions, project_id="PROJ-1"):
+    return AutomationRule(
+        id=rule_id,
+        name=rule_id,
+        project_id=project_id,
+        trigger_type=trigger_type,
+        trigger_conditions=conditions,
+        actions=actions,
+    )
+
+
+def _work_item(item_id, project_id="PROJ-1", **values):
+    values.setdefault("status", "todo")
+    values.setdefault("priority", "medium")
+    return WorkItem(
+        id=item_id,
+        title=f"Item {item_id}",
+        description="Automation test",
+        type="task",
+        project_id=project_id,
+        **values,
+    )
+
+
+def test_rules_fire_after_commit(session):
+    session.add_all(
+        [
+            _rule(
+                "R-added",
+                "item_added",
+                {"where": {"priority": "critical"}},
+                [{"type": "add_label", "label": "triage"}],
+            ),
+            _rule(
+                "R-done",
+                "status_changed",
+                {"from": ["todo", "in_progress"], "to": "done"},
+                [
+                    {"type": "remove_label", "label": "triage"},
+                    {"type": "set_field", "field": "assignee", "value": None},
+                ],
+                project_id=None,  # Applies to every project
+            ),
+            _rule(
+                "R-escalate",
+                "item_changed",
+                {"field": "priority", "to": "critical"},
+                [{"type": "set_field", "field": "status", "value": "in_progress"}],
+            ),
+        ]
+    )
+    session.commit()
+
+    session.add_all(
+        [
+            _work_item("WI-1", priority="critical", labels=["bug"]),
+            _work_item("WI-2"),
+            _work_item("WI-3", project_id=None),
+        ]
+    )
+    session.commit()
+    session.expire_all()
+    assert session.get(WorkItem, "WI-1").labels == ["bug", "triage"]
+    assert session.get(WorkItem, "WI-2").labels == []
+
+    # Old values of expired instances are loaded for from/to checks
+    session.get(WorkItem, "WI-1").status = "done"
+    session.get(WorkItem, "WI-2").priority = "critical"
+    session.get(WorkItem, "WI-3").status = "done"
+    session.commit()
+    session.expire_all()
+    assert session.get(WorkItem, "WI-1").labels == ["bug"]
+    assert session.get(WorkItem, "WI-2").status == "in_progress"
+    assert session.get(WorkItem, "WI-3").assignee is None
+
+
+def test_actions_do_not_retrigger_rules(session):
+    session.add(
+        _rule(
+            "R-loop",
+            "item_changed",
+            {"field": "status"},
+            [{"type": "set_field", "field": "priority", "value": "high"}],
+        )
+    )
+    session.add(
+        _rule(
+            "R-priority",
+            "item_changed",
+            {"field": "priority"},
+            [{"type": "set_field", "field": "status", "value": "blocked"}],
+        )
+    )
+    session.add(_work_item("WI-1"))
+    session.commit()
+
+    session.get(WorkItem, "WI-1").status = "in_progress"
+    session.commit()
+    session.expire_all()
+    item = session.get(WorkItem, "WI-1")
+    assert (item.status, item.priority) == ("in_progress", "high")
+
+
+def test_rollback_discards_fired_actions_and_rule_changes(session):
+    session.add(_work_item("WI-1"))
+    session.commit()
+
+    session.add(
+        _rule(
+            "R-1",
+            "item_changed",
+            {"field": "status"},
+            [{"type": "add_label", "label": "x"}],
+        )
+    )
+    session.get(WorkItem, "WI-1").status = "done"
+    session.flush()
+    session.rollback()
+    assert len(get_rule_index(session)) == 0
+    session.expire_all()
+    assert session.get(WorkItem, "WI-1").labels == []
+
+
+def test_index_only_returns_candidates():
+    rules = [
+        (
+            "PROJ-1",
+            compile_rule(
+                _rule("R-1", "item_changed", {"fields": ["priority", "assignee"]}, [])
+            ),
+        ),
+        (None, compile_rule(_rule("R-2", "status_changed", {}, []))),
+        ("PROJ-2", compile_rule(_rule("R-3", "item_changed", {}, []))),
+    ]
+    index = RuleIndex(rules)
+    assert [r.id for r in index.candidates("PROJ-1", "item_changed", "assignee")] == [
+        "R-1"
+    ]
+    assert index.candidates("PROJ-1", "item_changed", "status") == []
+    assert [r.id for r in index.candidates("PROJ-1", "status_changed", "status")] == [
+        "R-2"
+    ]
+    assert index.watched == {"priority", "assignee", "status"}
+    assert index.watch_all
+
+    with pytest.raises(ValueError):
+        compile_rule(_rule("R-4", "item_changed", {}, [{"type": "delete"}]))
+    with pytest.raises(ValueError):
+        compile_rule(
+            _rule(
+                "R-5",
+                "item_added",
+                {},
+                [{"type": "set_field", "field": "id", "value": "x"}],
+            )
+        )
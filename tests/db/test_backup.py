@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for online backups into the content-addressed chunk store.
+"""
+
+import sqlite3
+import threading
+import zlib
+
+import pytest
+from sqlalchemy import text
+
+from infrastructure.db import backup
+from infrastructure.db.backup import (
+    ChunkStore,
+    create_backup,
+    list_backups,
+    prune_backups,
+    restore_backup,
+    verify_backup,
+)
+
+
+@pytest.fixture
+def database(db_engine, tmp_path):
+    with db_engine.begin() as connection:
+        for number in range(2000):
+            connection.execute(
+                text(
+                    "INSERT INTO ideas (id, title, description, status, priority, "
+                    "category, created_date, updated_date) VALUES "
+                    "(:id, :title, :description, 'backlog', 'low', 'research', "
+                    "'2025-01-01 00:00:00', '2025-01-01 00:00:00')"
+                ),
+                {
+                    "id": f"IDEA-{number:05d}",
+                    "title": f"Idea {number}",
+                    "description": "x" * 400,
+                },
+            )
+    return tmp_path / "test.db"
+
+
+def _count(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT COUNT(*) FROM ideas").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def test_unchanged_pages_are_deduplicated(database, db_engine, tmp_path):
+    store = tmp_path / "backups"
+    first = create_backup(database, store)
+    assert first["stats"]["new_chunks"] == first["stats"]["chunks"] > 10
+
+    with db_engine.begin() as connection:
+        connection.execute(
+            text("UPDATE ideas SET title = 'changed' WHERE id = 'IDEA-01000'")
+        )
+    second = create_backup(database, store)
+    # Only the header chunk and chunks holding touched table/index pages
+    # (ideas, its indexes, the FTS index) are new
+    assert 0 < second["stats"]["new_chunks"] < second["stats"]["chunks"] / 3
+    assert len(ChunkStore(store).digests()) < 2 * first["stats"]["chunks"]
+    assert [m["id"] for m in list_backups(store)] == [first["id"], second["id"]]
+    assert verify_backup(second["id"], store)
+
+
+def test_restore_round_trip(database, db_engine, tmp_path):
+    store = tmp_path / "backups"
+    manifest = create_backup(database, store)
+    with db_engine.begin() as connection:
+        connection.execute(text("DELETE FROM ideas"))
+
+    target = tmp_path / "restored.db"
+    restore_backup(manifest["id"], target, store)
+    assert _count(target) == 2000
+    with pytest.raises(FileExistsError):
+        restore_backup(manifest["id"], target, store)
+
+    # A damaged chunk is detected before anything is replaced
+    digest = manifest["chunks"][1]
+    ChunkStore(store).path(digest).write_bytes(b"garbage")
+    assert not verify_backup(manifest["id"], store)
+    with pytest.raises(zlib.error):
+        restore_backup(manifest["id"], target, store, overwrite=True)
+    assert _count(target) == 2000
+
+
+def test_prune_keeps_recent_and_collects_chunks(database, db_engine, tmp_path):
+    store = tmp_path / "backups"
+    ids = []
+    for number in range(4):
+        with db_engine.begin() as connection:
+            connection.execute(
+                text("UPDATE ideas SET description = :d"), {"d": str(number) * 400}
+            )
+        ids.append(create_backup(database, store)["id"])
+
+    stats = prune_backups(store, keep_last=2, keep_daily=0, keep_weekly=0)
+    assert stats["snapshots_removed"] == 2
+    assert stats["chunks_removed"] > 0
+    assert [m["id"] for m in list_backups(store)] == ids[2:]
+    assert all(verify_backup(snapshot_id, store) for snapshot_id in ids[2:])
+
+
+def test_prune_waits_for_a_running_backup(database, db_engine, tmp_path, monkeypatch):
+    store = tmp_path / "backups"
+    first = create_backup(database, store)
+    with db_engine.begin() as connection:
+        connection.execute(text("UPDATE ideas SET title = 'changed'"))
+
+    # Pause the second backup after its chunks are stored, before its manifest
+    chunks_stored, resume = threading.Event(), threading.Event()
+    write_json = backup._write_json
+
+    def paused_write_json(path, data):
+        chunks_stored.set()
+        assert resume.wait(10)
+        write_json(path, data)
+
+    monkeypatch.setattr(backup, "_write_json", paused_write_json)
+    results = {}
+    creator = threading.Thread(
+        target=lambda: results.update(second=create_backup(database, store))
+    )
+    pruner = threading.Thread(
+        target=lambda: results.update(
+            stats=prune_backups(store, keep_last=1, keep_daily=0, keep_weekly=0)
+        )
+    )
+    creator.start()
+    assert chunks_stored.wait(10)
+    pruner.start()
+    pruner.join(0.2)
+    assert pruner.is_alive()
+    resume.set()
+    creator.join(10)
+    pruner.join(10)
+
+    second = results["second"]
+    assert results["stats"]["snapshots_removed"] == 1
+    assert [m["id"] for m in list_backups(store)] == [second["id"]]
+    assert second["id"] != first["id"]
+    assert verify_backup(second["id"], store)
+
+
+def test_continuous_writes_fall_back_to_a_single_step_copy(
+    database, db_engine, tmp_path, monkeypatch
+):
+    def write():
+        with db_engine.begin() as connection:
+            connection.execute(
+                text("UPDATE ideas SET title = title || '!' WHERE id = 'IDEA-00000'")
+            )
+
+    class WrittenDuringBackup(sqlite3.Connection):
+        # Commit a write before every backup step, so each step restarts
+        def backup(self, target, *, pages=-1, progress=None, **kwargs):
+            def write_then_progress(status, remaining, total):
+                write()
+                if progress:
+                    progress(status, remaining, total)
+
+            return super().backup(
+                target, pages=pages, progress=write_then_progress, **kwargs
+            )
+
+    connect = sqlite3.connect
+    monkeypatch.setattr(
+        backup.sqlite3,
+        "connect",
+        lambda path, **kwargs: connect(
+            path,
+            factory=WrittenDuringBackup if path == database else sqlite3.Connection,
+        ),
+    )
+    store = tmp_path / "backups"
+    manifest = create_backup(
+        database, store, pages_per_step=1, step_sleep=0, max_restarts=2
+    )
+
+    assert manifest["stats"]["restarts"] == 3
+    target = tmp_path / "restored.db"
+    restore_backup(manifest["id"], target, store)
+    assert _count(target) == 2000
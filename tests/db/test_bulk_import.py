@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk JSON import engine.
+"""
+
+import json
+
+from infrastructure.db.aggregates import get_counts
+from infrastructure.db.bulk_import import BulkImporter
+from infrastructure.db.change_log import read_changes
+from infrastructure.db.models import WorkItem
+
+
+def _write_items(directory, count, status="todo"):
+    for i in range(count):
+        item = {
+            "id": f"BULK-{i:03d}",
+            "title": f"Bulk item {i}",
+            "status": status,
+            "priority": "high",
+            "tags": ["bulk", "test"],
+            "created_date": "2025-11-09T00:00:00Z",
+            "updated_date": "2025-11-09T00:00:00Z",
+            "due_date": None,
+            "project": "not a column",
+        }
+        (directory / f"BULK-{i:03d}.json").write_text(json.dumps(item))
+
+
+def test_parallel_import_upserts_and_preserves_sync_columns(
+    tmp_path, db_engine, session_factory
+):
+    items_dir = tmp_path / "work-items"
+    items_dir.mkdir()
+    _write_items(items_dir, 40)
+    (items_dir / "BULK-000 2.json").write_text("{}")  # versioned duplicate
+    (items_dir / "broken.json").write_text("{not json")
+
+    importer = BulkImporter(bind=db_engine, workers=2)
+    stats = importer.import_directory(items_dir, "work_items")
+
+    assert stats["rows"] == 40
+    assert stats["errors"] == 1
+
+    session = session_factory()
+    item = session.get(WorkItem, "BULK-007")
+    assert item.labels == ["bulk", "test"]
+    assert item.description == ""
+    assert item.created_date.year == 2025
+    item.github_issue_id = 99
+    session.commit()
+    session.close()
+
+    # Re-import with changed content updates rows in place
+    _write_items(items_dir, 40, status="done")
+    importer.import_directory(items_dir, "work_items")
+
+    session = session_factory()
+    item = session.get(WorkItem, "BULK-007")
+    assert item.status == "done"
+    assert item.github_issue_id == 99
+    assert session.query(WorkItem).count() == 40
+    assert get_counts(session, "work_items", "status") == {"done": 40}
+    session.close()
+
+
+def test_import_appears_in_change_log(tmp_path, db_engine, session_factory):
+    items_dir = tmp_path / "work-items"
+    items_dir.mkdir()
+    _write_items(items_dir, 3)
+    importer = BulkImporter(bind=db_engine, workers=1)
+    importer.import_directory(items_dir, "work_items")
+
+    with session_factory() as session:
+        inserted = read_changes(session=session)
+        assert [(change.operation, change.entity_id) for change in inserted] == [
+            ("insert", f"BULK-{i:03d}") for i in range(3)
+        ]
+        assert inserted[0].changes["status"] == [None, "todo"]
+
+        # Unchanged files log nothing
+        importer.import_directory(items_dir, "work_items")
+        assert read_changes(inserted[-1].seq, session=session) == []
+
+        session.get(WorkItem, "BULK-001").github_issue_id = 7
+        session.commit()
+        seq = read_changes(session=session)[-1].seq
+
+    # A changed file logs an update; preserved sync columns are not touched
+    _write_items(items_dir, 3, status="done")
+    importer.import_directory(items_dir, "work_items")
+
+    with session_factory() as session:
+        changes = read_changes(seq, session=session)
+        assert [change.entity_id for change in changes] == [
+            f"BULK-{i:03d}" for i in range(3)
+        ]
+        assert changes[1].changes["status"] == ["todo", "done"]
+        assert "github_issue_id" not in changes[1].changes
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the change_log CDC table and its consumers.
+"""
+
+import pytest
+
+from infrastructure.db.change_log import (
+    ChangeConsumer,
+    latest_seq,
+    prune_changes,
+    read_changes,
+    setup_change_log,
+)
+from infrastructure.db.models import Idea, WorkItem
+
+
+@pytest.fixture
+def session(session_factory):
+    setup_change_log(session_factory)
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def _work_item(item_id, status="todo"):
+    return WorkItem(
+        id=item_id,
+        title=f"Item {item_id}",
+        description="Change log test",
+        status=status,
+        priority="medium",
+        type="task",
+    )
+
+
+def test_changes_recorded_with_old_and_new_values(session):
+    session.add(_work_item("WI-1"))
+    session.commit()
+
+    # Expired after commit: the old value is still captured
+    item = session.get(WorkItem, "WI-1")
+    item.status = "done"
+    item.priority = "medium"  # Unchanged value is not logged
+    session.commit()
+
+    session.delete(item)
+    session.commit()
+
+    changes = read_changes(0, session=session)
+    assert [(c.operation, c.entity, c.entity_id) for c in changes] == [
+        ("insert", "work_items", "WI-1"),
+        ("update", "work_items", "WI-1"),
+        ("delete", "work_items", "WI-1"),
+    ]
+    assert changes[0].changes["status"] == [None, "todo"]
+    assert changes[1].changes["status"] == ["todo", "done"]
+    assert "priority" not in changes[1].changes
+    assert changes[2].changes["status"] == ["done", None]
+    assert [c.seq for c in changes] == sorted(c.seq for c in changes)
+    assert latest_seq(session) == changes[-1].seq
+
+    assert read_changes(changes[0].seq, limit=1, session=session) == changes[1:2]
+
+
+def test_rolled_back_changes_are_not_logged(session):
+    session.add(_work_item("WI-1"))
+    session.flush()
+    session.rollback()
+    assert read_changes(0, session=session) == []
+
+
+def test_consumer_cursor_and_pruning(session_factory, session):
+    session.add(
+        Idea(
+            id="IDEA-1",
+            title="Idea",
+            description="d",
+            status="backlog",
+            priority="low",
+            category="research",
+        )
+    )
+    session.commit()
+    session.add(_work_item("WI-1"))
+    session.commit()
+
+    consumer = ChangeConsumer("sync", ["work_items"], session_factory)
+    batch = consumer.poll()
+    assert [change.entity_id for change in batch] == ["WI-1"]
+    consumer.ack(batch[-1].seq)
+    consumer.ack(0)  # Cursors never move backwards
+    assert consumer.position == batch[-1].seq
+
+    session.get(WorkItem, "WI-1").status = "done"
+    session.commit()
+    assert [change.operation for change in consumer.poll()] == ["update"]
+
+    # Only entries every consumer has acknowledged are pruned
+    assert prune_changes(session) == 2
+    session.commit()
+    assert [c.entity_id for c in read_changes(0, session=session)] == ["WI-1"]
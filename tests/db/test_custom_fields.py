@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for typed custom field values and the pivot query.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from infrastructure.db.custom_fields import pivot, rebuild_typed_values
+from infrastructure.db.models import CustomField, CustomFieldValue, WorkItem
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    session.add_all(
+        [
+            CustomField(id="F-est", name="Estimate", field_type="number"),
+            CustomField(id="F-due", name="Due", field_type="date"),
+            CustomField(id="F-size", name="Size", field_type="single_select"),
+            CustomField(id="F-sprint", name="Sprint", field_type="iteration"),
+            CustomField(id="F-note", name="Note", field_type="text"),
+        ]
+    )
+    for number in range(1, 4):
+        session.add(
+            WorkItem(
+                id=f"WI-{number}",
+                title=f"Item {number}",
+                description="Custom field test",
+                status="todo",
+                priority="medium",
+                type="task",
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _value(value_id, field_id, item_id, value):
+    return CustomFieldValue(
+        id=value_id, field_id=field_id, work_item_id=item_id, value=value
+    )
+
+
+def test_typed_columns_written_on_insert_and_update(session):
+    session.add_all(
+        [
+            _value("V-1", "F-est", "WI-1", 5),
+            _value("V-2", "F-est", "WI-2", "2.5"),
+            _value("V-3", "F-due", "WI-1", "2025-03-01T12:00:00Z"),
+            _value("V-4", "F-size", "WI-1", {"id": "opt-l", "name": "Large"}),
+            _value(
+                "V-5", "F-sprint", "WI-1", {"id": "it-2", "start_date": "2025-02-01"}
+            ),
+            _value("V-6", "F-note", "WI-1", "hello"),
+            _value("V-7", "F-est", "WI-3", "not a number"),
+        ]
+    )
+    session.commit()
+
+    assert session.get(CustomFieldValue, "V-1").value_number == 5
+    assert session.get(CustomFieldValue, "V-2").value_number == 2.5
+    assert session.get(CustomFieldValue, "V-3").value_date == datetime(2025, 3, 1, 12)
+    assert session.get(CustomFieldValue, "V-4").value_option == "opt-l"
+    sprint = session.get(CustomFieldValue, "V-5")
+    assert (sprint.value_option, sprint.value_date) == ("it-2", datetime(2025, 2, 1))
+    assert session.get(CustomFieldValue, "V-6").value_text == "hello"
+    assert session.get(CustomFieldValue, "V-7").value_number is None
+
+    value = session.get(CustomFieldValue, "V-1")
+    value.value = 8
+    session.commit()
+    assert value.value_number == 8
+
+
+def test_pivot_filters_and_sorts_in_sql(session):
+    session.add_all(
+        [
+            _value("V-1", "F-est", "WI-1", 5),
+            _value("V-2", "F-est", "WI-2", 2),
+            _value("V-3", "F-size", "WI-1", "opt-l"),
+            _value("V-4", "F-size", "WI-3", "opt-s"),
+        ]
+    )
+    session.commit()
+
+    rows = pivot(session, ["F-est", "F-size"], order_by="Estimate", descending=True)
+    assert [(row["id"], row["Estimate"], row["Size"]) for row in rows] == [
+        ("WI-1", 5, "opt-l"),
+        ("WI-2", 2, None),
+        ("WI-3", None, "opt-s"),  # No value sorts last
+    ]
+
+    rows = pivot(session, ["F-est"], where={"Estimate": {"gte": 3}, "status": "todo"})
+    assert [row["id"] for row in rows] == ["WI-1"]
+
+    with pytest.raises(ValueError):
+        pivot(session, ["F-missing"])
+    with pytest.raises(ValueError):
+        pivot(session, ["F-est"], where={"Nope": 1})
+
+
+def test_pivot_date_comparisons(session):
+    session.add_all(
+        [
+            _value("V-1", "F-due", "WI-1", "2025-01-01"),
+            _value("V-2", "F-due", "WI-2", "2025-01-02T09:30:00Z"),
+        ]
+    )
+    session.commit()
+
+    def due(spec):
+        return [row["id"] for row in pivot(session, ["F-due"], where={"Due": spec})]
+
+    assert due("2025-01-01") == ["WI-1"]
+    assert due({"eq": "2025-01-01"}) == ["WI-1"]
+    assert due({"gte": "2025-01-01"}) == ["WI-1", "WI-2"]
+    assert due({"lte": "2025-01-01"}) == ["WI-1"]
+    assert due({"gt": "2025-01-01"}) == ["WI-2"]
+    assert due({"eq": datetime(2025, 1, 2, 9, 30)}) == ["WI-2"]
+
+
+def test_rebuild_and_field_type_change(session):
+    session.add(_value("V-1", "F-note", "WI-1", "42"))
+    session.commit()
+    assert session.get(CustomFieldValue, "V-1").value_text == "42"
+
+    # Re-typing a field re-types its stored values
+    session.get(CustomField, "F-note").field_type = "number"
+    session.commit()
+    session.expire_all()
+    value = session.get(CustomFieldValue, "V-1")
+    assert (value.value_number, value.value_text) == (42, None)
+
+    session.connection().exec_driver_sql(
+        "UPDATE custom_field_values SET value_number = NULL"
+    )
+    rebuild_typed_values(session)
+    session.commit()
+    session.expire_all()
+    assert session.get(CustomFieldValue, "V-1").value_number == 42
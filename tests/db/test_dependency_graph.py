@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory dependency graph.
+"""
+
+import pytest
+
+from infrastructure.db.dependency_graph import (
+    DependencyGraph,
+    get_dependency_graph,
+    reset_dependency_graph,
+    setup_dependency_graph,
+    work_item_edges,
+)
+from infrastructure.db.models import WorkItem
+
+
+def _graph(rows):
+    graph = DependencyGraph()
+    for item_id, dependencies, hours, status in rows:
+        graph.set_item(item_id, work_item_edges(item_id, dependencies), hours, status)
+    return graph
+
+
+def test_ordering_blockers_and_critical_path():
+    graph = _graph(
+        [
+            ("A", [], 2, "done"),
+            ("B", ["A"], 3, "todo"),
+            ("C", ["A"], 8, "todo"),
+            ("D", ["B", "C"], 1, "todo"),
+        ]
+    )
+
+    order = graph.topological_order()
+    assert order.index("A") < order.index("B") < order.index("D")
+    assert order.index("C") < order.index("D")
+
+    assert sorted(graph.blocked_by("A")) == ["B", "C", "D"]
+    assert graph.blocked_by("B", transitive=False) == ["D"]
+    assert sorted(graph.blockers("D")) == ["B", "C"]  # A is done
+    assert sorted(graph.blockers("D", open_only=False)) == ["A", "B", "C"]
+
+    assert graph.critical_path() == (9.0, ["A", "C", "D"])
+    assert graph.critical_path("B") == (3.0, ["A", "B"])
+
+    # Incremental update: D no longer waits on C
+    graph.set_item("D", work_item_edges("D", ["B"]), 1, "todo")
+    assert graph.blockers("D") == ["B"]
+    assert graph.critical_path("D") == (4.0, ["A", "B", "D"])
+
+
+def test_cycles_are_detected():
+    graph = _graph(
+        [("A", ["C"], 1, "todo"), ("B", ["A"], 1, "todo"), ("C", ["B"], 1, "todo")]
+    )
+    graph.set_item("D", work_item_edges("D", ["D"]), 1, "todo")
+
+    assert sorted(graph.find_cycles()) == [["A", "B", "C"], ["D"]]
+    with pytest.raises(ValueError):
+        graph.topological_order()
+
+    graph.remove_item("A")
+    assert graph.find_cycles() == [["D"]]
+
+
+def test_commits_update_shared_graph(session_factory):
+    setup_dependency_graph(session_factory)
+    reset_dependency_graph()
+
+    def work_item(item_id, dependencies):
+        return WorkItem(
+            id=item_id,
+            title=item_id,
+            description="",
+            status="todo",
+            priority="medium",
+            type="task",
+            dependencies=dependencies,
+            estimated_hours=2,
+        )
+
+    try:
+        with session_factory() as session:
+            session.add(work_item("WI-1", []))
+            session.commit()
+            graph = get_dependency_graph(session)
+
+            session.add(work_item("WI-2", ["WI-1"]))
+            session.commit()
+            assert graph.blocked_by("WI-1") == ["WI-2"]
+
+            session.add(work_item("WI-3", ["WI-2"]))
+            session.flush()
+            session.rollback()
+            assert graph.blocked_by("WI-2") == []
+
+            session.delete(session.get(WorkItem, "WI-2"))
+            session.commit()
+            assert graph.blocked_by("WI-1") == []
+    finally:
+        reset_dependency_graph()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Tests for batched GraphQL mutations in the GitHub sync paths.
+"""
+
+import re
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("github")
+
+from ai_lab_framework.github_graphql import (
+    GraphQLBatcher,
+    batches,
+    mutation_document,
+)
+from ai_lab_framework.github_integration import GitHubIntegration
+from ai_lab_framework.github_scheduler import RateLimiter, SyncScheduler
+from infrastructure.db import auto_sync
+from infrastructure.db.models import Idea, WorkItem
+
+
+class FakeGraphQL:
+    """Requester answering aliased GraphQL requests from in-memory issues."""
+
+    graphql_url = "https://api.example.invalid/graphql"
+
+    def __init__(self, reject_above=None):
+        self.requests = []
+        self.issues = {}
+        self.reject_above = reject_above
+
+    def requestJsonAndCheck(self, verb, url, input):
+        query, variables = input["query"], input["variables"]
+        self.requests.append(query)
+        if query.startswith("query"):
+            return {}, {"data": {"repository": self._lookup(query)}}
+
+        fields = re.findall(r"m(\d+): (\w+)\(", query)
+        if self.reject_above and len(fields) > self.reject_above:
+            return {}, {"errors": [{"type": "MAX_NODE_LIMIT_EXCEEDED"}], "data": None}
+        data, errors = {}, []
+        for n, field in fields:
+            value = variables[f"v{n}"]
+            if field == "createIssue":
+                if value["title"].endswith("fail"):
+                    data[f"m{n}"] = None
+                    errors.append({"path": [f"m{n}"], "message": "Title rejected"})
+                    continue
+                number = len(self.issues) + 1
+                self.issues[number] = {
+                    "title": value["title"],
+                    "labels": {label[2:] for label in value["labelIds"]},
+                }
+                data[f"m{n}"] = {"issue": {"id": f"I_{number}", "number": number}}
+            else:
+                labels = self.issues[int(value["labelableId"][2:])]["labels"]
+                names = {label[2:] for label in value["labelIds"]}
+                if field == "addLabelsToLabelable":
+                    labels |= names
+                else:
+                    labels -= names
+                data[f"m{n}"] = {"clientMutationId": None}
+        return {}, {"data": data, **({"errors": errors} if errors else {})}
+
+    def _lookup(self, query):
+        found = {}
+        for alias, number in re.findall(r"(i\d+): issue\(number: (\d+)\)", query):
+            issue = self.issues.get(int(number))
+            found[alias] = issue and {
+                "id": f"I_{number}",
+                "number": int(number),
+                "labels": {"nodes": [{"name": name} for name in issue["labels"]]},
+            }
+        return found
+
+
+class FakeRepository:
+    node_id = "R_1"
+    full_name = "ai-lab/issues"
+
+    def __init__(self):
+        self.created_labels = []
+
+    def get_labels(self):
+        return [SimpleNamespace(name="ai-lab", node_id="L_ai-lab")]
+
+    def create_label(self, name, color):
+        self.created_labels.append(name)
+        return SimpleNamespace(name=name, node_id=f"L_{name}")
+
+
+@pytest.fixture
+def requester():
+    return FakeGraphQL()
+
+
+@pytest.fixture
+def integration(requester):
+    integration = GitHubIntegration.__new__(GitHubIntegration)
+    integration.github = SimpleNamespace(requester=requester)
+    integration.repo = FakeRepository()
+    integration.scheduler = SyncScheduler(
+        max_workers=2, limiter=RateLimiter(write_interval=0)
+    )
+    integration.graphql = GraphQLBatcher(
+        integration.github, integration.repo, integration.scheduler, batch_cost=50
+    )
+    integration.work_item_labels = ["ai-lab", "work-item", "framework"]
+    integration.idea_labels = ["ai-lab", "idea", "innovation"]
+    return integration
+
+
+def _work_items(session, count, **columns):
+    session.add_all(
+        WorkItem(
+            id=f"WI-{n:02d}",
+            title="Must fail" if n == 7 else f"Item {n}",
+            description="GraphQL test",
+            status="todo",
+            priority="medium",
+            type="task",
+            **columns,
+        )
+        for n in range(count)
+    )
+    session.commit()
+
+
+def test_batches_and_document():
+    batcher = GraphQLBatcher(
+        SimpleNamespace(), FakeRepository(), SyncScheduler(), batch_cost=12
+    )
+    operations = [batcher.add_labels(f"I_{n}", ["ai-lab"]) for n in range(5)]
+    assert [len(batch) for batch in batches(operations, 12)] == [2, 2, 1]
+
+    query, variables = mutation_document(operations[:2])
+    assert query.startswith(
+        "mutation($v0: AddLabelsToLabelableInput!, $v1: AddLabelsToLabelableInput!)"
+    )
+    assert "m1: addLabelsToLabelable(input: $v1)" in query
+    assert variables["v1"]["labelableId"] == "I_1"
+
+
+def test_sync_to_github_batches_issue_creation(integration, requester, session_factory):
+    session = session_factory()
+    _work_items(session, 25)
+    integration.db_session = session
+
+    results = integration.sync_to_github("work_items")
+    assert results == {"work_items": 24, "ideas": 0, "errors": 1}
+    # 10 mutations per request (batch cost 50, 5 per mutation)
+    assert len(requester.requests) == 3
+    assert "status:todo" in integration.repo.created_labels
+    assert len(set(integration.repo.created_labels)) == len(
+        integration.repo.created_labels
+    )
+
+    session.expire_all()
+    unsynced = session.query(WorkItem).filter(WorkItem.github_issue_id.is_(None))
+    assert [item.id for item in unsynced] == ["WI-07"]
+    session.close()
+
+
+def test_rejected_batch_is_split(integration, requester):
+    requester.reject_above = 3
+    batcher = integration.graphql
+    operations = [batcher.create_issue(f"Issue {n}", "", ["ai-lab"]) for n in range(10)]
+    results = batcher.execute(operations)
+    assert [data["issue"]["number"] for data, error in results] == list(range(1, 11))
+    # 10 rejected, 5 + 5 rejected, then 2 + 3 + 2 + 3 accepted
+    assert len(requester.requests) == 7
+
+
+def test_auto_sync_sends_label_changes_together(
+    integration, requester, session_factory, monkeypatch
+):
+    session = session_factory()
+    for number in (1, 2):
+        requester.issues[number] = {
+            "title": f"Issue {number}",
+            "labels": {"ai-lab", "status:todo", "priority:medium"},
+        }
+    session.add_all(
+        [
+            WorkItem(
+                id="WI-1",
+                title="Item",
+                description="GraphQL test",
+                status="todo",
+                priority="medium",
+                type="task",
+                github_issue_id=1,
+            ),
+            Idea(
+                id="IDEA-1",
+                title="Idea",
+                description="GraphQL test",
+                status="proposed",
+                priority="low",
+                category="research",
+                github_issue_id=2,
+            ),
+        ]
+    )
+    session.commit()
+    session.close()
+
+    sync = auto_sync.AutoGitHubSync()
+    sync.github_token, sync.github_repo = "token", FakeRepository.full_name
+    sync._integration = integration
+    monkeypatch.setattr(auto_sync, "SessionLocal", session_factory)
+
+    synced = sync.sync_label_changes(
+        [
+            ("work_item", "WI-1", "status", "in_progress"),
+            ("work_item", "WI-1", "status", "done"),
+            ("work_item", "WI-1", "priority", "high"),
+            ("idea", "IDEA-1", "status", "accepted"),
+            ("work_item", "WI-missing", "status", "done"),
+        ]
+    )
+    assert synced == 2
+    assert requester.issues[1]["labels"] == {"ai-lab", "status:done", "priority:high"}
+    assert requester.issues[2]["labels"] == {
+        "ai-lab",
+        "status:accepted",
+        "priority:medium",
+    }
+    # One lookup and one batch of mutations
+    assert len(requester.requests) == 2
+
+    with session_factory() as check:
+        assert check.get(WorkItem, "WI-1").github_synced_at is not None
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the ETag HTTP cache under the GitHub client.
+"""
+
+import json
+
+import pytest
+
+github = pytest.importorskip("github")
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ai_lab_framework.github_http_cache import HTTPCache, install_http_cache
+
+REPO = {
+    "id": 1,
+    "name": "issues",
+    "full_name": "ai-lab/issues",
+    "url": "https://api.example.invalid/repos/ai-lab/issues",
+}
+
+
+class FakeServer:
+    """GitHub answering /repos/ai-lab/issues with an ETag."""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.remaining = 5000
+        self.conditional = []
+
+    def send(self, adapter, request, **kwargs):
+        self.conditional.append(request.headers.get("If-None-Match"))
+        response = requests.Response()
+        response.request, response.url = request, request.url
+        response.headers = CaseInsensitiveDict({"ETag": self.etag})
+        if request.headers.get("If-None-Match") == self.etag:
+            response.status_code, response._content = 304, b""
+        else:
+            self.remaining -= 1  # Only full responses count against the limit
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json; charset=utf-8"
+            response._content = json.dumps({**REPO, "description": self.etag}).encode()
+        response.headers["X-RateLimit-Remaining"] = str(self.remaining)
+        response.headers["X-RateLimit-Limit"] = "5000"
+        response.headers["X-RateLimit-Reset"] = "1900000000"
+        return response
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(
+        HTTPAdapter,
+        "send",
+        lambda adapter, request, **kwargs: server.send(adapter, request, **kwargs),
+    )
+    return server
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HTTPCache(str(tmp_path / "http_cache.db"))
+    yield cache
+    cache.close()
+
+
+def _client(cache, token="token"):
+    client = github.Github(
+        auth=github.Auth.Token(token),
+        base_url="https://api.example.invalid",
+        retry=None,
+    )
+    assert install_http_cache(client, cache) is cache
+    return client
+
+
+def test_unchanged_reads_are_served_on_304(server, cache):
+    client = _client(cache)
+    assert client.get_repo("ai-lab/issues").description == '"v1"'
+    repo = client.get_repo("ai-lab/issues")
+    assert repo.full_name == "ai-lab/issues"
+    assert server.conditional == [None, '"v1"']
+    assert client.rate_limiting == (4999, 5000)  # Headers of the 304
+
+    # A changed resource is fetched and stored again
+    server.etag = '"v2"'
+    assert client.get_repo("ai-lab/issues").description == '"v2"'
+
+    info = cache.info()
+    assert (info["hits"], info["misses"], info["stores"]) == (1, 2, 2)
+    assert info["entries"] == 1 and info["lifetime_hits"] == 1
+
+    # Entries survive the process: a new cache on the same file revalidates
+    reopened = HTTPCache(str(cache.path))
+    assert _client(reopened).get_repo("ai-lab/issues").description == '"v2"'
+    assert reopened.info()["hits"] == 1
+    reopened.close()
+
+
+def test_tokens_do_not_share_entries(server, cache):
+    _client(cache, "first").get_repo("ai-lab/issues")
+    _client(cache, "second").get_repo("ai-lab/issues")
+    assert server.conditional == [None, None]
+    assert cache.info()["entries"] == 2
+
+    cache.max_bytes = 0
+    cache.prune()
+    assert cache.info()["entries"] == 0
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the GitHub sync scheduler and the concurrent sync_to_github.
+"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("github")
+
+from github import GithubException, RateLimitExceededException
+
+from ai_lab_framework.github_integration import GitHubIntegration
+from ai_lab_framework.github_scheduler import RateLimiter, SyncScheduler
+from infrastructure.db.models import Idea, WorkItem
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(write_interval=0.75, reserve=10, clock=clock, sleep=clock.sleep)
+
+
+def test_writes_are_spaced_and_reads_are_not(limiter, clock):
+    for _ in range(3):
+        limiter.acquire(write=True)
+    limiter.acquire()
+    assert clock.sleeps == [0.75, 0.75]
+    assert limiter.info()["writes"] == 3
+
+
+def test_low_budget_is_spread_until_reset(limiter, clock):
+    limiter.update(remaining=110, reset_at=clock.now + 100)
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.sleeps == [1.0]  # 100 spare calls over 100 seconds
+
+    # Out-of-order responses never raise the count again
+    limiter.update(remaining=500, reset_at=clock.now + 99)
+    assert limiter.remaining == 108
+
+    # At the reserve, calls wait for the reset
+    limiter.update(remaining=10, reset_at=clock.now + 30)
+    clock.sleeps.clear()
+    limiter.acquire()
+    assert clock.sleeps == [30.0]
+    assert limiter.remaining is None
+
+
+def test_rate_limit_response_pauses_and_retries(limiter, clock):
+    scheduler = SyncScheduler(limiter=limiter)
+    attempts = []
+
+    def create():
+        attempts.append(clock.now)
+        if len(attempts) == 1:
+            raise RateLimitExceededException(
+                403, {"message": "secondary rate limit"}, {"Retry-After": "20"}
+            )
+        return "issue"
+
+    assert scheduler.call(create, write=True) == "issue"
+    assert attempts[1] - attempts[0] == 20
+    assert limiter.info()["pauses"] == 1
+
+    def forbidden():
+        raise GithubException(403, {"message": "Resource not accessible"}, {})
+
+    with pytest.raises(GithubException):
+        scheduler.call(forbidden)
+    assert limiter.info()["pauses"] == 1
+
+
+def test_run_bounds_concurrency_and_reports_errors():
+    scheduler = SyncScheduler(max_workers=3, limiter=RateLimiter(write_interval=0))
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+    taken = []
+
+    def job(n):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        threading.Event().wait(0.01)
+        with lock:
+            running["now"] -= 1
+        if n == 5:
+            raise ValueError("boom")
+        return n * 10
+
+    def jobs():
+        for n in range(20):
+            taken.append(n)
+            yield n, lambda n=n: job(n)
+
+    outcomes = {}
+    for key, result, error in scheduler.run(jobs()):
+        # Jobs are pulled lazily, not all up front
+        assert len(taken) - len(outcomes) <= 2 * scheduler.max_workers
+        outcomes[key] = (result, error)
+
+    assert running["max"] == 3
+    assert outcomes[4] == (40, None)
+    assert isinstance(outcomes[5][1], ValueError)
+    assert len(outcomes) == 20
+
+
+class _FakeRepository:
+    def __init__(self):
+        self.titles = []
+        self._lock = threading.Lock()
+
+    def create_issue(self, title, body, labels):
+        with self._lock:
+            self.titles.append(title)
+            return SimpleNamespace(number=len(self.titles))
+
+
+def test_sync_to_github_records_issues(session_factory):
+    session = session_factory()
+    session.add_all(
+        WorkItem(
+            id=f"WI-{n}",
+            title=f"Item {n}",
+            description="Sync test",
+            status="todo",
+            priority="medium",
+            type="task",
+        )
+        for n in range(7)
+    )
+    session.add(
+        Idea(
+            id="IDEA-1",
+            title="Idea",
+            description="Sync test",
+            status="proposed",
+            priority="low",
+            category="research",
+        )
+    )
+    session.commit()
+
+    integration = GitHubIntegration.__new__(GitHubIntegration)
+    integration.repo = _FakeRepository()
+    integration.graphql = None  # One REST call per item
+    integration.db_session = session
+    integration.scheduler = SyncScheduler(
+        max_workers=3, limiter=RateLimiter(write_interval=0)
+    )
+    integration.work_item_labels = ["ai-lab", "work-item", "framework"]
+    integration.idea_labels = ["ai-lab", "idea", "innovation"]
+
+    results = integration.sync_to_github()
+    assert results == {"work_items": 7, "ideas": 1, "errors": 0}
+    assert "[IDEA-1] 💡 Idea" in integration.repo.titles
+
+    session.expire_all()
+    numbers = {item.github_issue_id for item in session.query(WorkItem)}
+    assert len(numbers) == 7 and None not in numbers
+    assert session.get(Idea, "IDEA-1").github_synced_at is not None
+    session.close()
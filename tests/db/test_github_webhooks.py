@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the GitHub webhook receiver and the local event replayer.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("github")
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from ai_lab_framework.github_webhooks import (
+    WEBHOOK_PATH,
+    WebhookProcessor,
+    create_app,
+    issue_event,
+    replay,
+    sign,
+)
+from infrastructure.db.models import Idea, WorkItem
+
+SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def items(session_factory):
+    with session_factory() as session:
+        session.add_all(
+            [
+                WorkItem(
+                    id="WI-1",
+                    title="Item",
+                    description="Webhook test",
+                    status="todo",
+                    priority="medium",
+                    type="task",
+                    github_issue_id=1,
+                ),
+                Idea(
+                    id="IDEA-1",
+                    title="Idea",
+                    description="Webhook test",
+                    status="proposed",
+                    priority="low",
+                    category="research",
+                    github_issue_id=2,
+                ),
+            ]
+        )
+        session.commit()
+    return session_factory
+
+
+def test_endpoint_verifies_and_queues(items):
+    processor = WebhookProcessor(items)
+    delivery = issue_event("WI-1", status="done", priority="high")
+    body = json.dumps(delivery["payload"]).encode()
+    headers = {"X-GitHub-Event": "issues", "X-GitHub-Delivery": "d-1"}
+
+    with TestClient(create_app(SECRET, processor)) as client:
+        unsigned = client.post(WEBHOOK_PATH, content=body, headers=headers)
+        assert unsigned.status_code == 401
+        forged = {**headers, "X-Hub-Signature-256": sign(body, "other")}
+        assert (
+            client.post(WEBHOOK_PATH, content=body, headers=forged).status_code == 401
+        )
+
+        signed = {**headers, "X-Hub-Signature-256": sign(body, SECRET)}
+        first = client.post(WEBHOOK_PATH, content=body, headers=signed)
+        assert (first.status_code, first.json()) == (202, {"status": "queued"})
+        again = client.post(WEBHOOK_PATH, content=body, headers=signed)
+        assert again.json() == {"status": "duplicate"}
+
+        ping = {**signed, "X-GitHub-Event": "ping"}
+        assert client.post(WEBHOOK_PATH, content=body, headers=ping).json() == {
+            "status": "pong"
+        }
+        push = {**signed, "X-GitHub-Event": "push"}
+        assert client.post(WEBHOOK_PATH, content=body, headers=push).json() == {
+            "status": "ignored"
+        }
+        processor.drain()
+
+        info = client.get(WEBHOOK_PATH).json()
+        assert (info["queued"], info["duplicates"], info["applied"]) == (1, 1, 1)
+
+    with items() as session:
+        item = session.get(WorkItem, "WI-1")
+        assert (item.status, item.priority) == ("done", "high")
+
+
+def test_replayer_applies_issue_and_label_events(items):
+    renamed = {
+        "event": "label",
+        "payload": {
+            "action": "edited",
+            "label": {"name": "status:exploring"},
+            "changes": {"name": {"from": "status:accepted"}},
+        },
+    }
+    results = replay(
+        [
+            issue_event("IDEA-1", "idea", status="accepted"),
+            issue_event("WI-missing", status="done"),
+            renamed,
+        ],
+        secret=SECRET,
+        session_factory=items,
+    )
+    assert [code for code, _ in results] == [202, 202, 202]
+
+    with items() as session:
+        idea = session.get(Idea, "IDEA-1")
+        # No priority label: the priority is left alone
+        assert (idea.status, idea.priority) == ("exploring", "low")
+        assert session.get(WorkItem, "WI-1").status == "todo"
+
+
+def test_out_of_order_deliveries_do_not_roll_back(items):
+    newer = issue_event("WI-1", status="done", priority="high")
+    newer["payload"]["issue"]["updated_at"] = "2026-03-01T12:05:00Z"
+    older = issue_event("WI-1", status="in_progress", priority="low")
+    older["payload"]["issue"]["updated_at"] = "2026-03-01T12:00:00Z"
+
+    processor = WebhookProcessor(items)
+    assert processor.apply("issues", newer["payload"]) == 1
+    assert processor.apply("issues", older["payload"]) == 0
+
+    with items() as session:
+        item = session.get(WorkItem, "WI-1")
+        assert (item.status, item.priority) == ("done", "high")
+        assert item.github_updated_at == datetime(2026, 3, 1, 12, 5)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for the identity cache.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from infrastructure.db.identity_cache import (
+    CACHE_SIZE,
+    cached_get,
+    clear_identity_cache,
+    identity_cache,
+    identity_cache_info,
+    setup_identity_cache,
+)
+from infrastructure.db.models import Project, WorkItem
+from infrastructure.db.progress import setup_progress_rollups
+
+
+@pytest.fixture
+def factory(session_factory, db_engine):
+    clear_identity_cache(reset_stats=True)
+    setup_progress_rollups(session_factory)
+    setup_identity_cache(session_factory)
+    with session_factory() as session:
+        session.add(
+            Project(
+                id="PROJ-1",
+                name="Project",
+                description="Cache test",
+                status="active",
+                priority="high",
+                category="development",
+                owner="tester",
+            )
+        )
+        session.add_all(
+            WorkItem(
+                id=f"WI-{n}",
+                title=f"Item {n}",
+                description="Cache test",
+                status="todo",
+                priority="medium",
+                type="task",
+                project_id="PROJ-1",
+                estimated_hours=2,
+                labels=["a"],
+            )
+            for n in range(3)
+        )
+        session.commit()
+
+    yield session_factory
+    identity_cache.enabled = False
+    clear_identity_cache(reset_stats=True)
+
+
+@pytest.fixture
+def statements(db_engine):
+    executed = []
+    event.listen(
+        db_engine, "before_cursor_execute", lambda *args: executed.append(args[2])
+    )
+    return executed
+
+
+def test_second_session_is_served_from_cache(factory, statements):
+    with factory() as session:
+        assert cached_get(session, WorkItem, "WI-1").title == "Item 1"
+    statements.clear()
+
+    with factory() as session:
+        item = cached_get(session, WorkItem, "WI-1")
+        assert (item.title, item.labels, item.project_id) == ("Item 1", ["a"], "PROJ-1")
+        assert cached_get(session, WorkItem, "WI-1") is item  # Identity map
+        item.labels.append("b")  # Cached values are copies
+        assert not any("FROM work_items" in sql for sql in statements)
+
+    with factory() as session:
+        assert cached_get(session, WorkItem, "WI-1").labels == ["a"]
+        assert cached_get(session, WorkItem, "missing") is None
+
+    info = identity_cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (2, 2, 1)
+
+
+def test_commit_invalidates_and_rollback_does_not(factory):
+    with factory() as session:
+        cached_get(session, WorkItem, "WI-1")
+        cached_get(session, Project, "PROJ-1")
+
+    # Cached instances are persistent: changes are written as UPDATEs
+    with factory() as session:
+        item = cached_get(session, WorkItem, "WI-1")
+        item.status = "done"
+        session.flush()
+        # The writing session reads its own uncommitted row
+        assert cached_get(session, WorkItem, "WI-1").status == "done"
+        session.rollback()
+    assert identity_cache_info()["size"] == 2
+
+    with factory() as session:
+        cached_get(session, WorkItem, "WI-1").status = "done"
+        session.commit()
+    # The item and its project (progress_percentage) were invalidated
+    assert identity_cache_info()["size"] == 0
+
+    with factory() as session:
+        assert cached_get(session, WorkItem, "WI-1").status == "done"
+        assert cached_get(session, Project, "PROJ-1").progress_percentage == 33
+
+    with factory() as session:
+        session.query(WorkItem).filter(WorkItem.id == "WI-2").update({"status": "done"})
+        session.commit()
+    assert identity_cache_info()["size"] == 0
+
+
+def test_stale_snapshot_is_not_cached(factory):
+    reader = factory()
+    reader.get(WorkItem, "WI-0")  # Starts the reader's transaction
+
+    with factory() as writer:
+        cached_get(writer, WorkItem, "WI-1").status = "done"
+        writer.commit()
+
+    # Its transaction may read from a snapshot older than the commit, so
+    # what it loads is not cached
+    cached_get(reader, WorkItem, "WI-1")
+    reader.close()
+    assert identity_cache_info()["size"] == 0
+
+
+def test_lru_eviction(factory):
+    identity_cache.size = 2
+    try:
+        for n in range(3):
+            with factory() as session:
+                cached_get(session, WorkItem, f"WI-{n}")
+        info = identity_cache_info()
+        assert (info["size"], info["evictions"]) == (2, 1)
+    finally:
+        identity_cache.size = CACHE_SIZE
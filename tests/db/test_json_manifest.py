@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON content manifest.
+"""
+
+import json
+import os
+
+from sqlalchemy import inspect
+
+from infrastructure.db.database import Base, create_db_engine
+from infrastructure.db.json_manifest import JsonManifest
+from infrastructure.db.migrations import MIGRATIONS, get_schema_version
+
+
+def _write(path, item_id, title):
+    path.write_text(json.dumps({"id": item_id, "title": title}))
+
+
+def test_scan_reports_only_changed_files(tmp_path, db_engine):
+    items_dir = tmp_path / "ideas"
+    items_dir.mkdir()
+    for i in range(3):
+        _write(items_dir / f"IDEA-{i}.json", f"IDEA-{i}", "first")
+
+    manifest = JsonManifest(db_engine)
+    diff = manifest.scan(items_dir)
+    assert len(diff.changed) == 3
+    assert not manifest.is_in_sync(items_dir)
+
+    manifest.commit(diff, {path: path.stem for path in diff.changed})
+    assert manifest.is_in_sync(items_dir)
+    assert manifest.scan(items_dir).is_clean
+
+    # Touching a file without changing its content is not a change
+    stat = (items_dir / "IDEA-0.json").stat()
+    os.utime(items_dir / "IDEA-0.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10))
+    _write(items_dir / "IDEA-1.json", "IDEA-1", "second")
+    (items_dir / "IDEA-2.json").unlink()
+
+    diff = manifest.scan(items_dir)
+    assert [path.name for path in diff.changed] == ["IDEA-1.json"]
+    assert diff.removed == ["IDEA-2.json"]
+    assert diff.unchanged_ids == {"IDEA-0.json": "IDEA-0"}
+    assert not manifest.is_in_sync(items_dir)
+
+    manifest.commit(diff, {items_dir / "IDEA-1.json": "IDEA-1"})
+    assert manifest.is_in_sync(items_dir)
+
+
+def test_unprocessed_files_stay_pending(tmp_path, db_engine):
+    items_dir = tmp_path / "work-items"
+    items_dir.mkdir()
+    _write(items_dir / "WI-1.json", "WI-1", "ok")
+    (items_dir / "broken.json").write_text("{not json")
+
+    manifest = JsonManifest(db_engine)
+    manifest.commit(manifest.scan(items_dir), {items_dir / "WI-1.json": "WI-1"})
+
+    diff = manifest.scan(items_dir)
+    assert [path.name for path in diff.changed] == ["broken.json"]
+    assert not manifest.is_in_sync(items_dir)
+
+
+def test_manifest_tables_come_from_migrations(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'existing.db'}")
+    manifest_tables = {"json_manifest", "json_manifest_roots"}
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[
+            table
+            for name, table in Base.metadata.tables.items()
+            if name not in manifest_tables
+        ],
+    )
+
+    JsonManifest(engine)
+    assert manifest_tables <= set(inspect(engine).get_table_names())
+    assert "ix_json_manifest_item_id" in {
+        index["name"] for index in inspect(engine).get_indexes("json_manifest")
+    }
+    assert get_schema_version(engine) == max(m.version for m in MIGRATIONS)
+    engine.dispose()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests for the incrementally maintained project/milestone progress rollups.
+"""
+
+import pytest
+
+from infrastructure.db.models import Milestone, Project, WorkItem
+from infrastructure.db.progress import (
+    get_progress,
+    rebuild_progress,
+    setup_progress_rollups,
+    verify_progress,
+)
+
+
+@pytest.fixture
+def session(session_factory):
+    setup_progress_rollups(session_factory)
+    session = session_factory()
+    session.add_all(
+        [
+            Project(
+                id="PROJ-1",
+                name="Project",
+                description="Progress rollup test",
+                status="active",
+                priority="high",
+                category="development",
+                owner="tester",
+            ),
+            Milestone(id="MS-1", title="Milestone", project_id="PROJ-1"),
+        ]
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _work_item(item_id, hours=None, status="todo", milestone_id="MS-1"):
+    return WorkItem(
+        id=item_id,
+        title=f"Item {item_id}",
+        description="Progress rollup test",
+        status=status,
+        priority="medium",
+        type="task",
+        project_id="PROJ-1",
+        milestone_id=milestone_id,
+        estimated_hours=hours,
+    )
+
+
+def test_progress_follows_status_and_estimate_changes(session):
+    session.add_all([_work_item("WI-1", 6), _work_item("WI-2", 2, status="done")])
+    session.commit()
+
+    project = session.get(Project, "PROJ-1")
+    assert project.progress_percentage == 25
+    assert session.get(Milestone, "MS-1").progress_percentage == 25
+    assert get_progress(session, "projects", "PROJ-1")["total_hours"] == 8
+
+    # Updates on expired instances still see the old status/estimate
+    item = session.get(WorkItem, "WI-1")
+    item.status = "done"
+    session.commit()
+    assert project.progress_percentage == 100
+
+    item.estimated_hours = 14  # done 16h of 16h; then reopen WI-2
+    session.get(WorkItem, "WI-2").status = "in_progress"
+    session.commit()
+    assert project.progress_percentage == 88
+
+    session.delete(session.get(WorkItem, "WI-1"))
+    session.commit()
+    assert project.progress_percentage == 0
+    assert verify_progress(session) == {}
+
+
+def test_moving_items_and_unestimated_weight(session):
+    session.add_all(
+        [
+            _work_item("WI-1", status="done"),  # no estimate counts as 1h
+            _work_item("WI-2", 3, milestone_id=None),
+        ]
+    )
+    session.commit()
+    assert session.get(Project, "PROJ-1").progress_percentage == 25
+    assert session.get(Milestone, "MS-1").progress_percentage == 100
+
+    session.get(WorkItem, "WI-2").milestone_id = "MS-1"
+    session.commit()
+    assert session.get(Milestone, "MS-1").progress_percentage == 25
+    assert verify_progress(session) == {}
+
+
+def test_rollback_and_rebuild(session):
+    session.add(_work_item("WI-1", 4, status="done"))
+    session.commit()
+
+    session.get(WorkItem, "WI-1").status = "todo"
+    session.flush()
+    session.rollback()
+    assert session.get(Project, "PROJ-1").progress_percentage == 100
+
+    # Raw SQL bypasses the flush listener until the rollups are rebuilt
+    session.connection().exec_driver_sql(
+        "UPDATE work_items SET status = 'todo' WHERE id = 'WI-1'"
+    )
+    assert verify_progress(session) != {}
+    rebuild_progress(session)
+    session.commit()
+    assert verify_progress(session) == {}
+    assert session.get(Project, "PROJ-1").progress_percentage == 0
+
+
+def test_half_values_round_like_the_rebuild(session):
+    # 12.5 centi-hours, and 1 of 8 equal items done is 12.5%
+    session.add_all(
+        [
+            _work_item(f"WI-{n}", 0.125, status="done" if n == 0 else "todo")
+            for n in range(8)
+        ]
+    )
+    session.commit()
+
+    assert verify_progress(session) == {}
+    incremental = get_progress(session, "projects", "PROJ-1")
+    stored = session.get(Project, "PROJ-1").progress_percentage
+    rebuild_progress(session)
+    session.commit()
+    assert verify_progress(session) == {}
+    assert get_progress(session, "projects", "PROJ-1") == incremental
+    assert incremental["percentage"] == stored == 13
+    assert session.get(Project, "PROJ-1").progress_percentage == 13
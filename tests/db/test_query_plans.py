@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression tests for the hot queries in infrastructure.db.queries.
+"""
+
+import pytest
+
+from infrastructure.db.queries import (
+    HOT_QUERIES,
+    explain_query_plan,
+    find_plan_regressions,
+)
+
+
+@pytest.fixture
+def raw_connection(db_engine):
+    connection = db_engine.raw_connection()
+    yield connection
+    connection.close()
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(raw_connection, name):
+    query = HOT_QUERIES[name]
+    plan = explain_query_plan(raw_connection, query.sql, query.params)
+
+    assert plan, f"{name}: empty query plan"
+    assert find_plan_regressions(plan) == [], f"{name} regressed: {plan}"
+
+
+def test_regression_detector_flags_full_scan():
+    assert find_plan_regressions(["SCAN work_items"]) == ["SCAN work_items"]
+    assert find_plan_regressions(["SCAN ideas USING INDEX ix_ideas_created_date"]) == []
+    assert find_plan_regressions(
+        ["SCAN t USING INDEX x", "USE TEMP B-TREE FOR ORDER BY"]
+    ) == ["USE TEMP B-TREE FOR ORDER BY"]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the project report loader and the query-count helpers.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from infrastructure.db import project_repo_manager
+from infrastructure.db.models import CustomField, Milestone, Project, WorkItem
+from infrastructure.db.queries import assert_max_queries, count_queries
+from infrastructure.db.reports import load_project_reports, project_reports
+
+
+@pytest.fixture
+def session(session_factory):
+    session = session_factory()
+    for p in range(6):
+        project_id = f"PROJ-{p}"
+        session.add(
+            Project(
+                id=project_id,
+                name=f"Project {p}",
+                description="Report test",
+                status="active",
+                priority="high",
+                category="development",
+                owner="tester",
+                repository_url="https://example.invalid/repo" if p == 0 else None,
+            )
+        )
+        session.add(Milestone(id=f"MS-{p}", title="M1", project_id=project_id))
+        session.add(
+            CustomField(
+                id=f"CF-{p}",
+                name="Estimate",
+                field_type="number",
+                project_id=project_id,
+            )
+        )
+        session.add_all(
+            WorkItem(
+                id=f"WI-{p}-{n}",
+                title=f"Item {n}",
+                description="Report test",
+                status="done" if n == 0 else "todo",
+                priority="medium",
+                type="task",
+                project_id=project_id,
+                milestone_id=f"MS-{p}" if n < 2 else None,
+                estimated_hours=1.5,
+            )
+            for n in range(3)
+        )
+    session.commit()
+    session.expire_all()
+    yield session
+    session.close()
+
+
+def test_reports_load_in_fixed_number_of_queries(session):
+    with assert_max_queries(session, 4) as counter:
+        reports = project_reports(session)
+    assert counter.count == 4  # Projects + one per relationship
+    assert len(reports) == 6
+    report = reports[1]
+    assert report["work_items_count"] == 3
+    assert report["work_items_by_status"] == {"done": 1, "todo": 2}
+    assert report["estimated_hours"] == 4.5
+    assert report["milestones"][0]["work_items_count"] == 2
+    assert report["custom_fields"] == ["Estimate"]
+
+    with pytest.raises(ValueError):
+        load_project_reports(session, include=("owner",))
+
+
+def test_assert_max_queries_reports_lazy_loads(session):
+    with pytest.raises(AssertionError, match="at most 2 queries, got 7"):
+        with assert_max_queries(session, 2):
+            for project in session.scalars(select(Project)):
+                len(project.work_items)
+
+
+class _FakeRepository:
+    html_url = "https://example.invalid/new"
+    id = 1
+
+    def __init__(self):
+        self.issues = 0
+
+    def get_labels(self):
+        return []
+
+    def create_label(self, **label):
+        pass
+
+    def create_file(self, *args, **kwargs):
+        pass
+
+    def create_issue(self, **issue):
+        self.issues += 1
+        return SimpleNamespace(number=self.issues)
+
+
+def test_sync_all_projects_reads_without_n_plus_one(session, monkeypatch):
+    monkeypatch.setattr(project_repo_manager.time, "sleep", lambda seconds: None)
+    repository = _FakeRepository()
+    manager = project_repo_manager.ProjectRepositoryManager.__new__(
+        project_repo_manager.ProjectRepositoryManager
+    )
+    manager.github = SimpleNamespace(
+        get_user=lambda: SimpleNamespace(create_repo=lambda **config: repository)
+    )
+    manager.github_org = None
+    manager.session = session
+
+    with count_queries(session) as counter:
+        results = manager.sync_all_projects_to_repositories()
+    assert results == {"created": 5, "updated": 1, "errors": 0}
+    assert repository.issues == 15
+
+    selects = [sql for sql in counter.statements if sql.lstrip().startswith("SELECT")]
+    assert len(selects) == 2  # Projects and their work items, not one per project
+    assert session.expire_on_commit
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for the FTS5 search index.
+"""
+
+from infrastructure.db.models import Idea, WorkItem
+from infrastructure.db.search import build_match_query, check_search_index, search
+
+
+def _work_item(item_id, title, description=""):
+    return WorkItem(
+        id=item_id,
+        title=title,
+        description=description,
+        status="todo",
+        priority="medium",
+        type="task",
+        labels=["backend"],
+    )
+
+
+def test_triggers_keep_index_in_sync(session_factory):
+    with session_factory() as session:
+        session.add_all(
+            [
+                _work_item("WI-1", "Database migration", "Move JSON into SQLite"),
+                _work_item("WI-2", "Dashboard", "Show migration progress"),
+                Idea(
+                    id="IDEA-1",
+                    title="Search everything",
+                    description="Full text search over the database",
+                    status="proposed",
+                    priority="high",
+                    category="development",
+                ),
+            ]
+        )
+        session.commit()
+
+        hits = search(session, "migration")
+        # Title matches outrank description matches
+        assert [hit.id for hit in hits] == ["WI-1", "WI-2"]
+        assert "<mark>migration</mark>" in hits[1].snippet.lower()
+
+        # Prefix on the last word, across entities
+        assert {hit.id for hit in search(session, "datab")} == {"WI-1", "IDEA-1"}
+        assert [hit.id for hit in search(session, "datab", entities=["ideas"])] == [
+            "IDEA-1"
+        ]
+
+        session.get(WorkItem, "WI-1").title = "Schema upgrade"
+        session.delete(session.get(WorkItem, "WI-2"))
+        session.commit()
+
+        assert search(session, "migration") == []
+        assert [hit.id for hit in search(session, "upgrade")] == ["WI-1"]
+        assert [hit.id for hit in search(session, "backend")] == ["WI-1"]
+        assert check_search_index(session) == {}
+
+
+def test_match_query_neutralizes_operators():
+    assert build_match_query('title:"x" OR -y*') == '"title" "x" "OR" "y"*'
+    assert build_match_query("fix bug", prefix=False) == '"fix" "bug"'
+    assert build_match_query("  ") == ""
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the Parquet snapshot exporter.
+"""
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from infrastructure.db import snapshot_export
+from infrastructure.db.models import WorkItem
+from infrastructure.db.snapshot_export import export_snapshot
+
+
+def test_snapshot_round_trip(tmp_path, db_engine, session_factory):
+    with session_factory() as session:
+        session.add_all(
+            [
+                WorkItem(
+                    id=f"WI-{i}",
+                    title=f"Item {i}",
+                    description="",
+                    status=("todo", "done")[i % 2],
+                    priority="high",
+                    type="task",
+                    labels=["export"],
+                )
+                for i in range(5)
+            ]
+        )
+        session.commit()
+    with db_engine.begin() as connection:
+        # Written outside the ORM by the legacy sqlite3 migration script
+        connection.exec_driver_sql(
+            "UPDATE work_items SET created_date = '2025-11-14T02:00:00Z', "
+            "due_date = '' WHERE id = 'WI-0'"
+        )
+
+    stats = export_snapshot(tmp_path / "snapshot", bind=db_engine, chunk_size=2)
+
+    assert stats["tables"]["work_items"]["rows"] == 5
+    assert stats["tables"]["ideas"]["rows"] == 0
+    table = pq.read_table(tmp_path / "snapshot" / "work_items.parquet")
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+    assert pa.types.is_timestamp(table.schema.field("created_date").type)
+
+    rows = {row["id"]: row for row in table.to_pylist()}
+    assert rows["WI-0"]["created_date"].hour == 2
+    assert rows["WI-0"]["due_date"] is None
+    assert rows["WI-1"]["labels"] == '["export"]'
+    assert sorted(table.column("status").to_pylist()) == ["done"] * 2 + ["todo"] * 3
+
+
+def test_commits_during_export_are_not_in_the_snapshot(
+    tmp_path, db_engine, monkeypatch
+):
+    schema_of = snapshot_export.arrow_schema
+
+    def write_between_tables(table):
+        if table.name == "work_items":
+            # Committed after "ideas" was read, before "work_items" is
+            with db_engine.begin() as connection:
+                connection.exec_driver_sql(
+                    "INSERT INTO work_items (id, title, description, status, "
+                    "priority, type, created_date, updated_date) VALUES ('WI-late', "
+                    "'Late', '', 'todo', 'low', 'task', '2025-11-14', '2025-11-14')"
+                )
+        return schema_of(table)
+
+    monkeypatch.setattr(snapshot_export, "arrow_schema", write_between_tables)
+    stats = export_snapshot(
+        tmp_path / "snapshot", bind=db_engine, tables=("ideas", "work_items")
+    )
+
+    assert stats["tables"]["work_items"]["rows"] == 0
+    with db_engine.connect() as connection:
+        count = connection.exec_driver_sql("SELECT COUNT(*) FROM work_items")
+        assert count.scalar() == 1
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for GitHub sync cursors and the incremental sync_from_github.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("github")
+
+from ai_lab_framework.github_integration import GitHubIntegration
+from infrastructure.db import auto_sync
+from infrastructure.db.models import WorkItem
+from infrastructure.db.sync_cursors import (
+    advance_sync_cursor,
+    get_sync_cursor,
+    reset_sync_cursor,
+)
+
+EPOCH = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def test_cursor_only_moves_forward(session_factory):
+    with session_factory() as session:
+        assert get_sync_cursor(session, "ai-lab/issues") is None
+        advance_sync_cursor(session, "ai-lab/issues", EPOCH)
+        advance_sync_cursor(session, "ai-lab/issues", EPOCH - timedelta(days=1))
+        advance_sync_cursor(session, "ai-lab/other", EPOCH + timedelta(days=1))
+        session.commit()
+
+        # Stored as naive UTC
+        assert get_sync_cursor(session, "ai-lab/issues") == datetime(2026, 3, 1, 12)
+        assert reset_sync_cursor(session, "ai-lab/issues")
+        assert get_sync_cursor(session, "ai-lab/issues") is None
+        assert get_sync_cursor(session, "ai-lab/other") == datetime(2026, 3, 2, 12)
+
+
+class FakeRepository:
+    full_name = "ai-lab/issues"
+
+    def __init__(self, issues):
+        self.issues = issues
+        self.queries = []
+
+    def get_issues(self, **query):
+        self.queries.append(query)
+        since = query.get("since")
+        return [
+            issue
+            for issue in sorted(self.issues, key=lambda issue: issue.updated_at)
+            if since is None or issue.updated_at.replace(tzinfo=None) >= since
+        ]
+
+
+def _issue(number, minutes, status="done"):
+    return SimpleNamespace(
+        number=number,
+        title=f"[WI-{number}] Item {number}",
+        labels=[
+            SimpleNamespace(name=name)
+            for name in ("ai-lab", "work-item", f"status:{status}")
+        ],
+        updated_at=EPOCH + timedelta(minutes=minutes),
+    )
+
+
+@pytest.fixture
+def integration(session_factory):
+    session = session_factory()
+    session.add_all(
+        WorkItem(
+            id=f"WI-{n}",
+            title=f"Item {n}",
+            description="Cursor test",
+            status="todo",
+            priority="medium",
+            type="task",
+        )
+        for n in range(1, 5)
+    )
+    session.commit()
+
+    integration = GitHubIntegration.__new__(GitHubIntegration)
+    integration.repo = FakeRepository([_issue(1, 10), _issue(2, 20), _issue(3, 30)])
+    integration.db_session = session
+    yield integration
+    session.close()
+
+
+def test_sync_from_github_is_incremental(integration):
+    repo, session = integration.repo, integration.db_session
+
+    assert integration.sync_from_github() == {"updated": 3, "errors": 0}
+    assert repo.queries[0] == {
+        "state": "all",
+        "labels": ["ai-lab"],
+        "sort": "updated",
+        "direction": "asc",
+    }
+    assert get_sync_cursor(session, repo.full_name) == datetime(2026, 3, 1, 12, 30)
+
+    # Only issues updated since the cursor (inclusive) are read again
+    repo.issues.append(_issue(4, 40, status="review"))
+    assert integration.sync_from_github() == {"updated": 2, "errors": 0}
+    assert repo.queries[1]["since"] == datetime(2026, 3, 1, 12, 30)
+    assert session.get(WorkItem, "WI-4").status == "review"
+    assert get_sync_cursor(session, repo.full_name) == datetime(2026, 3, 1, 12, 40)
+
+    assert integration.sync_from_github(full=True)["updated"] == 4
+    assert "since" not in repo.queries[2]
+
+
+def test_failed_issue_holds_the_cursor(integration):
+    repo, session = integration.repo, integration.db_session
+    update = integration._update_local_from_github
+    integration._update_local_from_github = lambda issue, item_id, item_type: (
+        item_id != "WI-2" and update(issue, item_id, item_type)
+    )
+
+    assert integration.sync_from_github() == {"updated": 2, "errors": 0}
+    # Issue 3 was applied, but the cursor stays at the last issue before #2
+    assert session.get(WorkItem, "WI-3").status == "done"
+    assert get_sync_cursor(session, repo.full_name) == datetime(2026, 3, 1, 12, 10)
+
+    integration._update_local_from_github = update
+    assert integration.sync_from_github() == {"updated": 3, "errors": 0}
+    assert get_sync_cursor(session, repo.full_name) == datetime(2026, 3, 1, 12, 30)
+
+
+def test_local_edits_after_a_sync_are_pushed(integration, session_factory, monkeypatch):
+    pushed = []
+    monkeypatch.setattr(auto_sync.auto_sync, "sync_label_changes", pushed.extend)
+    auto_sync.setup_auto_sync(session_factory)
+    session = integration.db_session
+    for item in session.query(WorkItem):
+        item.github_issue_id = int(item.id[3:])
+    session.commit()
+
+    # Changes from GitHub are not sent back...
+    integration.sync_from_github()
+    assert session.get(WorkItem, "WI-1").status == "done"
+    assert pushed == []
+
+    # ...but later local edits on the same session are
+    session.get(WorkItem, "WI-1").priority = "high"
+    session.commit()
+    assert pushed == [("work_item", "WI-1", "priority", "high")]
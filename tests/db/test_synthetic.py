@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic data generator.
+"""
+
+from collections import Counter
+
+import pytest
+
+from infrastructure.db.aggregates import verify_aggregate_counters
+from infrastructure.db.models import CustomFieldValue, WorkItem
+from infrastructure.db.progress import verify_progress
+from infrastructure.db.synthetic import SyntheticData, dataset_spec, generate_dataset
+
+
+def test_generator_is_deterministic():
+    first = list(SyntheticData(dataset_spec(500, seed=7)).work_items())
+    second = list(SyntheticData(dataset_spec(500, seed=7)).work_items())
+    other = list(SyntheticData(dataset_spec(500, seed=8)).work_items())
+    assert first == second
+    assert first != other
+
+    with pytest.raises(ValueError):
+        dataset_spec("10x")
+
+
+def test_generate_dataset(db_engine, session_factory):
+    stats = generate_dataset(db_engine, 2000, seed=3)
+    assert stats["work_items"] == 2000
+    assert stats["projects"] == 10
+    assert stats["ideas"] == 500
+
+    session = session_factory()
+    try:
+        # Derived tables are consistent after the bulk load
+        assert verify_aggregate_counters(session) == {}
+        assert verify_progress(session) == {}
+
+        statuses = Counter(status for (status,) in session.query(WorkItem.status))
+        assert statuses.most_common(1)[0][0] == "done"
+        assert set(statuses) == {"todo", "in_progress", "review", "done", "blocked"}
+
+        # Project sizes are skewed: the first project is the largest
+        sizes = Counter(project for (project,) in session.query(WorkItem.project_id))
+        assert sizes.most_common(1)[0][0] == "PRJ-000001"
+
+        # Triggers typed the custom field values
+        assert (
+            session.query(CustomFieldValue)
+            .filter(CustomFieldValue.value_number.isnot(None))
+            .count()
+            > 0
+        )
+    finally:
+        session.close()
+
+    with pytest.raises(ValueError):
+        generate_dataset(db_engine, 10)
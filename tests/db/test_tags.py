@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the normalized item_tags index.
+"""
+
+from sqlalchemy import select
+
+from infrastructure.db.models import ItemTag, Project, WorkItem
+from infrastructure.db.tags import filter_by_tags, rebuild_item_tags, tag_facets
+
+
+def _work_item(item_id, labels):
+    return WorkItem(
+        id=item_id,
+        title=item_id,
+        description="",
+        status="todo",
+        priority="medium",
+        type="task",
+        labels=labels,
+    )
+
+
+def _ids(session, query):
+    return sorted(item.id for item in session.execute(query).scalars())
+
+
+def test_tags_follow_writes_and_filter(session_factory):
+    with session_factory() as session:
+        session.add_all(
+            [
+                _work_item("WI-1", ["backend", "urgent"]),
+                _work_item("WI-2", ["backend"]),
+                _work_item("WI-3", ["frontend", "urgent"]),
+                Project(
+                    id="PRJ-1",
+                    name="Lab",
+                    description="",
+                    status="active",
+                    priority="high",
+                    category="development",
+                    owner="me",
+                    tags=["backend"],
+                    technologies=["sqlite", "python"],
+                ),
+            ]
+        )
+        session.commit()
+
+        query = select(WorkItem)
+        tags = ["backend", "urgent"]
+        assert _ids(session, filter_by_tags(query, WorkItem, tags)) == [
+            "WI-1",
+            "WI-2",
+            "WI-3",
+        ]
+        assert _ids(session, filter_by_tags(query, WorkItem, tags, "all")) == ["WI-1"]
+        assert tag_facets(session, WorkItem) == [
+            ("backend", 2),
+            ("urgent", 2),
+            ("frontend", 1),
+        ]
+        assert tag_facets(session, Project, "technologies") == [
+            ("python", 1),
+            ("sqlite", 1),
+        ]
+
+        session.get(WorkItem, "WI-2").labels = ["backend", "urgent"]
+        session.delete(session.get(WorkItem, "WI-1"))
+        session.commit()
+
+        assert _ids(session, filter_by_tags(query, WorkItem, tags, "all")) == ["WI-2"]
+        assert tag_facets(session, WorkItem, limit=1) == [("urgent", 2)]
+
+        rows = select(ItemTag.entity, ItemTag.field, ItemTag.tag, ItemTag.item_id)
+        before = session.execute(rows).all()
+        rebuild_item_tags(session)
+        assert session.execute(rows).all() == before
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Tests for the ProjectView query compiler.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from infrastructure.db.models import Project, ProjectView, WorkItem
+from infrastructure.db.views import (
+    clear_view_cache,
+    compile_view,
+    execute_view,
+    view_cache_info,
+)
+
+
+@pytest.fixture
+def session(session_factory):
+    clear_view_cache()
+    session = session_factory()
+    session.add(
+        Project(
+            id="PROJ-1",
+            name="Project",
+            description="View test",
+            status="active",
+            priority="high",
+            category="development",
+            owner="tester",
+        )
+    )
+    items = [
+        ("WI-1", "todo", "low", ["backend"], 3),
+        ("WI-2", "todo", "critical", ["backend", "urgent"], None),
+        ("WI-3", "todo", "medium", ["frontend"], 5),
+        ("WI-4", "in_progress", "high", ["backend"], 8),
+        ("WI-5", "done", "high", [], 1),
+    ]
+    for item_id, status, priority, labels, hours in items:
+        session.add(
+            WorkItem(
+                id=item_id,
+                title=f"Item {item_id}",
+                description="View test",
+                status=status,
+                priority=priority,
+                type="task",
+                labels=labels,
+                project_id="PROJ-1",
+                estimated_hours=hours,
+                due_date=datetime(2025, 1, int(item_id[-1])),
+            )
+        )
+    # Other projects' items never show up in a project view
+    session.add(
+        WorkItem(
+            id="WI-X",
+            title="Elsewhere",
+            description="View test",
+            status="todo",
+            priority="critical",
+            type="task",
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def _view(**config):
+    return ProjectView(id="VIEW-1", name="View", project_id="PROJ-1", **config)
+
+
+def test_board_groups_in_sql_with_priority_order_and_paging(session):
+    view = _view(
+        layout="board",
+        group_config={"field": "status", "order": ["todo", "in_progress", "done"]},
+    )
+
+    groups = execute_view(session, view, limit=2)
+    assert [(group.key, group.total) for group in groups] == [
+        ("todo", 3),
+        ("in_progress", 1),
+        ("done", 1),
+    ]
+    assert [item["id"] for item in groups[0].items] == ["WI-2", "WI-3"]
+
+    # The next page only holds groups that still have items
+    groups = execute_view(session, view, limit=2, offset=2)
+    assert [(group.key, [item["id"] for item in group.items]) for group in groups] == [
+        ("todo", ["WI-1"])
+    ]
+
+
+def test_filters_and_table_sort(session):
+    view = _view(
+        layout="table",
+        filters={
+            "labels": {"all": ["backend"]},
+            "estimated_hours": {"gte": 3},
+            "due_date": {"lt": "2025-01-04T00:00:00"},
+        },
+        sort_config={"field": "estimated_hours", "direction": "desc"},
+    )
+    (group,) = execute_view(session, view)
+    assert group.key is None
+    assert [item["id"] for item in group.items] == ["WI-1"]
+
+    view.filters = {"status": ["todo", "done"], "assignee": None}
+    view.sort_config = {"fields": [{"field": "estimated_hours"}]}
+    (group,) = execute_view(session, view)
+    # Items without an estimate sort last
+    assert [item["id"] for item in group.items] == ["WI-5", "WI-1", "WI-3", "WI-2"]
+
+
+def test_group_by_labels(session):
+    groups = execute_view(session, _view(group_config={"field": "labels"}))
+    assert {group.key: group.total for group in groups} == {
+        "backend": 3,
+        "frontend": 1,
+        "urgent": 1,
+        None: 1,
+    }
+    assert groups[-1].key is None
+
+
+def test_compiled_statement_cached_per_version(session):
+    view = _view(layout="board")
+    session.add(view)
+    session.commit()
+
+    execute_view(session, "VIEW-1")
+    execute_view(session, "VIEW-1", offset=1)
+    assert view_cache_info()["hits"] == 1
+
+    view.filters = {"priority": "high"}
+    session.commit()
+    groups = execute_view(session, "VIEW-1")
+    assert view_cache_info()["misses"] == 2
+    assert {group.key for group in groups} == {"in_progress", "done"}
+
+
+def test_rejects_unknown_fields(session):
+    with pytest.raises(ValueError):
+        compile_view(_view(filters={"description": "x"}))
+    with pytest.raises(ValueError):
+        compile_view(_view(filters={"status": {"regex": "x"}}))
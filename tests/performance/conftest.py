@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Performance Tests Configuration
+
+Benchmarks of the SQLAlchemy layer against a synthetic dataset generated by
+infrastructure.db.synthetic. The scale is chosen with AI_LAB_BENCH_SCALE
+(10k, 100k, 1m; default 10k). Set AI_LAB_BENCH_DATA to a directory to keep
+generated databases between runs; they are only ever read.
+
+Results are stored in and compared against tests/performance/baselines:
+
+    pytest tests/performance --benchmark-only --benchmark-save=baseline
+    pytest tests/performance --benchmark-only \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Point the module-level engines at a scratch file before anything imports them
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{Path(tempfile.mkdtemp()) / 'ai_lab_bench.db'}"
+)
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.db.database import Base, create_db_engine
+from infrastructure.db.migrations import MIGRATIONS, run_migrations
+from infrastructure.db.synthetic import DEFAULT_SEED, generate_dataset
+import infrastructure.db.models  # noqa: F401  (registers all tables)
+
+BENCH_SCALE = os.getenv("AI_LAB_BENCH_SCALE", "10k")
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # Store and compare runs in the committed baselines unless told otherwise
+    storage = getattr(config.option, "benchmark_storage", None)
+    if storage == "file://./.benchmarks":
+        config.option.benchmark_storage = f"file://{BASELINE_DIR}"
+
+
+def _create_dataset(path: Path):
+    engine = create_db_engine(f"sqlite:///{path}")
+    try:
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine, verbose=False)
+        generate_dataset(engine, BENCH_SCALE, DEFAULT_SEED)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def bench_scale():
+    return BENCH_SCALE
+
+
+@pytest.fixture(scope="session")
+def dataset_path(tmp_path_factory):
+    """Database file holding the synthetic dataset for BENCH_SCALE."""
+    # Cached files are tied to the schema version they were generated with
+    name = f"synthetic_{BENCH_SCALE}_{DEFAULT_SEED}_v{len(MIGRATIONS)}.db"
+    cache_dir = os.getenv("AI_LAB_BENCH_DATA")
+    path = (
+        Path(cache_dir) / name if cache_dir else tmp_path_factory.mktemp("data") / name
+    )
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        _create_dataset(partial)
+        partial.rename(path)
+    return path
+
+
+@pytest.fixture(scope="session")
+def bench_engine(dataset_path):
+    engine = create_db_engine(f"sqlite:///{dataset_path}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bench_session(bench_engine):
+    """Session on the shared dataset; read-only benchmarks only."""
+    session = sessionmaker(bind=bench_engine)()
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.fixture
+def scratch_engine(dataset_path, tmp_path):
+    """Engine on a private copy of the dataset, for benchmarks that write."""
+    path = tmp_path / "scratch.db"
+    shutil.copyfile(dataset_path, path)
+    engine = create_db_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for inserts, dashboard aggregates, sync scans and listing queries
+on the synthetic dataset.
+"""
+
+import itertools
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from infrastructure.db.aggregates import (
+    get_completion_rate,
+    get_counts,
+    setup_aggregate_counters,
+)
+from infrastructure.db.change_log import setup_change_log
+from infrastructure.db.custom_fields import pivot
+from infrastructure.db.models import CustomField, Idea, ProjectView, WorkItem
+from infrastructure.db.pagination import iter_keyset, paginate
+from infrastructure.db.progress import setup_progress_rollups
+from infrastructure.db.queries import HOT_QUERIES
+from infrastructure.db.search import search
+from infrastructure.db.synthetic import EPOCH, SyntheticData, dataset_spec
+from infrastructure.db.tags import filter_by_tags
+from infrastructure.db.views import execute_view
+
+INSERT_BATCH = 1000
+
+# Columns GitHubIntegration.sync_to_github reads for unsynced work items
+SYNC_COLUMNS = [
+    WorkItem.id,
+    WorkItem.title,
+    WorkItem.description,
+    WorkItem.status,
+    WorkItem.priority,
+    WorkItem.type,
+    WorkItem.estimated_hours,
+    WorkItem.actual_hours,
+    WorkItem.assignee,
+    WorkItem.created_date,
+    WorkItem.updated_date,
+    WorkItem.due_date,
+    WorkItem.labels,
+    WorkItem.dependencies,
+]
+
+DASHBOARD_QUERIES = (
+    "work_items_total",
+    "work_items_by_status",
+    "work_items_by_priority",
+    "work_items_recent",
+    "work_items_completion_trend",
+    "ideas_total",
+    "ideas_by_category",
+    "ideas_by_status",
+    "ideas_recent",
+)
+
+
+@pytest.fixture(autouse=True)
+def _scale_info(benchmark, bench_scale):
+    benchmark.extra_info["scale"] = bench_scale
+
+
+def _new_work_items(counter):
+    """Setup for pedantic(): a fresh batch of synthetic items with new ids."""
+    rows = list(SyntheticData(dataset_spec(INSERT_BATCH)).work_items())
+    batch = next(counter)
+    for row in rows:
+        row["id"] = f"NEW-{batch:04d}-{row['id']}"
+        row["dependencies"] = []
+        row["milestone_id"] = None
+    return (rows,), {}
+
+
+@pytest.mark.benchmark(group="insert")
+def test_insert_work_items_orm(benchmark, scratch_engine):
+    """add_all + commit through every flush listener (counters, progress,
+    change log) and the tag/search/custom field triggers."""
+    factory = sessionmaker(bind=scratch_engine)
+    setup_aggregate_counters(factory)
+    setup_progress_rollups(factory)
+    setup_change_log(factory)
+
+    def insert(rows):
+        with factory() as session:
+            session.add_all(WorkItem(**row) for row in rows)
+            session.commit()
+
+    counter = itertools.count()
+    benchmark.pedantic(
+        insert, setup=lambda: _new_work_items(counter), rounds=5, iterations=1
+    )
+
+
+@pytest.mark.benchmark(group="insert")
+def test_insert_work_items_core(benchmark, scratch_engine):
+    """Core executemany, the bulk import path (triggers only)."""
+
+    def insert(rows):
+        with scratch_engine.begin() as connection:
+            connection.execute(WorkItem.__table__.insert(), rows)
+
+    counter = itertools.count()
+    benchmark.pedantic(
+        insert, setup=lambda: _new_work_items(counter), rounds=5, iterations=1
+    )
+
+
+@pytest.mark.benchmark(group="dashboard")
+def test_dashboard_hot_queries(benchmark, bench_engine):
+    """One render of the realtime dashboard's work item and idea panels."""
+    since = (EPOCH - timedelta(days=30)).isoformat()
+
+    def render():
+        with bench_engine.connect() as connection:
+            for name in DASHBOARD_QUERIES:
+                query = HOT_QUERIES[name]
+                params = (since,) if query.params else ()
+                connection.exec_driver_sql(query.sql, params).all()
+
+    benchmark(render)
+
+
+@pytest.mark.benchmark(group="dashboard")
+def test_dashboard_rollups(benchmark, bench_session, bench_scale):
+    def rollups():
+        return (
+            get_counts(bench_session, "work_items", "status"),
+            get_counts(bench_session, "work_items", "priority"),
+            get_counts(bench_session, "ideas", "category"),
+            get_completion_rate(bench_session),
+        )
+
+    counts = benchmark(rollups)
+    assert sum(counts[0].values()) == dataset_spec(bench_scale).work_items
+
+
+@pytest.mark.benchmark(group="sync")
+def test_sync_scan_unsynced_work_items(benchmark, bench_session):
+    def scan():
+        rows = 0
+        for _ in iter_keyset(
+            bench_session,
+            WorkItem,
+            filters=[WorkItem.github_issue_id.is_(None)],
+            columns=SYNC_COLUMNS,
+        ):
+            rows += 1
+        return rows
+
+    assert benchmark(scan) > 0
+
+
+@pytest.mark.benchmark(group="sync")
+def test_sync_scan_unsynced_ideas(benchmark, bench_session):
+    def scan():
+        return sum(
+            1
+            for _ in iter_keyset(
+                bench_session,
+                Idea,
+                filters=[Idea.github_issue_id.is_(None)],
+                columns=[Idea.id, Idea.title, Idea.description, Idea.status],
+            )
+        )
+
+    assert benchmark(scan) > 0
+
+
+@pytest.mark.benchmark(group="listing")
+def test_list_recent_work_items_deep_page(benchmark, bench_session):
+    """A page half-way through the list costs the same as the first one."""
+    middle = EPOCH - timedelta(days=365)
+
+    def page():
+        return paginate(
+            bench_session,
+            WorkItem,
+            order_by="updated",
+            after=(middle, "WI-"),
+            descending=True,
+            columns=[WorkItem.id, WorkItem.title, WorkItem.status],
+        )
+
+    assert len(benchmark(page).items) > 0
+
+
+@pytest.mark.benchmark(group="listing")
+def test_list_board_view(benchmark, bench_session):
+    # The largest project (Zipf rank 1) with a board grouped by status
+    view = ProjectView(
+        id="VIEW-bench",
+        name="Board",
+        project_id="PRJ-000001",
+        layout="board",
+        filters={"archived": False},
+        sort_config={},
+        group_config={},
+    )
+    groups = benchmark(execute_view, bench_session, view)
+    assert groups
+
+
+@pytest.mark.benchmark(group="listing")
+def test_list_custom_field_pivot(benchmark, bench_session):
+    fields = list(
+        bench_session.scalars(
+            select(CustomField).where(CustomField.project_id == "PRJ-000001")
+        )
+    )
+
+    def rows():
+        return pivot(
+            bench_session,
+            fields,
+            project_id="PRJ-000001",
+            where={"Estimate": {"gte": 5}},
+            order_by="Estimate",
+            descending=True,
+            limit=50,
+        )
+
+    assert benchmark(rows)
+
+
+@pytest.mark.benchmark(group="listing")
+def test_list_tagged_work_items(benchmark, bench_session):
+    query = filter_by_tags(
+        select(WorkItem.id, WorkItem.title), WorkItem, ["backend", "api"], "all"
+    ).limit(100)
+    assert benchmark(lambda: bench_session.execute(query).all())
+
+
+@pytest.mark.benchmark(group="listing")
+def test_search(benchmark, bench_session):
+    assert benchmark(search, bench_session, "sync cache")